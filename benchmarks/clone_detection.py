@@ -0,0 +1,99 @@
+"""Custo da detecção de trechos copiados e colados (clones.py) em cada entrega.
+
+Para cada arquivo, marca os tokens que fazem parte de alguma repetição com pelo menos
+MIN_UNIT_TOKENS tokens (depois da normalização de identificadores e literais) de duas
+formas: pelo arranjo de sufixos com o LCP e comparando todos os pares de posições. Confere
+que as duas marcam os mesmos tokens e mede também find_clones completo.
+
+Uso:
+    python benchmarks/clone_detection.py "<glob dos arquivos .java>"
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "java-judge-oo", "java-judge-oo"))
+
+import clones  # noqa: E402
+import parsing  # noqa: E402
+from fastjavalang import tokenize  # noqa: E402
+
+
+def suffix_coverage(sequence, min_unit: int) -> set:
+    """Tokens em repetições pelos intervalos do LCP"""
+    covered = set()
+    if len(sequence) < 2:
+        return covered
+    order = clones.suffix_array(sequence)
+    for common, left, right in clones._intervals(clones.lcp_array(sequence, order)):
+        if common >= min_unit:
+            for position in order[left:right + 1]:
+                covered.update(range(position, position + common))
+    return covered
+
+
+def pairwise_coverage(sequence, min_unit: int) -> set:
+    """Tokens em repetições comparando cada par de posições"""
+    covered = set()
+    n = len(sequence)
+    for first in range(n):
+        for second in range(first + 1, n):
+            # Par que se estende para a esquerda: já contado a partir de uma posição anterior
+            if first and sequence[first - 1] == sequence[second - 1]:
+                continue
+            common = 0
+            while second + common < n and sequence[first + common] == sequence[second + common]:
+                common += 1
+            if common >= min_unit:
+                covered.update(range(first, first + common))
+                covered.update(range(second, second + common))
+    return covered
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern")
+    parser.add_argument("--min-unit", type=int, default=clones.MIN_UNIT_TOKENS)
+    args = parser.parse_args()
+
+    streams = []
+    for path in sorted(glob.glob(args.pattern)):
+        with open(path, "rb") as f:
+            code = parsing.decode_source(f.read())[0]
+        try:
+            streams.append(list(tokenize(code)))
+        except Exception:
+            continue
+    if not streams:
+        sys.exit(f"Nenhum arquivo válido encontrado em {args.pattern}")
+
+    suffix = pairwise = detection = 0.0
+    mismatches = classes = copied = 0
+    for tokens in streams:
+        sequence = clones.normalize(tokens)
+        start = time.perf_counter()
+        expected = suffix_coverage(sequence, args.min_unit)
+        suffix += time.perf_counter() - start
+        start = time.perf_counter()
+        found = pairwise_coverage(sequence, args.min_unit)
+        pairwise += time.perf_counter() - start
+        mismatches += expected != found
+        start = time.perf_counter()
+        report = clones.find_clones(tokens)
+        detection += time.perf_counter() - start
+        classes += len(report.classes)
+        copied += report.copied_tokens
+
+    total = sum(len(tokens) for tokens in streams)
+    print(f"{len(streams)} arquivos, {total} tokens; {classes} classes de clones, {copied} tokens copiados")
+    print(f"por arquivo: {suffix / len(streams) * 1000:.1f}ms com arranjo de sufixos, "
+          f"{pairwise / len(streams) * 1000:.1f}ms comparando pares "
+          f"({detection / len(streams) * 1000:.1f}ms para find_clones completo); "
+          f"{mismatches} arquivos com marcações diferentes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Notas de competências do Java-Judge em trechos fixos, contra os valores esperados.
+
+Cada trecho isola uma parte da rubrica de competências práticas (manipulação de dados,
+atribuição, entrada/processamento/saída) e tem a pontuação esperada escrita ao lado,
+conferida na avaliação completa e na prévia léxica.
+Com um glob, confere também que nenhum arquivo que compila para na análise de
+competências com erro. Termina com código 1 se houver divergência.
+
+Uso:
+    python benchmarks/competency_grades.py ["<glob dos arquivos .java>"]
+"""
+import argparse
+import glob
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "java-judge-syntax-competencies", "java-judge-syntax-competencies"))
+
+import parsing  # noqa: E402
+from judge_syntax import EVALUATORS  # noqa: E402
+from preview import lexical_features  # noqa: E402
+
+# (descrição, código, pontuação de competências esperada)
+CASES = [
+    ("comparação sem atribuição",
+     "public class A { void f(int a) { if (a > 1) { } } }", 15),
+    ("atribuição composta",
+     "public class A { void f(int a) { a += a * 2; } }", 15),
+    ("declaração com valor inicial",
+     "public class A { void f(int a) { int dobro = a * 2; } }", 15),
+    ("atribuição sem operação binária",
+     "public class A { void f(int a) { a = 1; } }", 5),
+    ("entrada, processamento e saída",
+     "import java.util.Scanner;\n"
+     "public class A {\n"
+     "    public static void main(String[] args) {\n"
+     "        Scanner sc = new Scanner(System.in);\n"
+     "        int n = sc.nextInt();\n"
+     "        System.out.println(n * 2);\n"
+     "    }\n"
+     "}\n", 20),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern", nargs="?")
+    args = parser.parse_args()
+
+    evaluator = EVALUATORS["competency"]
+    failures = 0
+    for description, code, expected in CASES:
+        score = evaluator.evaluate_competencies(code)[0]
+        preview = evaluator.preview_competencies(lexical_features(code))[0]
+        mark = "ok" if score == preview == expected else "DIVERGE"
+        failures += mark != "ok"
+        print(f"{description:36s} esperado {expected:3d}  completa {score:5.1f}  prévia {preview:5.1f}  {mark}")
+
+    if args.pattern:
+        stopped = []
+        paths = sorted(glob.glob(args.pattern))
+        for path in paths:
+            with open(path, "rb") as f:
+                code = parsing.decode_source(f.read())[0]
+            try:
+                parsing.parse_java(code)
+            except Exception:
+                continue
+            feedback = evaluator.evaluate_competencies(code)[2]
+            if any("Erro na análise de competências" in line for line in feedback):
+                stopped.append(path)
+        print(f"{len(paths)} arquivos; {len(stopped)} que compilam pararam com erro nas competências")
+        for path in stopped[:10]:
+            print(f"  {path}")
+        failures += len(stopped)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Métricas de complexidade (complexity.py) pela lista de tokens contra um percurso da árvore.
+
+Para cada arquivo, calcula a complexidade ciclomática e o aninhamento de cada método de
+duas formas: com complexity.measure, na lista de tokens que a detecção de clones já usa,
+e percorrendo de novo a árvore de cada método. Confere que as duas chegam aos mesmos
+valores (e marcam os mesmos construtores) e compara o tempo de cada uma.
+
+Uso:
+    python benchmarks/complexity_metrics.py "<glob dos arquivos .java>"
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "java-judge-oo", "java-judge-oo"))
+
+from javalang import tree  # noqa: E402
+
+import complexity  # noqa: E402
+import parsing  # noqa: E402
+from fastjavalang import tokenize  # noqa: E402
+
+METHODS = (tree.MethodDeclaration, tree.ConstructorDeclaration)
+LOOPS = (tree.ForStatement, tree.WhileStatement, tree.DoStatement)
+
+
+def _decisions(node) -> int:
+    if isinstance(node, (tree.IfStatement, tree.TernaryExpression, tree.CatchClause) + LOOPS):
+        return 1
+    if isinstance(node, tree.SwitchStatementCase):
+        return sum(1 for label in node.case if label != "default")
+    if isinstance(node, tree.BinaryOperation) and node.operator in ("&&", "||"):
+        return 1
+    return 0
+
+
+def tree_metrics(root):
+    """(complexidade, aninhamento, construtor) de cada método, em ordem, percorrendo a árvore"""
+    found = []
+
+    def visit(node, method, depth, chained):
+        if isinstance(node, METHODS) and node.body is not None:
+            # Métodos abstratos e de interface não têm corpo nem complexidade
+            method = len(found)
+            found.append([1, 0, isinstance(node, tree.ConstructorDeclaration)])
+            depth = 0
+        if isinstance(node, tree.ClassCreator) and node.body:
+            # Classe anônima: os métodos dela têm aninhamento próprio
+            depth = 0
+        if method is not None:
+            found[method][0] += _decisions(node)
+        nests = isinstance(node, (tree.IfStatement, tree.SwitchStatement) + LOOPS) and not chained
+        if nests:
+            depth += 1
+            if method is not None:
+                found[method][1] = max(found[method][1], depth)
+        for attr in node.attrs:
+            value = getattr(node, attr)
+            children = value if isinstance(value, list) else [value]
+            for child in children:
+                if isinstance(child, tree.Node):
+                    # "else if" continua no nível do if de fora
+                    else_if = isinstance(node, tree.IfStatement) and attr == "else_statement" \
+                        and isinstance(child, tree.IfStatement)
+                    visit(child, method, depth - (1 if else_if else 0), else_if)
+
+    visit(root, None, 0, False)
+    return [tuple(values) for values in found]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern")
+    args = parser.parse_args()
+
+    files = []
+    for path in sorted(glob.glob(args.pattern)):
+        with open(path, "rb") as f:
+            code = parsing.decode_source(f.read())[0]
+        try:
+            files.append((path, list(tokenize(code)), parsing.parse_java(code)))
+        except Exception:
+            continue
+    if not files:
+        sys.exit(f"Nenhum arquivo válido encontrado em {args.pattern}")
+
+    lexical = walked = 0.0
+    mismatches = []
+    methods = 0
+    for path, tokens, root in files:
+        start = time.perf_counter()
+        measured = complexity.measure(tokens)
+        lexical += time.perf_counter() - start
+        start = time.perf_counter()
+        expected = tree_metrics(root)
+        walked += time.perf_counter() - start
+        found = [(method.cyclomatic, method.nesting, method.constructor) for method in measured.methods]
+        methods += len(expected)
+        if found != expected:
+            mismatches.append(path)
+
+    print(f"{len(files)} arquivos, {methods} métodos; {len(mismatches)} arquivos com valores diferentes")
+    for path in mismatches[:10]:
+        print(f"  {path}")
+    print(f"por arquivo: {lexical / len(files) * 1000:.2f}ms pelos tokens, "
+          f"{walked / len(files) * 1000:.2f}ms percorrendo a árvore")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Latência por entrega: um processo por avaliação versus o co-processo NDJSON.
+
+O modo "processo por entrega" inicia coprocess.py para uma única requisição, como um
+autograder que chama o avaliador a cada envio; o co-processo recebe todas as
+requisições no mesmo processo, primeiro uma de cada vez e depois em rajada.
+
+Uso:
+    python benchmarks/coprocess_latency.py "<glob dos arquivos .java>" [--evaluator oo] [--cold 5]
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUITE = os.path.join(ROOT, "java-judge-suite", "java-judge-suite")
+COMMAND = [sys.executable, os.path.join(SUITE, "coprocess.py")]
+
+
+def describe(label: str, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:28s} n={len(samples):4d}  média {statistics.mean(samples) * 1000:8.1f} ms  "
+          f"p50 {statistics.median(samples) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms")
+
+
+def one_process_per_request(requests, count: int):
+    samples = []
+    for request in requests[:count]:
+        start = time.perf_counter()
+        subprocess.run(COMMAND, input=json.dumps(request) + "\n", capture_output=True, text=True, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def persistent(requests):
+    process = subprocess.Popen(COMMAND, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    def send(request):
+        process.stdin.write(json.dumps(request) + "\n")
+        process.stdin.flush()
+
+    # Aquecimento: carrega o processo antes de medir
+    send({**requests[0], "id": "warm"})
+    process.stdout.readline()
+
+    sequential = []
+    for request in requests:
+        start = time.perf_counter()
+        send(request)
+        process.stdout.readline()
+        sequential.append(time.perf_counter() - start)
+
+    # Rajada: todas as requisições em andamento ao mesmo tempo
+    sent = {}
+    for request in requests:
+        sent[request["id"]] = time.perf_counter()
+        send(request)
+    burst = []
+    for _ in requests:
+        response = json.loads(process.stdout.readline())
+        burst.append(time.perf_counter() - sent[response["id"]])
+
+    process.stdin.close()
+    process.wait()
+    return sequential, burst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern")
+    parser.add_argument("--evaluator", default="oo")
+    parser.add_argument("--cold", type=int, default=5, help="execuções no modo processo por entrega")
+    args = parser.parse_args()
+
+    requests = []
+    for index, path in enumerate(sorted(glob.glob(args.pattern))):
+        with open(path, "rb") as f:
+            source = f.read().decode("utf-8", errors="replace")
+        requests.append({"id": index, "evaluator": args.evaluator,
+                         "name": os.path.basename(path), "source": source})
+    if not requests:
+        sys.exit(f"Nenhum arquivo encontrado em {args.pattern}")
+
+    describe("processo por entrega", one_process_per_request(requests, args.cold))
+    sequential, burst = persistent(requests)
+    describe("co-processo, sequencial", sequential)
+    describe("co-processo, em rajada", burst)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Escalabilidade dos avaliadores compartilhados em um pool de threads.
+
+Mede arquivos/s com 1, 2, 4, ... threads usando um único avaliador por espaço.
+Em CPython com GIL o ganho fica limitado; em builds free-threaded (3.13t,
+PYTHON_GIL=0) o avaliador deve escalar com os núcleos, sem processos.
+
+Uso:
+    python benchmarks/free_threaded.py "<glob dos arquivos .java>" [--threads 1,2,4,8] [--rounds 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPACE = os.path.join(ROOT, "java-judge-oo", "java-judge-oo")
+sys.path.insert(0, SPACE)
+
+import parsing  # noqa: E402
+from judge_oo import evaluator  # noqa: E402
+
+
+def gil_status() -> str:
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        return "CPython com GIL"
+    enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    return "free-threaded, GIL " + ("reativado" if enabled else "desativado")
+
+
+def run(sources, threads: int, rounds: int) -> float:
+    work = sources * rounds
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(evaluator.evaluate_code, work):
+            pass
+    return len(work) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern")
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = []
+    for path in sorted(glob.glob(args.pattern)):
+        with open(path, "rb") as f:
+            sources.append(parsing.decode_source(f.read())[0])
+    if not sources:
+        sys.exit(f"Nenhum arquivo encontrado em {args.pattern}")
+
+    # Sem cache: cada avaliação refaz o parsing, que é o trabalho a ser paralelizado
+    parsing.parse_cache.max_entries = 0
+
+    print(f"{sys.version.split()[0]} ({gil_status()}), {os.cpu_count()} núcleos, {len(sources)} arquivos")
+    baseline = None
+    for threads in (int(n) for n in args.threads.split(",")):
+        rate = run(sources, threads, args.rounds)
+        baseline = baseline or rate
+        print(f"{threads:3d} threads: {rate:8.1f} arquivos/s  (x{rate / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
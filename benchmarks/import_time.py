@@ -0,0 +1,54 @@
+"""Orçamento de tempo de importação dos módulos centrais de cada espaço.
+
+Importa, em um interpretador novo, o núcleo de avaliação de cada espaço junto com
+batch e parsing, e falha se o tempo passar do orçamento ou se o gradio for carregado.
+Workers e ferramentas de linha de comando dependem só desses módulos.
+
+Uso:
+    python benchmarks/import_time.py [--budget 0.5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORES = {
+    os.path.join("java-inspector", "java-inspector"): "inspector",
+    os.path.join("java-judge-oo", "java-judge-oo"): "judge_oo",
+    os.path.join("java-judge-syntax-competencies", "java-judge-syntax-competencies"): "judge_syntax",
+}
+# Importa o núcleo e devolve o tempo gasto e se o gradio entrou em sys.modules
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}, batch, parsing
+print(json.dumps({{"elapsed": time.perf_counter() - start, "gradio": "gradio" in sys.modules}}))
+"""
+
+
+def measure(space: str, module: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE.format(module=module)],
+                            cwd=os.path.join(ROOT, space), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.5, help="segundos por espaço")
+    args = parser.parse_args()
+
+    failures = 0
+    for space, module in CORES.items():
+        result = measure(space, module)
+        ok = result["elapsed"] <= args.budget and not result["gradio"]
+        failures += not ok
+        note = " (importou gradio)" if result["gradio"] else ""
+        print(f"{'ok   ' if ok else 'FALHA'} {module:14s} {result['elapsed']:.3f}s{note}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
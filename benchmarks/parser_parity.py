@@ -0,0 +1,118 @@
+"""Paridade e velocidade entre dois backends de parsing (por padrão javalang e tree-sitter).
+
+Para cada arquivo do corpus, mede o tempo de parsing em cada backend (melhor de
+--repeat execuções, sem cache) e compara o resultado de todas as ferramentas do
+registry (contagens, notas, níveis e feedback). Arquivos recusados pelos dois
+backends contam como paridade; os demais resultados precisam ser idênticos.
+Ao final, mede o tempo de todas as ferramentas sobre o corpus com cada backend.
+Termina com código 1 se houver divergência.
+
+O backend tree-sitter requer os pacotes opcionais: pip install tree-sitter tree-sitter-java
+
+Uso:
+    python benchmarks/parser_parity.py "<glob dos arquivos .java>" [--repeat 5]
+    python benchmarks/parser_parity.py "<glob>" --backends javalang,javalang-fast
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "java-judge-suite", "java-judge-suite"))
+
+from registry import ANALYZERS  # noqa: E402
+import parsing  # noqa: E402
+from backends import create_backend  # noqa: E402
+
+
+def parse_time(backend, code: str, repeat: int):
+    """Melhor tempo de parsing e se o código foi aceito"""
+    best, accepted = float("inf"), True
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            backend.parse(code)
+        except Exception:
+            accepted = False
+        best = min(best, time.perf_counter() - start)
+    return best, accepted
+
+
+def outcome(analyzer, code: str):
+    """Resultado da ferramenta sem os tempos por critério"""
+    result = analyzer.analyze(code)
+    if analyzer.score is not None:
+        result = analyzer.score(result)
+    return {key: value for key, value in result.items() if key != "timings"}
+
+
+def outcomes(backend: str, sources):
+    """Resultados de todas as ferramentas e o tempo total de análise do corpus"""
+    parsing.use_backend(backend)
+    start = time.perf_counter()
+    results = [{key: outcome(analyzer, code) for key, analyzer in ANALYZERS.items()} for _, code in sources]
+    return results, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backends", default="javalang,tree-sitter",
+                        help="par de backends comparados: referência,candidato")
+    args = parser.parse_args()
+    reference, candidate = args.backends.split(",")
+    names = (reference, candidate)
+
+    sources = []
+    for path in sorted(glob.glob(args.pattern)):
+        with open(path, "rb") as f:
+            sources.append((os.path.basename(path), parsing.decode_source(f.read())[0]))
+    if not sources:
+        sys.exit(f"Nenhum arquivo encontrado em {args.pattern}")
+
+    backends = {name: create_backend(name) for name in names}
+    results, analysis = {}, {}
+    for name in names:
+        results[name], analysis[name] = outcomes(name, sources)
+
+    print(f"{'arquivo':32s} {reference[:12]:>12s} {candidate[:12]:>12s} {'speedup':>8s}  paridade")
+    speedups, divergent = [], 0
+    totals = dict.fromkeys(names, 0.0)
+    for index, (name, code) in enumerate(sources):
+        timings = {backend: parse_time(backends[backend], code, args.repeat) for backend in names}
+        (slow, slow_ok), (fast, fast_ok) = timings[reference], timings[candidate]
+        for backend in names:
+            totals[backend] += timings[backend][0]
+
+        if not slow_ok and not fast_ok:
+            status = "ok (recusado pelos dois)"
+        elif slow_ok != fast_ok:
+            status = f"DIVERGE: só {reference if slow_ok else candidate} aceita"
+        else:
+            differing = [key for key in ANALYZERS
+                         if results[reference][index][key] != results[candidate][index][key]]
+            status = f"DIVERGE: {', '.join(differing)}" if differing else "ok"
+        divergent += status.startswith("DIVERGE")
+
+        speedup = slow / fast if fast else float("inf")
+        if slow_ok and fast_ok:
+            speedups.append(speedup)
+        print(f"{name[:32]:32s} {slow * 1000:10.2f}ms {fast * 1000:10.2f}ms {speedup:7.1f}x  {status}")
+
+    print(f"\n{len(sources)} arquivos, {len(sources) - divergent} com paridade, {divergent} divergentes")
+    if speedups:
+        print(f"speedup por arquivo: mediana {statistics.median(speedups):.1f}x, "
+              f"mínimo {min(speedups):.1f}x, máximo {max(speedups):.1f}x")
+    print(f"parsing do corpus: {reference} {totals[reference] * 1000:.1f}ms, "
+          f"{candidate} {totals[candidate] * 1000:.1f}ms")
+    print(f"todas as ferramentas sobre o corpus (parsing e análise): {reference} {analysis[reference] * 1000:.1f}ms, "
+          f"{candidate} {analysis[candidate] * 1000:.1f}ms")
+    sys.exit(1 if divergent else 0)
+
+
+if __name__ == "__main__":
+    main()
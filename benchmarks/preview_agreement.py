@@ -0,0 +1,72 @@
+"""Concordância e velocidade entre a prévia léxica e a avaliação completa do Java-Judge.
+
+Para cada arquivo do corpus e cada avaliador do judge_syntax (estrutural e por
+competências), calcula a prévia só pelos tokens e a avaliação completa com parsing
+(sem cache), e compara pontuação total, nível de proficiência e cada critério. Os
+tempos são o melhor de --repeat execuções.
+
+Uso:
+    python benchmarks/preview_agreement.py "<glob dos arquivos .java>" [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "java-judge-syntax-competencies", "java-judge-syntax-competencies"))
+
+import parsing  # noqa: E402
+from judge_syntax import EVALUATORS  # noqa: E402
+from live import TierAgreement  # noqa: E402
+
+
+def best_time(evaluate, code: str, repeat: int):
+    """Melhor tempo e o resultado da última execução, sem o cache de parsing"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        parsing.parse_cache.clear()
+        start = time.perf_counter()
+        result = evaluate(code)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pattern")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sources = []
+    for path in sorted(glob.glob(args.pattern)):
+        with open(path, "rb") as f:
+            sources.append((os.path.basename(path), parsing.decode_source(f.read())[0]))
+    if not sources:
+        sys.exit(f"Nenhum arquivo encontrado em {args.pattern}")
+
+    for key, evaluator in EVALUATORS.items():
+        agreement = TierAgreement()
+        preview_total = full_total = 0.0
+        print(f"\n{key}")
+        print(f"{'arquivo':32s} {'prévia':>10s} {'completa':>10s}  pontuação")
+        for name, code in sources:
+            preview_time, preview = best_time(evaluator.preview_code, code, args.repeat)
+            full_time, full = best_time(evaluator.evaluate_code, code, args.repeat)
+            preview_total += preview_time
+            full_total += full_time
+            agreement.record(preview, full)
+            scores = f"{preview['summary']['total_score']:.0f} / {full['summary']['total_score']:.0f}"
+            mark = "" if preview["summary"]["total_score"] == full["summary"]["total_score"] else "  DIVERGE"
+            if preview["summary"].get("unsupported"):
+                mark += f"  (provisória: {', '.join(preview['summary']['unsupported'])})"
+            print(f"{name[:32]:32s} {preview_time * 1000:8.2f}ms {full_time * 1000:8.2f}ms  {scores}{mark}")
+
+        print(agreement.describe())
+        print(f"média por arquivo: prévia {preview_total / len(sources) * 1000:.2f}ms, "
+              f"completa {full_total / len(sources) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,169 +1,67 @@
-import gradio as gr
-import javalang
-from collections import Counter
-from typing import Dict, List
-
-class JavaSyntaxAnalyzer:
-    """Java-Inspector: Syntax and OO Paradigm  Inspection in Java Code """
-
-    def analyze_syntax(self, code: str) -> Dict[str, int]:
-        """Analisa sintaticamente o código em diferentes categorias"""
-        results = Counter()
-
-        try:
-            tree = javalang.parse.parse(code)
-
-            # Declarações
-            results["Tipos Primitivos"] = len([
-                node.type.name for _, node in tree.filter(javalang.tree.LocalVariableDeclaration)
-                if node.type.name in {"int", "double", "boolean", "char", "float", "long", "byte", "short"}
-            ])
-            results["Constantes (final)"] = sum(
-                1 for _, node in tree.filter(javalang.tree.FieldDeclaration) if "final" in node.modifiers
-            )
-            results["Variáveis Declaradas"] = len(list(tree.filter(javalang.tree.LocalVariableDeclaration)))
-
-            # Estruturas de Controle
-            results["If/Else"] = len(list(tree.filter(javalang.tree.IfStatement)))
-            results["Switch/Case"] = len(list(tree.filter(javalang.tree.SwitchStatement)))
-            results["For Loops"] = len(list(tree.filter(javalang.tree.ForStatement)))
-            results["While Loops"] = len(list(tree.filter(javalang.tree.WhileStatement)))
-            results["Do-While Loops"] = len(list(tree.filter(javalang.tree.DoStatement)))
-
-            # Operadores
-            code_snippet = code
-            operators = {
-                "Aritméticos": ["+", "-", "*", "/", "%"],
-                "Comparação": ["==", "!=", ">", "<", ">=", "<="],
-                "Lógicos": ["&&", "||", "!"],
-                "Atribuição": ["+=", "-=", "*=", "/="],
-            }
-            for category, ops in operators.items():
-                results[category] = sum(code_snippet.count(op) for op in ops)
-
-            # Entrada/Saída e Strings
-            results["System.out.print"] = code_snippet.count("System.out.print")
-            results["Scanner"] = code_snippet.count("Scanner")
-            results["Concatenação de Strings"] = code_snippet.count("+")
-            string_methods = ["concat", "substring", "length", "equals", "compareTo"]
-            results["Métodos de String"] = sum(code_snippet.count(f".{method}(") for method in string_methods)
-
-        except Exception as e:
-            results["Erro"] = str(e)
-
-        return dict(results)
-
-    def analyze_oo(self, code: str) -> Dict[str, int]:
-        """Analisa elementos do paradigma OO"""
-        results = Counter()
-
-        try:
-            tree = javalang.parse.parse(code)
-
-            # Classes e Objetos
-            results["Classes"] = len(list(tree.filter(javalang.tree.ClassDeclaration)))
-            results["Objetos"] = len([
-                node for _, node in tree.filter(javalang.tree.VariableDeclarator) 
-                if node.initializer and "new" in str(node.initializer)
-            ])
-
-            # Métodos
-            results["Métodos"] = len(list(tree.filter(javalang.tree.MethodDeclaration)))
-
-            # Atributos e Encapsulamento
-            fields = list(tree.filter(javalang.tree.FieldDeclaration))
-            results["Atributos"] = len(fields)
-            results["Encapsulamento"] = sum(
-                1 for _, field in fields if "private" in field.modifiers
-            )
-
-            # Herança
-            results["Herança"] = len([
-                node for _, node in tree.filter(javalang.tree.ClassDeclaration) if node.extends
-            ])
-
-            # Polimorfismo
-            results["Polimorfismo"] = len([
-                node for _, node in tree.filter(javalang.tree.MethodDeclaration)
-                if "Override" in (node.annotations or [])
-            ])
-
-        except Exception as e:
-            results["Erro"] = str(e)
-
-        return dict(results)
-
-def process_files(files) -> List[Dict]:
-    """Processa múltiplos arquivos e analisa sintaxe e OO"""
-    analyzer = JavaSyntaxAnalyzer()
-    file_results = []
-
-    for file in files:
-        with open(file.name, 'r', encoding='utf-8') as f:
-            code = f.read()
-        syntax_results = analyzer.analyze_syntax(code)
-        oo_results = analyzer.analyze_oo(code)
-        
-        combined_results = {**syntax_results, **oo_results}
-        combined_results["Arquivo"] = file.name
-        file_results.append(combined_results)
-
-    return file_results
-
-# Interface Gradio
-with gr.Blocks(title="Java-Inspector") as demo:
-    gr.Markdown("# Java-Inspector: Syntax and OO Paradigm  Inspection in Java Code")
-    gr.Markdown("Suba os arquivos Java para destrinchar as estruturas sintáticas e orientadas a objetos.")
-
-    file_input = gr.File(label="Arquivos Java", file_types=[".java"], file_count="multiple")
-    analyze_button = gr.Button("Analisar Arquivos")
-
-    output_table = gr.Dataframe(
-        label="Resultados", 
-        headers=[
-            "Arquivo", 
-            "Tipos Primitivos", "Constantes", "Variáveis Declaradas", "If/Else", "Switch/Case", 
-            "For Loops", "While Loops", "Do-While Loops", "Aritméticos", "Comparação", 
-            "Lógicos", "Atribuição", "System.out", "Scanner", "Concatenação", "Métodos de String", 
-            "Classes", "Objetos", "Métodos", "Atributos", "Encapsulamento", "Herança", "Polimorfismo"
-        ]
-    )
-
-    def analyze_files(files):
-        results = process_files(files)
-        # Converte os resultados para uma lista de listas para exibição na tabela
-        formatted_results = [
-            [
-                result["Arquivo"],
-                result.get("Tipos Primitivos", 0),
-                result.get("Constantes (final)", 0),
-                result.get("Variáveis Declaradas", 0),
-                result.get("If/Else", 0),
-                result.get("Switch/Case", 0),
-                result.get("For Loops", 0),
-                result.get("While Loops", 0),
-                result.get("Do-While Loops", 0),
-                result.get("Aritméticos", 0),
-                result.get("Comparação", 0),
-                result.get("Lógicos", 0),
-                result.get("Atribuição", 0),
-                result.get("System.out.print", 0),
-                result.get("Scanner", 0),
-                result.get("Concatenação de Strings", 0),
-                result.get("Métodos de String", 0),
-                result.get("Classes", 0),
-                result.get("Objetos", 0),
-                result.get("Métodos", 0),
-                result.get("Atributos", 0),
-                result.get("Encapsulamento", 0),
-                result.get("Herança", 0),
-                result.get("Polimorfismo", 0),
-            ]
-            for result in results
-        ]
-        return formatted_results
-
-    analyze_button.click(fn=analyze_files, inputs=file_input, outputs=output_table)
-
-if __name__ == "__main__":
-    demo.launch(share=True)
+import gradio as gr
+from functools import partial
+from typing import Iterator, List, Optional, Tuple
+from batch import BatchReport, stream_batch
+from inspector import COLUMNS, HEADERS, analyzer, select_columns, table_headers, table_rows
+from scheduler import scheduler
+from parsing import prefetch_files
+from scaffold import register_upload
+from uploads import TempDirJanitor, java_file_input
+from workers import start_worker_pool
+
+def process_files(files, prefetched=None, session=None, headers: Optional[List[str]] = None,
+                  scaffold: Optional[str] = None, discount_clones: bool = False
+                  ) -> Iterator[Tuple[List[List], BatchReport]]:
+    """Processa múltiplos arquivos e analisa sintaxe e OO, gerando resultados parciais
+
+    Só as métricas das colunas escolhidas em headers são calculadas; com scaffold (código
+    inicial), só o que cada arquivo acrescentou a ele é contado; com discount_clones,
+    estruturas copiadas e coladas no mesmo arquivo contam uma vez só.
+    """
+    columns = select_columns(headers)
+    analyze = partial(analyzer.analyze, metrics=[key for _, key in columns], scaffold=scaffold,
+                      discount_clones=bool(discount_clones))
+    for report in stream_batch(files, analyze, prefetched, session=session):
+        yield table_rows(report.results, columns), report
+
+# Interface Gradio
+with gr.Blocks(title="Java-Inspector") as demo:
+    gr.Markdown("# Java-Inspector: Syntax and OO Paradigm  Inspection in Java Code")
+    gr.Markdown("Suba os arquivos Java para destrinchar as estruturas sintáticas e orientadas a objetos.")
+
+    file_input = java_file_input(label="Arquivos Java", file_types=[".java"], file_count="multiple")
+    with gr.Accordion("Código inicial (opcional)", open=False):
+        gr.Markdown("Envie o código fornecido aos alunos para contar só o que cada arquivo acrescentou a ele.")
+        scaffold_upload = java_file_input(label="Código inicial", file_types=[".java"], file_count="single")
+        scaffold_status = gr.Markdown()
+    scaffold = gr.State(None)
+    discount_input = gr.Checkbox(label="Contar uma vez só as estruturas copiadas e coladas no mesmo arquivo",
+                                 value=False)
+    analyze_button = gr.Button("Analisar Arquivos")
+    # Leitura e parsing iniciados no upload, antes do clique
+    prefetched = gr.State({})
+
+    column_input = gr.CheckboxGroup(label="Colunas", choices=[header for header, _ in COLUMNS],
+                                    value=[header for header, _ in COLUMNS])
+    output_table = gr.Dataframe(label="Resultados", headers=HEADERS)
+
+    summary_output = gr.Textbox(label="Resumo do Lote", lines=6)
+
+    def analyze_files(files, prefetched, headers, scaffold, discount_clones, request: gr.Request):
+        session = getattr(request, "session_hash", None)
+        columns = table_headers(select_columns(headers))
+        for results, report in process_files(files, prefetched, session, headers, scaffold, discount_clones):
+            yield {"headers": columns, "data": results}, (
+                report.summary() if report.complete
+                else f"Analisados {len(report.results)} de {report.total} arquivos...\n"
+                     f"{scheduler.stats().describe()}")
+
+    file_input.change(fn=prefetch_files, inputs=file_input, outputs=prefetched)
+    scaffold_upload.change(fn=register_upload, inputs=scaffold_upload, outputs=[scaffold, scaffold_status])
+    analyze_button.click(fn=analyze_files, inputs=[file_input, prefetched, column_input, scaffold, discount_input], outputs=[output_table, summary_output])
+
+if __name__ == "__main__":
+    # Workers criados antes das threads do servidor, a partir do processo já carregado
+    start_worker_pool(preload=["inspector"])
+    TempDirJanitor().start()
+    demo.launch(share=True)
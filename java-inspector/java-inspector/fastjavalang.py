@@ -0,0 +1,263 @@
+"""Fork do javalang voltado a desempenho.
+
+Produz exatamente as mesmas árvores do javalang.parse.parse (nós de javalang.tree, com
+a mesma representação textual), então tree.filter e os avaliadores continuam
+funcionando sem mudanças. As diferenças ficam no caminho até a árvore e no percurso:
+
+- tokenizador com identificadores, palavras reservadas, separadores e operadores
+  resolvidos por expressões regulares e tabelas, em vez de caractere a caractere;
+- accept/would_accept/try_accept com acesso direto à lista de tokens;
+- percurso da árvore iterativo e feito uma única vez por árvore: filter e a iteração
+  reaproveitam a lista de (caminho, nó), sem geradores recursivos. Os avaliadores
+  chamam filter dezenas de vezes sobre a mesma árvore.
+
+O parser do javalang retrocede trocando de regra (declaração local e depois comando,
+lambda e depois cast), sem repetir a mesma regra na mesma posição: memoização no estilo
+packrat não teve nenhum acerto no corpus de teste e só acrescentava custo, assim como
+construir os nós sem o Node.__init__. Os nós continuam sendo as classes do javalang,
+sem __slots__, para que isinstance e os filtros sobre javalang.tree continuem valendo.
+"""
+import re
+import unicodedata
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+from javalang import tree
+from javalang.ast import Node
+from javalang.parser import JavaParserError, Parser
+from javalang.tokenizer import (
+    Annotation, BasicType, Boolean, Identifier, JavaTokenizer, Keyword, Modifier, Null,
+    Operator, Position, Separator, String,
+)
+
+_IDENTIFIER_START = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_$")
+_IDENTIFIER_PART = re.compile(r"[A-Za-z0-9_$]*")
+# Alternativas da maior para a menor: o primeiro casamento é o operador mais longo
+_OPERATOR = re.compile("|".join(re.escape(value) for value in sorted(Operator.VALUES, key=len, reverse=True)))
+# Separadores sem o ponto, que também pode iniciar '...' ou um número
+_SEPARATORS = frozenset(Separator.VALUES) - {"."}
+
+
+def _word_type(word: str) -> type:
+    # Mesma precedência do JavaTokenizer.read_identifier
+    if word in Keyword.VALUES:
+        if word in BasicType.VALUES:
+            return BasicType
+        if word in Modifier.VALUES:
+            return Modifier
+        return Keyword
+    if word in Boolean.VALUES:
+        return Boolean
+    return Null if word == "null" else Identifier
+
+
+_WORD_TYPES = {word: _word_type(word)
+               for word in Keyword.VALUES | Modifier.VALUES | BasicType.VALUES | Boolean.VALUES | {"null"}
+               if _word_type(word) is not Identifier}
+
+
+class FastTokenizer(JavaTokenizer):
+    """Tokenizador do javalang com os casos comuns resolvidos sem percorrer caracteres"""
+
+    # Compartilhados entre as instâncias: o javalang os reconstrói a cada tokenizador,
+    # o que pesa no parsing de muitos trechos pequenos
+    operators = [frozenset(value for value in Operator.VALUES if len(value) == length)
+                 for length in range(1, Operator.MAX_LEN + 1)]
+    whitespace_consumer = re.compile(r"[^\s]")
+
+    def __init__(self, data, ignore_errors=False):
+        self.data = data
+        self.ignore_errors = ignore_errors
+        self.errors = []
+        self.current_line = 1
+        self.start_of_line = -1
+        self.javadoc = None
+
+    def read_identifier(self):
+        data, length = self.data, self.length
+        j = self.i + 1
+        while True:
+            j = _IDENTIFIER_PART.match(data, j).end()
+            # Fora do ASCII vale a regra do javalang, por categoria Unicode
+            if j < length and data[j] >= "\x80" and unicodedata.category(data[j]) in self.IDENT_PART_CATEGORIES:
+                j += 1
+            else:
+                break
+        self.j = j
+        return _WORD_TYPES.get(data[self.i:j], Identifier)
+
+    def try_operator(self):
+        match = _OPERATOR.match(self.data, self.i)
+        if match is None:
+            return False
+        self.j = match.end()
+        return True
+
+    def read_token(self, c: str):
+        """Tipo do próximo token fora dos casos rápidos; None quando nada foi emitido"""
+        c_next = self.data[self.i + 1] if self.i + 1 < self.length else None
+        startswith = c + c_next if c_next else c
+
+        if c.isspace():
+            self.consume_whitespace()
+        elif startswith in ("//", "/*"):
+            comment = self.read_comment()
+            if comment.startswith("/**"):
+                self.javadoc = comment
+        elif startswith == ".." and self.try_operator():
+            return Operator
+        elif c == "@":
+            self.j = self.i + 1
+            return Annotation
+        elif c == "." and c_next and c_next.isdigit():
+            return self.read_decimal_float_or_integer()
+        elif self.try_separator():
+            return Separator
+        elif c in ("'", '"'):
+            self.read_string()
+            return String
+        elif c in "0123456789":
+            return self.read_integer_or_float(c, c_next)
+        elif self.is_java_identifier_start(c):
+            return self.read_identifier()
+        elif self.try_operator():
+            return Operator
+        else:
+            self.error("Could not process token", c)
+            self.i = self.i + 1
+        return None
+
+    def tokenize(self):
+        self.reset()
+        self.pre_tokenize()
+        data, length = self.data, self.length
+
+        while self.i < length:
+            i = self.i
+            c = data[i]
+            if c in _IDENTIFIER_START:
+                token_type = self.read_identifier()
+            elif c in _SEPARATORS:
+                self.j = i + 1
+                token_type = Separator
+            else:
+                token_type = self.read_token(c)
+                if token_type is None:
+                    continue
+
+            yield token_type(data[i:self.j], Position(self.current_line, i - self.start_of_line), self.javadoc)
+            self.javadoc = None
+            self.i = self.j
+
+
+def tokenize(code: str, ignore_errors: bool = False):
+    """Equivalente a javalang.tokenizer.tokenize"""
+    return FastTokenizer(code, ignore_errors).tokenize()
+
+
+class FastParser(Parser):
+    """Parser do javalang com acesso direto à lista de tokens"""
+
+    def accept(self, *accepts):
+        if not accepts:
+            raise JavaParserError("Missing acceptable values")
+        tokens = self.tokens
+        for accept in accepts:
+            token = next(tokens)
+            if type(accept) is str:
+                if token.value != accept:
+                    self.illegal("Expected '%s'" % (accept,))
+            elif not isinstance(token, accept):
+                self.illegal("Expected %s" % (accept.__name__,))
+        return token.value
+
+    def would_accept(self, *accepts):
+        tokens = self.tokens
+        items = tokens.list
+        index = tokens.marker
+        if len(accepts) == 1:
+            # Caso mais comum: um único token
+            token = items[index] if index < len(items) else tokens.default
+            accept = accepts[0]
+            return token.value == accept if type(accept) is str else isinstance(token, accept)
+        if not accepts:
+            raise JavaParserError("Missing acceptable values")
+        for accept in accepts:
+            token = items[index] if index < len(items) else tokens.default
+            index += 1
+            if type(accept) is str:
+                if token.value != accept:
+                    return False
+            elif not isinstance(token, accept):
+                return False
+        return True
+
+    def try_accept(self, *accepts):
+        if not self.would_accept(*accepts):
+            return False
+        tokens = self.tokens
+        for _ in accepts:
+            next(tokens)
+        return True
+
+
+_children: Dict[type, attrgetter] = {}
+
+
+def walk_tree(root) -> List[Tuple[tuple, Node]]:
+    """Mesmos pares (caminho, nó), na mesma ordem, do javalang.ast.walk_tree
+
+    Iterativo; todos os filhos de um mesmo nó ou lista compartilham a tupla do caminho.
+    """
+    result = []
+    stack = [((), root)]
+    pop, push, append = stack.pop, stack.append, result.append
+    while stack:
+        path, item = pop()
+        if isinstance(item, Node):
+            append((path, item))
+            kind = type(item)
+            getter = _children.get(kind)
+            if getter is None:
+                getter = _children[kind] = attrgetter(*kind.attrs) if kind.attrs else (lambda node: ())
+            children = getter(item)
+            if len(kind.attrs) == 1:
+                children = (children,)
+        else:
+            children = item
+        child_path = path + (item,)
+        for child in reversed(children):
+            if isinstance(child, (Node, list, tuple)):
+                push((child_path, child))
+    return result
+
+
+class CompilationUnit(tree.CompilationUnit):
+    """CompilationUnit com o percurso da árvore calculado uma vez e reaproveitado"""
+    attrs = ()
+
+    def __iter__(self):
+        walk = self.__dict__.get("_walk")
+        if walk is None:
+            walk = self._walk = walk_tree(self)
+        return iter(walk)
+
+    def filter(self, pattern):
+        if isinstance(pattern, type):
+            return ((path, node) for path, node in self if isinstance(node, pattern))
+        return ((path, node) for path, node in self if node == pattern)
+
+
+# Mantém o nome da classe na representação textual dos nós
+CompilationUnit.__name__ = CompilationUnit.__qualname__ = "CompilationUnit"
+
+
+def cached_walk(unit: tree.CompilationUnit) -> tree.CompilationUnit:
+    """Troca a classe da raiz pela versão com percurso em cache; os atributos não mudam"""
+    unit.__class__ = CompilationUnit
+    return unit
+
+
+def parse(code: str, tokens: Optional[List] = None) -> tree.CompilationUnit:
+    """Equivalente a javalang.parse.parse; tokens, se dados, são os de tokenize(code)"""
+    return cached_walk(FastParser(tokenize(code) if tokens is None else tokens).parse())
@@ -0,0 +1,215 @@
+import javalang
+from typing import Dict, Iterable, List, Optional
+from features import BASE_FEATURES, SCAFFOLD, SOURCE, discounting_clones
+from scaffold import scaffolds
+
+# Métricas do inspetor, calculadas sob demanda: as léxicas leem só o código, as demais o
+# índice de símbolos da árvore
+FEATURES = BASE_FEATURES.extend()
+PRIMITIVE_TYPES = {"int", "double", "boolean", "char", "float", "long", "byte", "short"}
+OPERATORS = {
+    "Aritméticos": ["+", "-", "*", "/", "%"],
+    "Comparação": ["==", "!=", ">", "<", ">=", "<="],
+    "Lógicos": ["&&", "||", "!"],
+    "Atribuição": ["+=", "-=", "*=", "/="],
+}
+STRING_METHODS = ["concat", "substring", "length", "equals", "compareTo"]
+
+def _count(node_type):
+    return lambda index: len(index.of(node_type))
+
+def _count_text(*snippets):
+    def count(code: str, scaffold) -> int:
+        total = sum(code.count(snippet) for snippet in snippets)
+        if scaffold is not None:
+            # Ocorrências do código inicial, contadas uma vez por registro
+            total -= scaffold.baseline(snippets, lambda text: sum(text.count(snippet) for snippet in snippets))
+        return max(total, 0)
+    return count
+
+# Declarações
+@FEATURES.feature("Tipos Primitivos", "index")
+def _primitive_types(index):
+    return sum(1 for node in index.of(javalang.tree.LocalVariableDeclaration) if node.type.name in PRIMITIVE_TYPES)
+
+@FEATURES.feature("Constantes (final)", "index")
+def _constants(index):
+    return sum(1 for node in index.of(javalang.tree.FieldDeclaration) if "final" in node.modifiers)
+
+FEATURES.feature("Variáveis Declaradas", "index")(_count(javalang.tree.LocalVariableDeclaration))
+
+# Estruturas de Controle
+FEATURES.feature("If/Else", "index")(_count(javalang.tree.IfStatement))
+FEATURES.feature("Switch/Case", "index")(_count(javalang.tree.SwitchStatement))
+FEATURES.feature("For Loops", "index")(_count(javalang.tree.ForStatement))
+FEATURES.feature("While Loops", "index")(_count(javalang.tree.WhileStatement))
+FEATURES.feature("Do-While Loops", "index")(_count(javalang.tree.DoStatement))
+
+# Operadores
+for _category, _ops in OPERATORS.items():
+    FEATURES.feature(_category, SOURCE, SCAFFOLD)(_count_text(*_ops))
+
+# Entrada/Saída e Strings
+FEATURES.feature("System.out.print", SOURCE, SCAFFOLD)(_count_text("System.out.print"))
+FEATURES.feature("Scanner", SOURCE, SCAFFOLD)(_count_text("Scanner"))
+FEATURES.feature("Concatenação de Strings", SOURCE, SCAFFOLD)(_count_text("+"))
+FEATURES.feature("Métodos de String", SOURCE, SCAFFOLD)(_count_text(*(f".{method}(" for method in STRING_METHODS)))
+
+# Classes e Objetos
+FEATURES.feature("Classes", "index")(_count(javalang.tree.ClassDeclaration))
+
+@FEATURES.feature("Objetos", "index")
+def _objects(index):
+    return sum(1 for node in index.of(javalang.tree.VariableDeclarator)
+               if node.initializer and "new" in str(node.initializer))
+
+# Métodos
+FEATURES.feature("Métodos", "index")(_count(javalang.tree.MethodDeclaration))
+
+# Atributos e Encapsulamento
+FEATURES.feature("Atributos", "index")(_count(javalang.tree.FieldDeclaration))
+
+@FEATURES.feature("Encapsulamento", "index")
+def _encapsulation(index):
+    return sum(1 for field in index.of(javalang.tree.FieldDeclaration) if "private" in field.modifiers)
+
+# Herança
+@FEATURES.feature("Herança", "index")
+def _inheritance(index):
+    return sum(1 for node in index.of(javalang.tree.ClassDeclaration) if node.extends)
+
+# Polimorfismo
+@FEATURES.feature("Polimorfismo", "index")
+def _polymorphism(index):
+    return sum(1 for node in index.of(javalang.tree.MethodDeclaration) if "Override" in (node.annotations or []))
+
+# Código duplicado (clones.py)
+@FEATURES.feature("Trechos Duplicados", "clones")
+def _duplicated(clones):
+    return sum(clone.copies for clone in clones.classes)
+
+@FEATURES.feature("Regiões Duplicadas", "clones")
+def _duplicated_regions(clones):
+    return "; ".join(" = ".join(clone.regions()) for clone in clones.classes)
+
+# Complexidade (complexity.py), pela mesma lista de tokens da detecção de clones
+@FEATURES.feature("Complexidade Ciclomática", "complexity")
+def _cyclomatic(complexity):
+    return complexity.max_cyclomatic
+
+@FEATURES.feature("Complexidade por Método", "complexity")
+def _cyclomatic_by_method(complexity):
+    return complexity.describe_methods()
+
+@FEATURES.feature("Aninhamento Máximo", "complexity")
+def _nesting(complexity):
+    return complexity.nesting
+
+@FEATURES.feature("Volume de Halstead", "complexity")
+def _halstead_volume(complexity):
+    return round(complexity.halstead.volume, 1)
+
+SYNTAX_METRICS = ["Tipos Primitivos", "Constantes (final)", "Variáveis Declaradas", "If/Else", "Switch/Case",
+                  "For Loops", "While Loops", "Do-While Loops", *OPERATORS, "System.out.print", "Scanner",
+                  "Concatenação de Strings", "Métodos de String"]
+OO_METRICS = ["Classes", "Objetos", "Métodos", "Atributos", "Encapsulamento", "Herança", "Polimorfismo"]
+CLONE_METRICS = ["Trechos Duplicados", "Regiões Duplicadas"]
+COMPLEXITY_METRICS = ["Complexidade Ciclomática", "Complexidade por Método", "Aninhamento Máximo",
+                      "Volume de Halstead"]
+
+# Mesmas métricas, sem contar estruturas inteiras dentro de trechos copiados
+CLONE_FREE_FEATURES = discounting_clones(FEATURES)
+
+class JavaSyntaxAnalyzer:
+    """Java-Inspector: Syntax and OO Paradigm  Inspection in Java Code """
+    __slots__ = ()
+
+    def analyze_syntax(self, code: str, discount_clones: bool = False) -> Dict[str, int]:
+        """Analisa sintaticamente o código em diferentes categorias"""
+        return self.analyze(code, SYNTAX_METRICS, discount_clones=discount_clones)
+
+    def analyze_oo(self, code: str) -> Dict[str, int]:
+        """Analisa elementos do paradigma OO"""
+        return self.analyze(code, OO_METRICS)
+
+    def analyze(self, code: str, metrics: Optional[Iterable[str]] = None,
+                scaffold: Optional[str] = None, discount_clones: bool = False) -> Dict[str, int]:
+        """Calcula as métricas pedidas (todas, se metrics for None)
+
+        Só as features de que essas métricas dependem são calculadas; se alguma delas
+        depende da árvore, um arquivo que não compila devolve apenas "Erro". Com scaffold (código inicial do professor), as
+        métricas contam só o que a submissão acrescentou a ele. Com discount_clones, as
+        estruturas copiadas e coladas no próprio arquivo contam uma vez só.
+        """
+        results = {}
+        try:
+            graph = CLONE_FREE_FEATURES if discount_clones else FEATURES
+            context = graph.context(code, scaffolds.get(scaffold))
+            names = (SYNTAX_METRICS + OO_METRICS + CLONE_METRICS + COMPLEXITY_METRICS
+                     if metrics is None else list(metrics))
+            # As métricas da árvore passam pelo índice (que, descontando clones, faz o
+            # próprio parsing): com erro de sintaxe nenhuma delas sai
+            if "index" in graph.requirements(names):
+                context["index"]
+            for name in names:
+                results[name] = context[name]
+        except Exception as e:
+            results["Erro"] = str(e)
+        return results
+
+# Analisador sem estado, criado uma vez e compartilhado entre as requisições
+analyzer = JavaSyntaxAnalyzer()
+
+# Colunas da tabela de resultados e a chave correspondente em JavaSyntaxAnalyzer.analyze
+COLUMNS = [
+    ("Tipos Primitivos", "Tipos Primitivos"),
+    ("Constantes", "Constantes (final)"),
+    ("Variáveis Declaradas", "Variáveis Declaradas"),
+    ("If/Else", "If/Else"),
+    ("Switch/Case", "Switch/Case"),
+    ("For Loops", "For Loops"),
+    ("While Loops", "While Loops"),
+    ("Do-While Loops", "Do-While Loops"),
+    ("Aritméticos", "Aritméticos"),
+    ("Comparação", "Comparação"),
+    ("Lógicos", "Lógicos"),
+    ("Atribuição", "Atribuição"),
+    ("System.out", "System.out.print"),
+    ("Scanner", "Scanner"),
+    ("Concatenação", "Concatenação de Strings"),
+    ("Métodos de String", "Métodos de String"),
+    ("Classes", "Classes"),
+    ("Objetos", "Objetos"),
+    ("Métodos", "Métodos"),
+    ("Atributos", "Atributos"),
+    ("Encapsulamento", "Encapsulamento"),
+    ("Herança", "Herança"),
+    ("Polimorfismo", "Polimorfismo"),
+    ("Trechos Duplicados", "Trechos Duplicados"),
+    ("Regiões Duplicadas", "Regiões Duplicadas"),
+    ("Complexidade Ciclomática (máx.)", "Complexidade Ciclomática"),
+    ("Complexidade por Método", "Complexidade por Método"),
+    ("Aninhamento Máximo", "Aninhamento Máximo"),
+    ("Volume de Halstead", "Volume de Halstead"),
+]
+def table_headers(columns: Optional[List[tuple]] = None) -> List[str]:
+    """Cabeçalhos da tabela para as colunas escolhidas (todas, se columns for None)"""
+    return ["Arquivo", "Codificação"] + [header for header, _ in (COLUMNS if columns is None else columns)]
+
+HEADERS = table_headers()
+
+def select_columns(headers: Optional[Iterable[str]] = None) -> List[tuple]:
+    """Colunas escolhidas pelo cabeçalho, na ordem da tabela (todas, se headers for None)"""
+    if headers is None:
+        return COLUMNS
+    chosen = set(headers)
+    return [(header, key) for header, key in COLUMNS if header in chosen]
+
+def table_rows(file_results, columns: Optional[List[tuple]] = None) -> List[List]:
+    """Converte os resultados para uma lista de listas para exibição na tabela"""
+    columns = COLUMNS if columns is None else columns
+    # Arquivos que falharam aparecem apenas no resumo do lote
+    return [
+        [result.name, result.encoding] + [result.evaluation.get(key, 0) for _, key in columns]
+        for result in file_results if result.evaluation is not None
+    ]
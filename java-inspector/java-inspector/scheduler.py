@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Deque, Optional
+
+# Limites de admissão aplicados antes de qualquer parsing
+MAX_FILES_PER_REQUEST = 200
+MAX_FILE_BYTES = 1024 * 1024
+MAX_FILE_LINES = 20000
+# Arquivos acima destes limites são aceitos, mas só rodam quando não há trabalho normal na fila
+DEFER_FILE_BYTES = 200 * 1024
+DEFER_FILE_LINES = 5000
+
+# Threads que executam as tarefas de todas as sessões
+SCHEDULER_WORKERS = max(4, os.cpu_count() or 2)
+# Quantas esperas recentes entram nas estatísticas
+WAIT_SAMPLES = 200
+
+
+@dataclass
+class Admission:
+    accepted: bool
+    deferred: bool = False
+    reason: str = ""
+
+
+def prescan(data: bytes) -> Admission:
+    """Decide a admissão de um arquivo pelo tamanho em bytes e pelo número de linhas"""
+    size = len(data)
+    if size > MAX_FILE_BYTES:
+        return Admission(False, reason=f"arquivo com {size // 1024} KB excede o limite de {MAX_FILE_BYTES // 1024} KB")
+    lines = data.count(b"\n") + 1
+    if lines > MAX_FILE_LINES:
+        return Admission(False, reason=f"arquivo com {lines} linhas excede o limite de {MAX_FILE_LINES}")
+    return Admission(True, deferred=size > DEFER_FILE_BYTES or lines > DEFER_FILE_LINES)
+
+
+class ScheduledTask:
+    """Tarefa na fila do escalonador; o tempo de execução só começa a contar em started"""
+
+    def __init__(self, session: str, fn: Callable, args: tuple):
+        self.session = session
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.started = threading.Event()
+        self.enqueued_at = time.perf_counter()
+        self.wait = 0.0
+
+
+@dataclass
+class QueueStats:
+    queued: int
+    deferred: int
+    running: int
+    sessions: int
+    mean_wait: float
+    max_wait: float
+
+    def describe(self) -> str:
+        return (f"Fila: {self.queued + self.deferred} aguardando "
+                f"({self.deferred} adiados), {self.running} em execução, "
+                f"{self.sessions} sessões | espera média {self.mean_wait:.2f}s, "
+                f"máxima {self.max_wait:.2f}s")
+
+
+class FairScheduler:
+    """Executa tarefas em um pool fixo de threads, alternando entre sessões (fair queuing)
+
+    Cada sessão tem sua própria fila e os workers atendem as sessões em rodízio, então um
+    lote de 500 arquivos não impede que um aluno com um único arquivo seja atendido logo.
+    """
+
+    def __init__(self, workers: int = SCHEDULER_WORKERS):
+        self._queues: "OrderedDict[str, Deque[ScheduledTask]]" = OrderedDict()
+        self._deferred: Deque[ScheduledTask] = deque()
+        self._waits: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._condition = threading.Condition()
+        self._running = 0
+        self._workers = workers
+        self._threads = []
+
+    def _start_workers(self):
+        # Threads criadas só na primeira tarefa: importar o módulo continua barato
+        self._threads = [threading.Thread(target=self._work, name=f"scheduler-{i}", daemon=True)
+                         for i in range(self._workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, session: Optional[str], fn: Callable, *args, deferred: bool = False) -> ScheduledTask:
+        task = ScheduledTask(session or "", fn, args)
+        with self._condition:
+            if not self._threads:
+                self._start_workers()
+            if deferred:
+                self._deferred.append(task)
+            else:
+                self._queues.setdefault(task.session, deque()).append(task)
+            self._condition.notify()
+        return task
+
+    def _next_task(self) -> Optional[ScheduledTask]:
+        # Rodízio: a sessão atendida volta para o fim da fila se ainda tiver tarefas
+        if self._queues:
+            session, tasks = self._queues.popitem(last=False)
+            task = tasks.popleft()
+            if tasks:
+                self._queues[session] = tasks
+            return task
+        if self._deferred:
+            return self._deferred.popleft()
+        return None
+
+    def _work(self):
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None:
+                    self._condition.wait()
+                    task = self._next_task()
+                self._running += 1
+                task.wait = time.perf_counter() - task.enqueued_at
+                self._waits.append(task.wait)
+
+            if task.future.set_running_or_notify_cancel():
+                task.started.set()
+                try:
+                    task.future.set_result(task.fn(*task.args))
+                except BaseException as e:
+                    task.future.set_exception(e)
+            else:
+                task.started.set()
+
+            with self._condition:
+                self._running -= 1
+
+    def stats(self) -> QueueStats:
+        with self._condition:
+            waits = list(self._waits)
+            return QueueStats(
+                queued=sum(len(tasks) for tasks in self._queues.values()),
+                deferred=len(self._deferred),
+                running=self._running,
+                sessions=len(self._queues),
+                mean_wait=sum(waits) / len(waits) if waits else 0.0,
+                max_wait=max(waits) if waits else 0.0,
+            )
+
+
+scheduler = FairScheduler()
@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import sys
+import threading
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional, Sequence
+
+# Tarefas por worker antes da reciclagem, para limitar o crescimento de memória
+WORKER_MAX_TASKS = 200
+# Módulos carregados uma única vez no servidor de fork e herdados pelos workers
+PRELOAD = ("__main__", "javalang", "parsing", "batch")
+# Antes do 3.14 o forkserver ignora o preload de __main__ e cada worker reimportaria o
+# app.py (e o gradio); nesses casos os workers são forks diretos do processo já carregado
+START_METHOD = "forkserver" if sys.version_info >= (3, 14) else "fork"
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class WorkerPool:
+    """Pool de processos pré-aquecidos, criados por fork de um processo já carregado
+
+    Cada worker nasce de um fork do processo que importou o núcleo do avaliador (ou do
+    servidor de fork, que importa os módulos de preload uma vez), compartilhando essas
+    páginas por copy-on-write, sem refazer importações nem reconstruir rubricas. Após
+    max_tasks tarefas por worker o executor inteiro é trocado por um novo; o
+    max_tasks_per_child do ProcessPoolExecutor pode travar no Python 3.11. O mesmo vale
+    para uma tarefa que estourou o tempo: não há como interromper só aquele worker, então
+    o executor dela é encerrado à força (discard).
+    """
+
+    def __init__(self, preload: Sequence[str] = (), workers: Optional[int] = None,
+                 max_tasks: int = WORKER_MAX_TASKS):
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context(START_METHOD if START_METHOD in methods else None)
+        if self.context.get_start_method() == "forkserver":
+            self.context.set_forkserver_preload(list(dict.fromkeys((*PRELOAD, *preload))))
+        else:
+            # Com fork os módulos de preload precisam estar carregados no processo pai
+            for module in preload:
+                __import__(module)
+        self.workers = workers or os.cpu_count() or 2
+        self.max_tasks = max_tasks
+        self.recycled = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._submitted = 0
+        self._owners: "weakref.WeakKeyDictionary[Future, ProcessPoolExecutor]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._executor is None or self._submitted >= self.workers * self.max_tasks:
+                if self._executor is not None:
+                    # Tarefas já enviadas ao executor antigo terminam normalmente
+                    self._executor.shutdown(wait=False)
+                    self.recycled += 1
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=self.context)
+                self._submitted = 0
+            self._submitted += 1
+            future = self._executor.submit(fn, *args)
+            self._owners[future] = self._executor
+            return future
+
+    def discard(self, future: Future):
+        """Mata os processos do executor que roda future; as demais tarefas dele falham com
+        BrokenProcessPool e as próximas vão para um executor novo"""
+        with self._lock:
+            executor = self._owners.pop(future, None)
+            if executor is None or future.done():
+                return
+            if executor is self._executor:
+                self._executor = None
+                self.recycled += 1
+        kill = getattr(executor, "kill_workers", None)  # Python 3.14+
+        if kill is not None:
+            kill()
+        else:
+            for process in list((executor._processes or {}).values()):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def warm(self) -> "WorkerPool":
+        """Inicia o servidor de fork e os workers em segundo plano, antes da primeira requisição"""
+        for _ in range(self.workers):
+            self.submit(_ping)
+        return self
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_worker_pool: Optional[WorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def start_worker_pool(preload: Sequence[str] = (), workers: Optional[int] = None,
+                      max_tasks: int = WORKER_MAX_TASKS) -> WorkerPool:
+    """Cria e aquece o pool compartilhado; deve ser chamado depois de importar o núcleo do avaliador"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = WorkerPool(preload, workers, max_tasks).warm()
+        return _worker_pool
+
+
+def get_process_pool() -> WorkerPool:
+    """Pool de processos compartilhado pelo estágio de parsing/análise"""
+    return _worker_pool or start_worker_pool()
+
+
+def running_pool() -> Optional[WorkerPool]:
+    """Pool compartilhado, se já foi iniciado por este processo (nunca dentro de um worker)"""
+    if multiprocessing.parent_process() is not None:
+        return None
+    return _worker_pool
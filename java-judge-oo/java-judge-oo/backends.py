@@ -0,0 +1,831 @@
+"""Backends de parsing Java usados pelos analisadores.
+
+Os analisadores trabalham sobre árvores no formato do javalang (javalang.tree): filtros
+por tipo de nó, atributos como modifiers/extends/initializer e a representação textual
+dos nós. Cada backend entrega esse mesmo formato:
+
+- "javalang-fast": fork do javalang com tokenizador mais rápido e percurso da árvore
+  em cache (fastjavalang), com árvores idênticas às do javalang (padrão);
+- "javalang": o parser em Python puro do javalang, sem modificações;
+- "tree-sitter": o parser incremental em C do tree-sitter-java, com a árvore concreta
+  convertida para nós do javalang. Aceita também sintaxe recente (records, switch com
+  "->", text blocks), que o javalang recusa.
+
+O backend é escolhido por implantação pela variável de ambiente JAVA_PARSER.
+"""
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+import javalang
+import fastjavalang
+from javalang import tree
+from javalang.parser import JavaSyntaxError
+from javalang.tokenizer import JavaToken, Position
+
+DEFAULT_BACKEND = "javalang-fast"
+
+
+class JavalangBackend:
+    name = "javalang"
+
+    def parse(self, code: str):
+        return javalang.parse.parse(code)
+
+
+class FastJavalangBackend:
+    name = "javalang-fast"
+
+    def parse(self, code: str, tokens: Optional[List] = None):
+        return fastjavalang.parse(code, tokens)
+
+
+class TreeSitterBackend:
+    """Parser tree-sitter-java com a árvore convertida para nós do javalang
+
+    Requer os pacotes opcionais tree-sitter e tree-sitter-java. Um parser por thread:
+    instâncias de Parser do tree-sitter não podem ser usadas por duas threads ao mesmo tempo.
+    """
+    name = "tree-sitter"
+
+    def __init__(self):
+        try:
+            import tree_sitter
+            import tree_sitter_java
+        except ImportError as e:
+            raise RuntimeError("backend tree-sitter requer: pip install tree-sitter tree-sitter-java") from e
+        self._parser_class = tree_sitter.Parser
+        self._language = tree_sitter.Language(tree_sitter_java.language())
+        self._local = threading.local()
+
+    def _parser(self):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = self._parser_class(self._language)
+        return parser
+
+    def parse(self, code: str):
+        source = code.encode("utf-8", "surrogatepass")
+        root = self._parser().parse(source).root_node
+        if root.has_error:
+            raise _syntax_error(root)
+        return fastjavalang.cached_walk(_Converter(source).convert(root))
+
+
+BACKENDS: Dict[str, Callable[[], object]] = {
+    JavalangBackend.name: JavalangBackend,
+    FastJavalangBackend.name: FastJavalangBackend,
+    TreeSitterBackend.name: TreeSitterBackend,
+}
+
+
+def create_backend(name: Optional[str] = None):
+    """Cria o backend pelo nome; sem nome usa JAVA_PARSER ou o padrão"""
+    name = name or os.environ.get("JAVA_PARSER") or DEFAULT_BACKEND
+    factory = BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"backend de parsing desconhecido: {name} (disponíveis: {', '.join(BACKENDS)})")
+    return factory()
+
+
+# Conversão da árvore do tree-sitter
+
+def _first_error(node):
+    """Primeiro nó ERROR ou MISSING, em ordem de posição"""
+    if node.is_missing or node.type == "ERROR":
+        return node
+    for child in node.children:
+        if child.has_error:
+            return _first_error(child)
+    return None
+
+
+def _syntax_error(root) -> JavaSyntaxError:
+    node = _first_error(root) or root
+    line, column = node.start_point
+    text = node.text.decode("utf-8", "replace").split("\n")[0][:40]
+    if node.is_missing:
+        description = f"Expected '{node.type}'"
+    elif text:
+        description = f"Unexpected '{text}'"
+    else:
+        description = "Unexpected end of input"
+    return JavaSyntaxError(description, at=JavaToken(text, Position(line + 1, column + 1)))
+
+
+_BASIC_TYPES = {"integral_type", "floating_point_type", "boolean_type"}
+_LITERALS = {
+    "decimal_integer_literal", "hex_integer_literal", "octal_integer_literal",
+    "binary_integer_literal", "decimal_floating_point_literal", "hex_floating_point_literal",
+    "string_literal", "character_literal", "true", "false", "null_literal",
+}
+_DECLARATIONS = {
+    "class_declaration", "record_declaration", "interface_declaration", "enum_declaration",
+    "annotation_type_declaration", "field_declaration", "constant_declaration",
+    "method_declaration", "constructor_declaration", "compact_constructor_declaration",
+}
+
+
+class _Converter:
+    """Converte a árvore concreta do tree-sitter-java em nós do javalang
+
+    Segue as escolhas do parser do javalang: corpos de métodos são listas de comandos,
+    cadeias de nomes viram o "qualifier" da referência, acessos encadeados viram
+    "selectors" e operadores unários ficam em prefix_operators/postfix_operators.
+    """
+
+    def __init__(self, source: bytes):
+        self.source = source
+
+    def text(self, node) -> str:
+        return self.source[node.start_byte:node.end_byte].decode("utf-8", "surrogatepass")
+
+    def convert(self, root) -> tree.CompilationUnit:
+        package, imports, types = None, [], []
+        for child, documentation in self.members(root.named_children):
+            if child.type == "package_declaration":
+                package = self.at(tree.PackageDeclaration(
+                    name=self.text(child.named_children[-1]), documentation=documentation), child)
+            elif child.type == "import_declaration":
+                imports.append(self.import_declaration(child))
+            else:
+                converted = self.declaration(child, documentation)
+                if converted is not None:
+                    types.append(converted)
+        return tree.CompilationUnit(package=package, imports=imports, types=types)
+
+    def at(self, node: tree.Node, source) -> tree.Node:
+        line, column = source.start_point
+        node._position = Position(line + 1, column + 1)
+        return node
+
+    def members(self, children):
+        """Gera (filho, javadoc) descartando comentários e associando /** ... */ à declaração seguinte"""
+        documentation = None
+        for child in children:
+            if child.type in ("block_comment", "line_comment"):
+                if child.type == "block_comment" and self.text(child).startswith("/**"):
+                    documentation = self.text(child)
+                continue
+            yield child, documentation if child.type in _DECLARATIONS else None
+            documentation = None
+
+    def import_declaration(self, node) -> tree.Import:
+        names = [child for child in node.named_children if child.type in ("identifier", "scoped_identifier")]
+        return self.at(tree.Import(
+            path=self.text(names[0]) if names else "",
+            static=any(child.type == "static" for child in node.children),
+            wildcard=any(child.type == "asterisk" for child in node.children)), node)
+
+    # Declarações
+
+    def modifiers(self, node):
+        """Modificadores (conjunto de palavras-chave) e anotações da declaração"""
+        modifiers, annotations = set(), []
+        for child in node.children:
+            if child.type != "modifiers":
+                continue
+            for item in child.children:
+                if item.type in ("marker_annotation", "annotation"):
+                    annotations.append(self.annotation(item))
+                elif not item.is_named:
+                    modifiers.add(item.type)
+        return modifiers, annotations
+
+    def annotation(self, node) -> tree.Annotation:
+        element = None
+        arguments = node.child_by_field_name("arguments")
+        if arguments is not None:
+            values = [self.element_value(child) for child in arguments.named_children
+                      if child.type not in ("line_comment", "block_comment")]
+            if len(values) == 1 and not isinstance(values[0], tree.ElementValuePair):
+                element = values[0]
+            elif values:
+                element = values
+        return self.at(tree.Annotation(name=self.text(node.child_by_field_name("name")), element=element), node)
+
+    def element_value(self, node):
+        if node.type == "element_value_pair":
+            return tree.ElementValuePair(name=self.text(node.child_by_field_name("key")),
+                                         value=self.element_value(node.child_by_field_name("value")))
+        if node.type == "element_value_array_initializer":
+            return tree.ElementArrayValue(values=[self.element_value(child) for child in node.named_children])
+        if node.type in ("marker_annotation", "annotation"):
+            return self.annotation(node)
+        return self.expression(node)
+
+    def declaration(self, node, documentation=None):
+        handler = getattr(self, "d_" + node.type, None)
+        if handler is not None:
+            return handler(node, documentation)
+        if node.type == ";":
+            return None
+        return self.statement(node)
+
+    def type_list(self, node) -> Optional[List]:
+        if node is None:
+            return None
+        types = node.named_children[-1] if node.named_children[-1].type == "type_list" else node
+        return [self.type(child) for child in types.named_children]
+
+    def type_parameters(self, node) -> Optional[List]:
+        parameters = node.child_by_field_name("type_parameters")
+        if parameters is None:
+            return None
+        result = []
+        for child in parameters.named_children:
+            names = [item for item in child.named_children if item.type in ("type_identifier", "identifier")]
+            bound = next((item for item in child.named_children if item.type == "type_bound"), None)
+            result.append(tree.TypeParameter(
+                name=self.text(names[0]) if names else self.text(child),
+                extends=[self.bound(item) for item in bound.named_children] if bound is not None else None))
+        return result
+
+    def class_body(self, node, interface: bool = False) -> List:
+        body = []
+        if node is None:
+            return body
+        for child, documentation in self.members(node.named_children):
+            if interface and child.type in ("field_declaration", "constant_declaration"):
+                body.append(self.field(child, documentation, tree.ConstantDeclaration))
+            elif child.type == "block":
+                # Bloco de inicialização da instância
+                body.append(self.block(child))
+            else:
+                converted = self.declaration(child, documentation)
+                if converted is not None:
+                    body.append(converted)
+        return body
+
+    def d_class_declaration(self, node, documentation):
+        modifiers, annotations = self.modifiers(node)
+        superclass = node.child_by_field_name("superclass")
+        return self.at(tree.ClassDeclaration(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            name=self.text(node.child_by_field_name("name")),
+            type_parameters=self.type_parameters(node),
+            extends=self.type(superclass.named_children[-1]) if superclass is not None else None,
+            implements=self.type_list(node.child_by_field_name("interfaces")),
+            body=self.class_body(node.child_by_field_name("body"))), node)
+
+    def d_record_declaration(self, node, documentation):
+        # O javalang não tem records: viram classes com os componentes como campos privados
+        # (sem o final implícito, para não serem contados como constantes)
+        modifiers, annotations = self.modifiers(node)
+        fields = []
+        for parameter in self.parameters(node.child_by_field_name("parameters")):
+            fields.append(tree.FieldDeclaration(
+                modifiers={"private"}, annotations=parameter.annotations, documentation=None,
+                type=parameter.type, declarators=[tree.VariableDeclarator(name=parameter.name, dimensions=[])]))
+        return self.at(tree.ClassDeclaration(
+            modifiers=modifiers | {"final"}, annotations=annotations, documentation=documentation,
+            name=self.text(node.child_by_field_name("name")),
+            type_parameters=self.type_parameters(node), extends=None,
+            implements=self.type_list(node.child_by_field_name("interfaces")),
+            body=fields + self.class_body(node.child_by_field_name("body"))), node)
+
+    def d_interface_declaration(self, node, documentation):
+        modifiers, annotations = self.modifiers(node)
+        extends = next((child for child in node.named_children if child.type == "extends_interfaces"), None)
+        return self.at(tree.InterfaceDeclaration(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            name=self.text(node.child_by_field_name("name")),
+            type_parameters=self.type_parameters(node),
+            extends=self.type_list(extends),
+            body=self.class_body(node.child_by_field_name("body"), interface=True)), node)
+
+    def d_annotation_type_declaration(self, node, documentation):
+        modifiers, annotations = self.modifiers(node)
+        body = []
+        for child, doc in self.members(node.child_by_field_name("body").named_children):
+            if child.type == "annotation_type_element_declaration":
+                default = next((item for item in child.named_children if item.type == "element_value"), None)
+                body.append(tree.AnnotationMethod(
+                    name=self.text(child.child_by_field_name("name")),
+                    return_type=self.type(child.child_by_field_name("type")), dimensions=None,
+                    default=self.element_value(default) if default is not None else None))
+            else:
+                converted = self.declaration(child, doc)
+                if converted is not None:
+                    body.append(converted)
+        return self.at(tree.AnnotationDeclaration(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            name=self.text(node.child_by_field_name("name")), body=body), node)
+
+    def d_enum_declaration(self, node, documentation):
+        modifiers, annotations = self.modifiers(node)
+        constants, declarations = [], []
+        for child, doc in self.members(node.child_by_field_name("body").named_children):
+            if child.type == "enum_constant":
+                arguments = child.child_by_field_name("arguments")
+                body = child.child_by_field_name("body")
+                constants.append(self.at(tree.EnumConstantDeclaration(
+                    name=self.text(child.child_by_field_name("name")), documentation=doc, annotations=[],
+                    arguments=self.arguments(arguments) if arguments is not None else None,
+                    body=self.class_body(body) if body is not None else None), child))
+            elif child.type == "enum_body_declarations":
+                declarations.extend(self.class_body(child))
+        return self.at(tree.EnumDeclaration(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            name=self.text(node.child_by_field_name("name")),
+            implements=self.type_list(node.child_by_field_name("interfaces")),
+            body=tree.EnumBody(constants=constants, declarations=declarations)), node)
+
+    def field(self, node, documentation, kind=tree.FieldDeclaration):
+        modifiers, annotations = self.modifiers(node)
+        return self.at(kind(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            type=self.type(node.child_by_field_name("type")), declarators=self.declarators(node)), node)
+
+    def d_field_declaration(self, node, documentation):
+        return self.field(node, documentation)
+
+    d_constant_declaration = d_field_declaration
+
+    def throws(self, node) -> Optional[List[str]]:
+        throws = next((child for child in node.named_children if child.type == "throws"), None)
+        if throws is None:
+            return None
+        return [self.text(child) for child in throws.named_children]
+
+    def d_method_declaration(self, node, documentation):
+        modifiers, annotations = self.modifiers(node)
+        return_type = node.child_by_field_name("type")
+        body = node.child_by_field_name("body")
+        return self.at(tree.MethodDeclaration(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            type_parameters=self.type_parameters(node),
+            return_type=None if return_type.type == "void_type" else self.type(return_type),
+            name=self.text(node.child_by_field_name("name")),
+            parameters=self.parameters(node.child_by_field_name("parameters")),
+            throws=self.throws(node),
+            body=self.block(body) if body is not None else None), node)
+
+    def d_constructor_declaration(self, node, documentation):
+        modifiers, annotations = self.modifiers(node)
+        return self.at(tree.ConstructorDeclaration(
+            modifiers=modifiers, annotations=annotations, documentation=documentation,
+            type_parameters=self.type_parameters(node),
+            name=self.text(node.child_by_field_name("name")),
+            parameters=self.parameters(node.child_by_field_name("parameters")),
+            throws=self.throws(node),
+            body=self.block(node.child_by_field_name("body"))), node)
+
+    d_compact_constructor_declaration = d_constructor_declaration
+
+    def d_static_initializer(self, node, documentation):
+        return self.block(node.named_children[-1])
+
+    def parameters(self, node) -> List:
+        if node is None:
+            return []
+        result = []
+        for child in node.named_children:
+            if child.type not in ("formal_parameter", "spread_parameter"):
+                continue
+            modifiers, annotations = self.modifiers(child)
+            if child.type == "spread_parameter":
+                type_node = next(item for item in child.named_children if item.type != "modifiers")
+                name = self.text(child.named_children[-1].child_by_field_name("name"))
+            else:
+                type_node = child.child_by_field_name("type")
+                name = self.text(child.child_by_field_name("name"))
+            parameter_type = self.type(type_node)
+            dimensions = child.child_by_field_name("dimensions")
+            if dimensions is not None:
+                parameter_type.dimensions = (parameter_type.dimensions or []) + self.dimensions(dimensions)
+            result.append(self.at(tree.FormalParameter(
+                modifiers=modifiers, annotations=annotations, type=parameter_type, name=name,
+                varargs=child.type == "spread_parameter"), child))
+        return result
+
+    def declarators(self, node) -> List[tree.VariableDeclarator]:
+        result = []
+        for child in node.children:
+            if child.type != "variable_declarator":
+                continue
+            dimensions = child.child_by_field_name("dimensions")
+            value = child.child_by_field_name("value")
+            result.append(self.at(tree.VariableDeclarator(
+                name=self.text(child.child_by_field_name("name")),
+                dimensions=self.dimensions(dimensions) if dimensions is not None else [],
+                initializer=self.expression(value) if value is not None else None), child))
+        return result
+
+    def dimensions(self, node) -> List:
+        return [None] * self.text(node).count("[")
+
+    # Tipos
+
+    def type(self, node):
+        if node is None:
+            return None
+        kind = node.type
+        if kind in _BASIC_TYPES:
+            return tree.BasicType(name=self.text(node), dimensions=[])
+        if kind == "array_type":
+            element = self.type(node.child_by_field_name("element"))
+            element.dimensions = (element.dimensions or []) + self.dimensions(node.child_by_field_name("dimensions"))
+            return element
+        if kind == "generic_type":
+            base = self.type(node.named_children[0])
+            innermost = base
+            while innermost.sub_type is not None:
+                innermost = innermost.sub_type
+            innermost.arguments = self.type_arguments(node.named_children[-1])
+            return base
+        if kind == "scoped_type_identifier":
+            # java.util.List vira List como sub_type de util, que é sub_type de java
+            names = self.text(node).replace(" ", "").split(".")
+            outer = tree.ReferenceType(name=names[0], dimensions=[], arguments=None, sub_type=None)
+            innermost = outer
+            for name in names[1:]:
+                innermost.sub_type = tree.ReferenceType(name=name, dimensions=None, arguments=None, sub_type=None)
+                innermost = innermost.sub_type
+            return outer
+        if kind == "annotated_type":
+            return self.type(node.named_children[-1])
+        if kind == "void_type":
+            return None
+        return tree.ReferenceType(name=self.text(node), dimensions=[], arguments=None, sub_type=None)
+
+    def bound(self, node):
+        bound = self.type(node)
+        bound.dimensions = None
+        return bound
+
+    def type_arguments(self, node) -> List[tree.TypeArgument]:
+        result = []
+        for child in node.named_children:
+            if child.type == "wildcard":
+                bound = [item for item in child.named_children if item.type != "annotation"]
+                pattern = "?" if not bound else ("super" if "super" in self.text(child) else "extends")
+                result.append(tree.TypeArgument(type=self.type(bound[-1]) if bound else None, pattern_type=pattern))
+            else:
+                result.append(tree.TypeArgument(type=self.type(child), pattern_type=None))
+        return result
+
+    # Comandos
+
+    def block(self, node) -> List:
+        """Lista de comandos de um bloco (como os corpos de métodos no javalang)"""
+        statements = []
+        for child, documentation in self.members(node.named_children):
+            converted = self.declaration(child, documentation)
+            if converted is not None:
+                statements.append(converted)
+        return statements
+
+    def statement(self, node):
+        if node is None:
+            return None
+        if node.type == ";":
+            return self.at(tree.Statement(), node)
+        handler = getattr(self, "s_" + node.type, None)
+        if handler is None:
+            # Expressões ou construções sem nó próprio no javalang
+            return tree.StatementExpression(expression=self.expression(node))
+        return self.at(handler(node), node)
+
+    def s_block(self, node):
+        return tree.BlockStatement(statements=self.block(node))
+
+    def s_expression_statement(self, node):
+        return tree.StatementExpression(expression=self.expression(node.named_children[0]))
+
+    def s_local_variable_declaration(self, node):
+        modifiers, annotations = self.modifiers(node)
+        return tree.LocalVariableDeclaration(
+            modifiers=modifiers, annotations=annotations,
+            type=self.type(node.child_by_field_name("type")), declarators=self.declarators(node))
+
+    def s_if_statement(self, node):
+        return tree.IfStatement(
+            condition=self.expression(node.child_by_field_name("condition")),
+            then_statement=self.statement(node.child_by_field_name("consequence")),
+            else_statement=self.statement(node.child_by_field_name("alternative")))
+
+    def s_while_statement(self, node):
+        return tree.WhileStatement(condition=self.expression(node.child_by_field_name("condition")),
+                                   body=self.statement(node.child_by_field_name("body")))
+
+    def s_do_statement(self, node):
+        return tree.DoStatement(condition=self.expression(node.child_by_field_name("condition")),
+                                body=self.statement(node.child_by_field_name("body")))
+
+    def s_for_statement(self, node):
+        init, update = None, []
+        for index, child in enumerate(node.children):
+            field = node.field_name_for_child(index)
+            if field == "init":
+                if child.type == "local_variable_declaration":
+                    # Na inicialização do for o javalang usa VariableDeclaration
+                    modifiers, annotations = self.modifiers(child)
+                    init = tree.VariableDeclaration(
+                        modifiers=modifiers, annotations=annotations,
+                        type=self.type(child.child_by_field_name("type")), declarators=self.declarators(child))
+                    for declarator in init.declarators[:1]:
+                        declarator.dimensions = None
+                else:
+                    init = (init or []) + [self.expression(child)]
+            elif field == "update":
+                update.append(self.expression(child))
+        control = tree.ForControl(init=init, condition=self.expression(node.child_by_field_name("condition")),
+                                  update=update or None)
+        return tree.ForStatement(control=control, body=self.statement(node.child_by_field_name("body")))
+
+    def s_enhanced_for_statement(self, node):
+        modifiers, annotations = self.modifiers(node)
+        variable = tree.VariableDeclaration(
+            modifiers=modifiers, annotations=annotations, type=self.type(node.child_by_field_name("type")),
+            declarators=[tree.VariableDeclarator(name=self.text(node.child_by_field_name("name")), dimensions=None)])
+        control = tree.EnhancedForControl(var=variable, iterable=self.expression(node.child_by_field_name("value")))
+        return tree.ForStatement(control=control, body=self.statement(node.child_by_field_name("body")))
+
+    def s_switch_expression(self, node):
+        cases, labels = [], []
+        for group in node.child_by_field_name("body").named_children:
+            if group.type not in ("switch_block_statement_group", "switch_rule"):
+                continue
+            statements = []
+            for child in group.named_children:
+                if child.type == "switch_label":
+                    # Constantes de enum (case MOBILE:) ficam como nomes, como no javalang
+                    labels.extend(self.text(item) if item.type == "identifier" else self.expression(item)
+                                  for item in child.named_children)
+                elif child.type in ("line_comment", "block_comment"):
+                    continue
+                elif child.type == "block" and group.type == "switch_rule":
+                    statements.extend(self.block(child))
+                else:
+                    converted = self.declaration(child)
+                    if converted is not None:
+                        statements.append(converted)
+            # Rótulos seguidos sem comandos (case 1: case 2:) formam um único caso, como no javalang
+            if statements or group.type == "switch_rule":
+                cases.append(tree.SwitchStatementCase(case=labels, statements=statements))
+                labels = []
+        if labels:
+            cases.append(tree.SwitchStatementCase(case=labels, statements=[]))
+        return tree.SwitchStatement(expression=self.expression(node.child_by_field_name("condition")), cases=cases)
+
+    def s_return_statement(self, node):
+        value = node.named_children[0] if node.named_children else None
+        return tree.ReturnStatement(expression=self.expression(value))
+
+    def s_throw_statement(self, node):
+        return tree.ThrowStatement(expression=self.expression(node.named_children[0]))
+
+    def s_yield_statement(self, node):
+        return tree.StatementExpression(expression=self.expression(node.named_children[0]))
+
+    def s_break_statement(self, node):
+        label = node.named_children[0] if node.named_children else None
+        return tree.BreakStatement(goto=self.text(label) if label is not None else None)
+
+    def s_continue_statement(self, node):
+        label = node.named_children[0] if node.named_children else None
+        return tree.ContinueStatement(goto=self.text(label) if label is not None else None)
+
+    def s_labeled_statement(self, node):
+        statement = self.statement(node.named_children[-1])
+        statement.label = self.text(node.named_children[0])
+        return statement
+
+    def s_assert_statement(self, node):
+        values = node.named_children
+        return tree.AssertStatement(condition=self.expression(values[0]),
+                                    value=self.expression(values[1]) if len(values) > 1 else None)
+
+    def s_synchronized_statement(self, node):
+        return tree.SynchronizedStatement(lock=self.expression(node.named_children[0]),
+                                          block=self.block(node.child_by_field_name("body")))
+
+    def s_try_statement(self, node):
+        catches, finally_block, resources = [], None, None
+        for child in node.named_children:
+            if child.type == "catch_clause":
+                parameter = next(item for item in child.named_children if item.type == "catch_formal_parameter")
+                catch_type = next(item for item in parameter.named_children if item.type == "catch_type")
+                catches.append(tree.CatchClause(
+                    parameter=tree.CatchClauseParameter(
+                        types=[self.text(item) for item in catch_type.named_children],
+                        name=self.text(parameter.child_by_field_name("name"))),
+                    block=self.block(child.child_by_field_name("body"))))
+            elif child.type == "finally_clause":
+                finally_block = self.block(child.named_children[-1])
+            elif child.type == "resource_specification":
+                resources = [self.resource(item) for item in child.named_children if item.type == "resource"]
+        return tree.TryStatement(resources=resources, block=self.block(node.child_by_field_name("body")),
+                                 catches=catches or None, finally_block=finally_block)
+
+    s_try_with_resources_statement = s_try_statement
+
+    def resource(self, node):
+        value = node.child_by_field_name("value")
+        if value is None:
+            return self.expression(node.named_children[-1])
+        modifiers, annotations = self.modifiers(node)
+        return self.at(tree.TryResource(
+            modifiers=modifiers, annotations=annotations, type=self.type(node.child_by_field_name("type")),
+            name=self.text(node.child_by_field_name("name")), value=self.expression(value)), node)
+
+    def s_explicit_constructor_invocation(self, node):
+        constructor = node.child_by_field_name("constructor")
+        kind = tree.SuperConstructorInvocation if constructor.type == "super" else tree.ExplicitConstructorInvocation
+        invocation = kind(arguments=self.arguments(node.child_by_field_name("arguments")),
+                          prefix_operators=[], postfix_operators=[], selectors=[])
+        return tree.StatementExpression(expression=invocation)
+
+    def s_local_class_declaration(self, node):
+        return self.declaration(node.named_children[0])
+
+    def s_empty_statement(self, node):
+        return tree.Statement()
+
+    # Expressões
+
+    def arguments(self, node) -> List:
+        return [self.expression(child) for child in node.named_children
+                if child.type not in ("line_comment", "block_comment")]
+
+    def expression(self, node):
+        if node is None:
+            return None
+        handler = getattr(self, "e_" + node.type, None)
+        if handler is not None:
+            return self.at(handler(node), node)
+        if node.type in _LITERALS:
+            return self.at(self.primary(tree.Literal, value=self.text(node)), node)
+        if node.type in _BASIC_TYPES or node.type.endswith("_type") or node.type.endswith("type_identifier"):
+            return self.type(node)
+        # Construções sem equivalente no javalang: mantém os filhos visíveis aos filtros
+        return [self.expression(child) for child in node.named_children]
+
+    def primary(self, kind, **attrs):
+        return kind(prefix_operators=[], postfix_operators=[], selectors=[], **attrs)
+
+    def name_chain(self, node) -> Optional[str]:
+        """Nome qualificado (a.b.c) quando o nó é apenas uma cadeia de identificadores"""
+        if node.type == "identifier":
+            return self.text(node)
+        if node.type in ("field_access", "scoped_identifier"):
+            left = node.child_by_field_name("object") or node.child_by_field_name("scope")
+            right = node.child_by_field_name("field") or node.child_by_field_name("name")
+            prefix = self.name_chain(left) if left is not None else None
+            if prefix is not None and right is not None and right.type == "identifier":
+                return f"{prefix}.{self.text(right)}"
+        return None
+
+    def select(self, target, selector):
+        """Encadeia um acesso (campo, método, índice) sobre uma expressão já convertida"""
+        # Como no javalang, fora de primárias os seletores ficam fora da representação textual
+        target.selectors = (getattr(target, "selectors", None) or []) + [selector]
+        return target
+
+    def e_identifier(self, node):
+        return self.primary(tree.MemberReference, qualifier="", member=self.text(node))
+
+    e_type_identifier = e_identifier
+
+    def e_this(self, node):
+        return self.primary(tree.This, qualifier=None)
+
+    def e_parenthesized_expression(self, node):
+        return self.expression(node.named_children[0])
+
+    def e_field_access(self, node):
+        target = node.child_by_field_name("object")
+        member = self.text(node.child_by_field_name("field"))
+        if target.type == "super":
+            return self.primary(tree.SuperMemberReference, qualifier=None, member=member)
+        chain = self.name_chain(target)
+        if chain is not None:
+            return self.primary(tree.MemberReference, qualifier=chain, member=member)
+        return self.select(self.expression(target),
+                           tree.MemberReference(member=member, qualifier=None, prefix_operators=None,
+                                                postfix_operators=None, selectors=None))
+
+    def e_method_invocation(self, node):
+        target = node.child_by_field_name("object")
+        member = self.text(node.child_by_field_name("name"))
+        arguments = self.arguments(node.child_by_field_name("arguments"))
+        explicit = node.child_by_field_name("type_arguments")
+        type_arguments = self.type_arguments(explicit) if explicit is not None else None
+        if target is None:
+            return self.primary(tree.MethodInvocation, qualifier="", member=member, arguments=arguments,
+                                type_arguments=type_arguments)
+        if target.type == "super":
+            return self.primary(tree.SuperMethodInvocation, qualifier=None, member=member, arguments=arguments,
+                                type_arguments=type_arguments)
+        chain = self.name_chain(target)
+        if chain is not None:
+            return self.primary(tree.MethodInvocation, qualifier=chain, member=member, arguments=arguments,
+                                type_arguments=type_arguments)
+        return self.select(self.expression(target),
+                           tree.MethodInvocation(member=member, arguments=arguments, qualifier=None,
+                                                 prefix_operators=None, postfix_operators=None, selectors=None,
+                                                 type_arguments=type_arguments))
+
+    def e_array_access(self, node):
+        return self.select(self.expression(node.child_by_field_name("array")),
+                           tree.ArraySelector(index=self.expression(node.child_by_field_name("index"))))
+
+    def e_object_creation_expression(self, node):
+        body = next((child for child in node.named_children if child.type == "class_body"), None)
+        created = self.type(node.child_by_field_name("type"))
+        created.dimensions = None
+        return self.primary(tree.ClassCreator, qualifier=None, type=created,
+                            constructor_type_arguments=None,
+                            arguments=self.arguments(node.child_by_field_name("arguments")),
+                            body=self.class_body(body) if body is not None else None)
+
+    def e_array_creation_expression(self, node):
+        dimensions = []
+        for child in node.named_children:
+            if child.type == "dimensions_expr":
+                dimensions.append(self.expression(child.named_children[-1]))
+            elif child.type == "dimensions":
+                dimensions.extend(self.dimensions(child))
+        value = node.child_by_field_name("value")
+        element = self.type(node.child_by_field_name("type"))
+        element.dimensions = None
+        return self.primary(tree.ArrayCreator, qualifier=None, type=element, dimensions=dimensions,
+                            initializer=self.expression(value) if value is not None else None)
+
+    def e_array_initializer(self, node):
+        return tree.ArrayInitializer(initializers=[self.expression(child) for child in node.named_children])
+
+    def e_binary_expression(self, node):
+        return tree.BinaryOperation(operator=self.text(node.child_by_field_name("operator")),
+                                    operandl=self.expression(node.child_by_field_name("left")),
+                                    operandr=self.expression(node.child_by_field_name("right")))
+
+    def e_instanceof_expression(self, node):
+        return tree.BinaryOperation(operator="instanceof",
+                                    operandl=self.expression(node.child_by_field_name("left")),
+                                    operandr=self.type(node.child_by_field_name("right")))
+
+    def e_assignment_expression(self, node):
+        return tree.Assignment(expressionl=self.expression(node.child_by_field_name("left")),
+                               value=self.expression(node.child_by_field_name("right")),
+                               type=self.text(node.child_by_field_name("operator")))
+
+    def e_ternary_expression(self, node):
+        return tree.TernaryExpression(condition=self.expression(node.child_by_field_name("condition")),
+                                      if_true=self.expression(node.child_by_field_name("consequence")),
+                                      if_false=self.expression(node.child_by_field_name("alternative")))
+
+    def e_unary_expression(self, node):
+        operand = self.expression(node.child_by_field_name("operand"))
+        # Como no javalang, fora de primárias o operador fica fora da representação textual
+        operand.prefix_operators = [self.text(node.child_by_field_name("operator"))] + \
+            (getattr(operand, "prefix_operators", None) or [])
+        return operand
+
+    def e_update_expression(self, node):
+        operator = next(child.type for child in node.children if not child.is_named)
+        operand = self.expression(node.named_children[0])
+        if node.children[0].is_named:
+            operand.postfix_operators = (getattr(operand, "postfix_operators", None) or []) + [operator]
+        else:
+            operand.prefix_operators = [operator] + (getattr(operand, "prefix_operators", None) or [])
+        return operand
+
+    def e_cast_expression(self, node):
+        return tree.Cast(type=self.type(node.child_by_field_name("type")),
+                         expression=self.expression(node.child_by_field_name("value")))
+
+    def e_lambda_expression(self, node):
+        parameters = node.child_by_field_name("parameters")
+        if parameters.type == "formal_parameters":
+            converted = self.parameters(parameters)
+        else:
+            names = [parameters] if parameters.type == "identifier" else parameters.named_children
+            # O javalang lê um único parâmetro sem tipo como expressão e vários como parâmetros inferidos
+            if len(names) == 1:
+                converted = [self.e_identifier(names[0])]
+            else:
+                converted = [tree.InferredFormalParameter(name=self.text(name)) for name in names]
+        body = node.child_by_field_name("body")
+        return tree.LambdaExpression(parameters=converted,
+                                     body=self.block(body) if body.type == "block" else self.expression(body))
+
+    def e_method_reference(self, node):
+        parts = [child for child in node.named_children if child.type != "type_arguments"]
+        if len(parts) > 1:
+            method = self.primary(tree.MemberReference, qualifier="", member=self.text(parts[-1]))
+        else:
+            method = tree.MemberReference(member="new", qualifier=None, prefix_operators=None,
+                                          postfix_operators=None, selectors=None)
+        return tree.MethodReference(expression=self.expression(parts[0]), type_arguments=[], method=method)
+
+    def e_class_literal(self, node):
+        referenced = self.type(node.named_children[0])
+        referenced.dimensions = None
+        return self.primary(tree.ClassReference, qualifier="", type=referenced)
+
+    def e_switch_expression(self, node):
+        # Switch como expressão (Java 14+): mesma representação do comando switch
+        return self.s_switch_expression(node)
+
@@ -0,0 +1,203 @@
+"""Métricas de complexidade em uma passada pela lista de tokens da submissão.
+
+Complexidade ciclomática de cada método (1 + pontos de decisão: if, for, while, case,
+catch, &&, || e ?:), profundidade máxima de aninhamento das estruturas de controle e
+volume de Halstead (operadores e operandos). Os métodos são reconhecidos pelos escopos
+das chaves, e não pelas posições da árvore: subárvores compartilhadas (subtrees.py) e
+reaproveitadas pelo parsing incremental guardam as posições de outra versão do código.
+A lista de tokens é a mesma da detecção de clones (feature "tokens").
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from javalang.tokenizer import Identifier, Keyword, Literal
+
+from clones import matching_delimiters, statement_end
+
+# Tokens que abrem um caminho a mais no método (do-while conta pelo seu "while")
+DECISIONS = {"if", "for", "while", "case", "catch", "&&", "||", "?"}
+# Estruturas que aumentam o aninhamento ("else if" continua no nível do primeiro if)
+NESTING = {"if", "for", "while", "do", "switch"}
+# Limites de referência: acima deles o método é considerado complexo demais
+MAX_CYCLOMATIC = 10
+MAX_NESTING = 4
+_TYPE_KEYWORDS = {"class", "interface", "enum"}
+_CLOSERS = {")", "]", "}"}
+# Tokens entre "new" e o "(" de uma classe anônima (new Tipo<Argumento>.Interno(...) {)
+_TYPE_TOKENS = {".", "<", ">", ">>", ">>>", ",", "?", "[", "]", "extends", "super"}
+
+
+@dataclass(frozen=True)
+class MethodComplexity:
+    name: str
+    line: int
+    cyclomatic: int
+    nesting: int
+    constructor: bool = False  # mesmo nome do tipo que o declara
+
+
+@dataclass(frozen=True)
+class Halstead:
+    distinct_operators: int
+    distinct_operands: int
+    operators: int
+    operands: int
+
+    @property
+    def vocabulary(self) -> int:
+        return self.distinct_operators + self.distinct_operands
+
+    @property
+    def length(self) -> int:
+        return self.operators + self.operands
+
+    @property
+    def volume(self) -> float:
+        return self.length * math.log2(self.vocabulary) if self.vocabulary > 1 else 0.0
+
+
+@dataclass
+class Complexity:
+    """Complexidade por método e do arquivo inteiro"""
+    methods: List[MethodComplexity] = field(default_factory=list)
+    nesting: int = 0  # maior aninhamento de estruturas de controle no arquivo
+    halstead: Halstead = Halstead(0, 0, 0, 0)
+
+    @property
+    def max_cyclomatic(self) -> int:
+        return max((method.cyclomatic for method in self.methods), default=0)
+
+    def complex_methods(self) -> List[MethodComplexity]:
+        """Métodos acima de MAX_CYCLOMATIC ou de MAX_NESTING"""
+        return [method for method in self.methods
+                if method.cyclomatic > MAX_CYCLOMATIC or method.nesting > MAX_NESTING]
+
+    def describe_methods(self) -> str:
+        return "; ".join(f"{method.name}{' (construtor)' if method.constructor else ''}={method.cyclomatic}"
+                         for method in self.methods)
+
+
+def _anonymous_body(tokens: Sequence, index: int, openers: Dict[int, int]) -> bool:
+    """Indica se o "{" em tokens[index] abre o corpo de uma classe anônima (new Tipo(...) {)"""
+    opening = openers.get(index - 1)
+    if opening is None or tokens[index - 1].value != ")":
+        return False
+    position = opening - 1
+    while position >= 0 and (type(tokens[position]) is Identifier or tokens[position].value in _TYPE_TOKENS):
+        position -= 1
+    return 0 <= position < opening - 1 and tokens[position].value == "new"
+
+
+def measure(tokens: Sequence) -> Complexity:
+    """Complexidade dos tokens de uma submissão"""
+    tokens = list(tokens)
+    matches = matching_delimiters(tokens)
+    openers = {end: start for start, end in matches.items()}
+    # Métodos como [nome, linha, complexidade, aninhamento, construtor]
+    methods: List[list] = []
+    # Para cada "{" aberto: tipo ("type", "method" ou "code"), método corrente (índice em
+    # methods ou None), base do aninhamento, parênteses de fora, se ainda está nas
+    # constantes de um enum e o nome do tipo (None fora de tipos e em classes anônimas)
+    scopes: List[Tuple[str, Optional[int], int, int, bool, Optional[str]]] = []
+    parens = 0
+    # Cabeçalho desde o último ";", "{" ou "}": tipo declarado e seu nome, "=", último "("
+    # fora de parênteses
+    header_type = header_enum = header_assign = False
+    header_name: Optional[str] = None
+    header_call: Optional[int] = None
+    open_ends: List[int] = []  # último token de cada estrutura de controle aberta
+    do_tails = set()
+    deepest = 0
+    operators, operands = {}, {}
+
+    for index, token in enumerate(tokens):
+        value = token.value
+        while open_ends and open_ends[-1] < index:
+            open_ends.pop()
+        kind, method, base, _, enum_constants, type_name = \
+            scopes[-1] if scopes else ("type", None, 0, 0, False, None)
+
+        # Halstead: identificadores e literais são operandos; o resto, operadores (pares de
+        # delimitadores contam uma vez)
+        if type(token) is Identifier or isinstance(token, Literal):
+            operands[value] = operands.get(value, 0) + 1
+        elif value not in _CLOSERS:
+            operators[value] = operators.get(value, 0) + 1
+
+        if value == "{":
+            if header_type or enum_constants and kind == "type":
+                opened = ("type", None, len(open_ends), parens, header_enum, header_name)
+            elif kind == "type" and not header_assign and parens == 0 and header_call:
+                name = tokens[header_call - 1]
+                methods.append([name.value, name.position[0], 1, 0, name.value == type_name])
+                opened = ("method", len(methods) - 1, len(open_ends), parens, False, None)
+            elif kind != "type" and _anonymous_body(tokens, index, openers):
+                opened = ("type", None, len(open_ends), parens, False, None)
+            else:
+                opened = ("code", method if kind != "type" else None, base, parens, False, None)
+            scopes.append(opened)
+            parens = 0
+            header_type = header_enum = header_assign = False
+            header_name = header_call = None
+            continue
+        if value == "}":
+            if scopes:
+                parens = scopes.pop()[3]
+            header_type = header_enum = header_assign = False
+            header_name = header_call = None
+            continue
+        if value == ";":
+            if kind == "type" and enum_constants and parens == 0 and scopes:
+                scopes[-1] = scopes[-1][:4] + (False, type_name)
+            header_type = header_enum = header_assign = False
+            header_name = header_call = None
+            continue
+        if value == "(":
+            if parens == 0:
+                header_call = index
+            parens += 1
+            continue
+        if value == ")":
+            parens = max(parens - 1, 0)
+            continue
+        if value == "=" and parens == 0:
+            header_assign = True
+        if type(token) is Keyword and value in _TYPE_KEYWORDS \
+                and not (index and tokens[index - 1].value == "."):
+            header_type = True
+            header_enum = value == "enum"
+        elif header_type and header_name is None and type(token) is Identifier:
+            header_name = value
+
+        if method is not None and value in DECISIONS:
+            previous = tokens[index - 1].value if index else ""
+            # "?" de argumento de tipo (List<?>, Map<K, ? extends V>) não é decisão
+            if value != "?" or previous not in ("<", ","):
+                methods[method][2] += 1
+
+        if type(token) is Keyword and value in NESTING:
+            if value == "if" and index and tokens[index - 1].value == "else":
+                continue
+            if value == "while" and index in do_tails:
+                continue
+            try:
+                end = statement_end(tokens, index, matches)
+                if value == "do" and end is not None:
+                    body = statement_end(tokens, index + 1, matches)
+                    do_tails.add(body + 1)
+            except RecursionError:
+                end = None
+            if end is None:
+                continue
+            depth = len(open_ends) - base + 1
+            open_ends.append(end)
+            deepest = max(deepest, depth)
+            if method is not None:
+                methods[method][3] = max(methods[method][3], depth)
+
+    return Complexity(
+        methods=[MethodComplexity(*method) for method in methods],
+        nesting=deepest,
+        halstead=Halstead(len(operators), len(operands), sum(operators.values()), sum(operands.values())),
+    )
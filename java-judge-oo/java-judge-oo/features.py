@@ -0,0 +1,182 @@
+"""Grafo de features sob demanda: cada métrica declara de quais outras depende
+
+As features formam um grafo (código → árvore → índice de símbolos → hierarquia, métricas)
+e são calculadas só quando alguém as pede, com memoização dentro de uma submissão. Uma
+rubrica ou uma seleção de colunas que só usa features baratas nunca paga pelas caras;
+erros (como o de sintaxe na árvore) também ficam memorizados e são relançados para
+todas as features que dependem dela.
+"""
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from clones import STRUCTURES, CloneReport, find_clones
+from complexity import Complexity, measure
+from parsing import parse_cache, parse_java, parse_positioned, tokenize_java
+from subtrees import SubtreeTable
+
+# Entradas de toda submissão: o código-fonte e o código inicial registrado
+# (scaffold.Scaffold) a descontar dela, ou None
+SOURCE = "code"
+SCAFFOLD = "scaffold"
+INPUTS = (SOURCE, SCAFFOLD)
+
+
+@dataclass(frozen=True)
+class Feature:
+    name: str
+    compute: Callable[..., Any]
+    # Features cujos valores são passados a compute, nesta ordem
+    requires: Tuple[str, ...] = ()
+
+
+class FeatureGraph:
+    """Registro de features; extend cria um grafo que herda as features do atual"""
+
+    def __init__(self, features: Optional[Dict[str, Feature]] = None):
+        self.features: Dict[str, Feature] = dict(features or {})
+
+    def extend(self) -> "FeatureGraph":
+        return FeatureGraph(self.features)
+
+    def feature(self, name: str, *requires: str):
+        """Decorador que registra compute(*valores de requires) como a feature name"""
+        def register(compute: Callable[..., Any]):
+            self.features[name] = Feature(name, compute, requires)
+            return compute
+        return register
+
+    def requirements(self, names: Iterable[str]) -> List[str]:
+        """Features necessárias para calcular names, em ordem de dependência"""
+        ordered: List[str] = []
+        seen = set()
+
+        def visit(name: str):
+            if name in seen or name in INPUTS:
+                return
+            seen.add(name)
+            for dependency in self._get(name).requires:
+                visit(dependency)
+            ordered.append(name)
+
+        for name in names:
+            visit(name)
+        return ordered
+
+    def context(self, code: str, scaffold=None) -> "FeatureContext":
+        return FeatureContext(self, code, scaffold)
+
+    def _get(self, name: str) -> Feature:
+        feature = self.features.get(name)
+        if feature is None:
+            raise KeyError(f"feature desconhecida: {name}")
+        return feature
+
+
+class FeatureContext:
+    """Valores das features de uma submissão, calculados na primeira leitura"""
+
+    def __init__(self, graph: FeatureGraph, code: str, scaffold=None):
+        self.graph = graph
+        self._values: Dict[str, Any] = {SOURCE: code, SCAFFOLD: scaffold}
+        self._errors: Dict[str, Exception] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._values:
+            return self._values[name]
+        if name in self._errors:
+            raise self._errors[name]
+        feature = self.graph._get(name)
+        try:
+            value = feature.compute(*(self[dependency] for dependency in feature.requires))
+        except Exception as e:
+            self._errors[name] = e
+            raise
+        self._values[name] = value
+        return value
+
+    def computed(self) -> List[str]:
+        """Features já calculadas nesta submissão (sem as entradas)"""
+        return [name for name in self._values if name not in INPUTS]
+
+
+class SymbolIndex:
+    """Nós da árvore agrupados por tipo em uma única passada
+
+    of(tipo) devolve os mesmos nós, na mesma ordem, que tree.filter(tipo), sem percorrer
+    a árvore de novo para cada tipo consultado. Com a tabela de subárvores, métodos e
+    classes compartilhados com outros arquivos não são percorridos de novo, e os membros
+    do código inicial (scaffold) ficam de fora. Com clones, as estruturas inteiras dentro
+    de trechos copiados também.
+    """
+
+    def __init__(self, tree, subtrees: Optional[SubtreeTable] = None, scaffold=None,
+                 clones: Optional[CloneReport] = None):
+        if subtrees is not None:
+            self._by_type: Dict[type, List[Tuple[int, Any]]] = subtrees.group_by_type(tree, scaffold)
+        else:
+            self._by_type = defaultdict(list)
+            for position, (_, node) in enumerate(tree):
+                self._by_type[type(node)].append((position, node))
+        if clones is not None and clones.copies:
+            for kind, entries in self._by_type.items():
+                if issubclass(kind, STRUCTURES):
+                    self._by_type[kind] = [entry for entry in entries if not clones.copied(entry[1])]
+        self._nodes: Dict[type, List] = {}
+
+    def of(self, node_type: type) -> List:
+        nodes = self._nodes.get(node_type)
+        if nodes is None:
+            groups = [entries for kind, entries in self._by_type.items() if issubclass(kind, node_type)]
+            # Subtipos ficam em listas separadas; a posição no percurso restaura a ordem
+            entries = groups[0] if len(groups) == 1 else heapq.merge(*groups, key=lambda entry: entry[0])
+            nodes = self._nodes[node_type] = [node for _, node in entries]
+        return nodes
+
+
+# Features comuns às ferramentas; cada uma estende este grafo com as suas métricas
+BASE_FEATURES = FeatureGraph()
+
+
+@BASE_FEATURES.feature("tree", SOURCE)
+def _tree(code: str):
+    return parse_java(code)
+
+
+@BASE_FEATURES.feature("index", "tree", SCAFFOLD)
+def _index(tree, scaffold) -> SymbolIndex:
+    return SymbolIndex(tree, parse_cache.subtrees, scaffold)
+
+
+@BASE_FEATURES.feature("tokens", SOURCE)
+def _tokens(code: str) -> List:
+    return tokenize_java(code)
+
+
+@BASE_FEATURES.feature("clones", "tokens")
+def _clones(tokens) -> CloneReport:
+    return find_clones(tokens)
+
+
+@BASE_FEATURES.feature("complexity", "tokens")
+def _complexity(tokens) -> Complexity:
+    return measure(tokens)
+
+
+def _clone_free_index(code: str, scaffold, clones) -> SymbolIndex:
+    # As cópias são trechos de tokens: os nós precisam das posições deste código. A tabela
+    # só compara os membros com o código inicial; esta árvore não vira canônica
+    return SymbolIndex(parse_positioned(code), parse_cache.subtrees, scaffold, clones)
+
+
+def discounting_clones(graph: FeatureGraph) -> FeatureGraph:
+    """Cópia do grafo em que o índice de símbolos deixa de fora as estruturas copiadas
+
+    Comandos e declarações de variáveis inteiros dentro de uma cópia (clones.py) não
+    entram nas contagens que leem o índice; as demais features ficam iguais. O índice
+    vem de um parsing à parte, com as posições deste código.
+    """
+    extended = graph.extend()
+    extended.feature("index", SOURCE, SCAFFOLD, "clones")(_clone_free_index)
+    return extended
@@ -0,0 +1,209 @@
+"""Parsing incremental de reenvios, por tipo de nível superior e por membro de classe.
+
+Cada tipo de nível superior (com package e imports no primeiro) é uma unidade; em uma
+classe, o cabeçalho (a declaração sem o corpo) e cada membro (campo, método, construtor,
+classe interna) também são. As subárvores ficam em cache pelo hash do conteúdo
+normalizado (quebras de linha e espaços no fim das linhas não contam). Quando um aluno
+reenvia o arquivo com um método alterado, só o trecho desse método é analisado
+sintaticamente de novo; o resto da árvore vem do cache e a CompilationUnit é remontada
+antes dos analisadores e da rubrica, com o mesmo conteúdo do parsing do arquivo inteiro.
+
+Subárvores reaproveitadas mantêm as posições (linha e coluna) do envio em que foram
+analisadas. Qualquer trecho com erro de sintaxe faz o arquivo inteiro ser analisado de
+uma vez, para que a mensagem de erro seja a de sempre.
+"""
+import copy
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from javalang import tree
+
+from chunking import Chunk, UnbalancedCode, merge_units, parse_chunk, scan_structure, top_level_chunks
+
+# Número máximo de unidades (tipos, cabeçalhos e membros) mantidas em memória
+UNIT_CACHE_SIZE = 8192
+
+# Classe usada para analisar membros isolados
+_MEMBER_WRAPPER = "class IncrementalUnit {"
+# Depois do "}" que fecha um membro vem outro membro, o fim da classe ou um comentário;
+# operadores, "," ";" "." etc. indicam que a expressão continua (classe anônima, array)
+_MEMBER_START = re.compile(r"\s*(?:[A-Za-z_$@{}<]|/[/*]|\Z)")
+
+
+def normalize(text: str) -> str:
+    """Conteúdo da unidade sem diferenças de quebra de linha e de espaços no fim das linhas
+
+    Javadoc e text blocks entram na árvore com o texto exato, então unidades que os
+    contêm não são normalizadas.
+    """
+    if "/**" in text or '"""' in text:
+        return text
+    lines = text.replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip(" \t\f\r") for line in lines).strip("\n")
+
+
+def unit_key(backend: str, kind: str, text: str) -> str:
+    digest = hashlib.sha1(normalize(text).encode("utf-8", "surrogatepass")).hexdigest()
+    return f"{backend}:{kind}:{digest}"
+
+
+def class_members(text: str) -> Optional[Tuple[int, int, List[int]]]:
+    """Abertura e fechamento do corpo do primeiro tipo do trecho e os limites entre os membros
+
+    Retorna (posição após o "{", posição do "}", fins de membro) ou None.
+    """
+    opening, cuts = None, []
+    try:
+        for token, position, braces, parens in scan_structure(text):
+            if opening is None:
+                if token == "{" and braces == 1 and parens == 0:
+                    opening = position
+            elif braces == 0:
+                return opening, position - 1, cuts
+            elif braces == 1 and parens == 0:
+                if token == ";" or token == "}" and _MEMBER_START.match(text, position):
+                    cuts.append(position)
+    except UnbalancedCode:
+        return None
+    return None
+
+
+@dataclass
+class _Piece:
+    """Trecho do corpo da classe entre dois fins de membro"""
+    key: str
+    text: str
+    line: int  # linha do arquivo (contada a partir de 0) em que o trecho começa
+    first: int  # primeira e última linha (contadas a partir de 1) com conteúdo
+    last: int
+
+
+class IncrementalParser:
+    """Cache LRU de subárvores por unidade e remontagem da CompilationUnit
+
+    Na primeira vez que uma classe aparece ela é analisada inteira, de uma vez, e os
+    membros da árvore são distribuídos entre os trechos do corpo pelas linhas em que
+    começam. Em um reenvio com a classe alterada, o cabeçalho e os membros inalterados
+    vêm do cache e só os trechos novos são analisados.
+    """
+
+    def __init__(self, max_entries: int = UNIT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: str):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+            return value
+
+    def _put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _cached(self, key: str, parse):
+        value = self._get(key)
+        if value is None:
+            value = parse()
+            self._put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def parse(self, code: str, backend):
+        """Árvore do código montada a partir das unidades em cache e das que mudaram"""
+        chunks = top_level_chunks(code)
+        try:
+            units = [self._cached(unit_key(backend.name, "type", chunk.text),
+                                  lambda chunk=chunk: self._parse_type(chunk, backend))
+                     for chunk in chunks]
+        except Exception:
+            # Erros de sintaxe são reportados pelo parsing do arquivo inteiro
+            units = None
+        merged = merge_units(units) if units else None
+        return merged if merged is not None else backend.parse(code)
+
+    def _parse_type(self, chunk: Chunk, backend):
+        """Parsing de um tipo de nível superior; classes já vistas são montadas membro a membro"""
+        bounds = class_members(chunk.text)
+        if bounds is None:
+            return parse_chunk(backend.parse, chunk)
+
+        opening, closing, cuts = bounds
+        shell = Chunk(chunk.text[:opening] + chunk.text[closing:], chunk.line)
+        shell_key = unit_key(backend.name, "shell", shell.text)
+        pieces = self._pieces(chunk, opening, closing, cuts, backend.name)
+
+        shell_unit = self._get(shell_key)
+        if shell_unit is not None:
+            members = []
+            for piece in pieces:
+                members += self._cached(piece.key, lambda piece=piece: self._parse_member(piece, backend))
+            return self._with_body(shell_unit, members)
+
+        unit = parse_chunk(backend.parse, chunk)
+        self._remember_members(unit, shell_key, pieces)
+        return unit
+
+    @staticmethod
+    def _pieces(chunk: Chunk, opening: int, closing: int, cuts: List[int], backend: str) -> List[_Piece]:
+        text = chunk.text
+        pieces = []
+        line = chunk.line + text.count("\n", 0, opening)
+        for start, end in zip([opening] + cuts, cuts + [closing]):
+            piece = text[start:end]
+            stripped = piece.strip()
+            if stripped:
+                leading = piece[:len(piece) - len(piece.lstrip())].count("\n")
+                first = line + leading + 1
+                pieces.append(_Piece(unit_key(backend, "member", piece), piece, line,
+                                     first, first + stripped.count("\n")))
+            line += piece.count("\n")
+        return pieces
+
+    def _remember_members(self, unit, shell_key: str, pieces: List[_Piece]):
+        """Guarda cabeçalho e membros de uma classe analisada inteira, se a divisão for inequívoca"""
+        if not unit.types or not isinstance(unit.types[0], tree.ClassDeclaration):
+            # Interfaces, enums e anotações têm membros com outras regras
+            return
+        assigned = [[] for _ in pieces]
+        last = 0
+        for member in unit.types[0].body:
+            line = getattr(getattr(member, "_position", None), "line", None)
+            containing = [index for index, piece in enumerate(pieces) if piece.first <= line <= piece.last] \
+                if line is not None else []
+            # Sem posição (blocos de inicialização), dois trechos na mesma linha ou fora de ordem
+            if len(containing) != 1 or containing[0] < last:
+                return
+            last = containing[0]
+            assigned[last].append(member)
+        self._put(shell_key, self._with_body(unit, []))
+        for piece, members in zip(pieces, assigned):
+            self._put(piece.key, members)
+
+    @staticmethod
+    def _with_body(unit, body: List):
+        declaration = copy.copy(unit.types[0])
+        declaration.body = body
+        return type(unit)(package=unit.package, imports=unit.imports,
+                          types=[declaration] + unit.types[1:])
+
+    @staticmethod
+    def _parse_member(piece: _Piece, backend) -> List:
+        unit = backend.parse("\n" * max(piece.line - 1, 0) + _MEMBER_WRAPPER + "\n" + piece.text + "\n}")
+        return unit.types[0].body
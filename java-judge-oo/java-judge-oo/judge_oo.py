@@ -0,0 +1,485 @@
+import javalang
+import time
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from batch import STAGES
+from features import BASE_FEATURES
+from rubric import RubricCriterion
+from scaffold import scaffolds
+from similarity import MIN_SIMILARITY, reference_sets
+
+# Features do avaliador POO, calculadas sob demanda a partir do índice de símbolos
+FEATURES = BASE_FEATURES.extend()
+
+@FEATURES.feature("classes", "index")
+def _classes(index):
+    return index.of(javalang.tree.ClassDeclaration)
+
+@FEATURES.feature("objects", "index")
+def _objects(index):
+    return [node for node in index.of(javalang.tree.VariableDeclarator)
+            if isinstance(node.initializer, javalang.tree.ClassCreator)]
+
+@FEATURES.feature("methods", "index")
+def _methods(index):
+    return index.of(javalang.tree.MethodDeclaration)
+
+@FEATURES.feature("attributes", "index")
+def _attributes(index):
+    return index.of(javalang.tree.FieldDeclaration)
+
+@FEATURES.feature("private_count", "attributes")
+def _private_count(fields):
+    return sum(1 for field in fields if "private" in field.modifiers)
+
+@FEATURES.feature("getters_setters", "methods")
+def _getters_setters(methods):
+    # Contagem de getters e setters
+    return sum(1 for method in methods if method.name.startswith('get') or method.name.startswith('set'))
+
+@FEATURES.feature("subclasses", "classes")
+def _subclasses(classes):
+    return [cls for cls in classes if cls.extends is not None]
+
+@FEATURES.feature("overridden_methods", "methods")
+def _overridden_methods(methods):
+    return [method for method in methods
+            if any(ann.name == "Override" for ann in (method.annotations or []))]
+
+@FEATURES.feature("abstract_classes", "classes")
+def _abstract_classes(classes):
+    return [cls for cls in classes if "abstract" in cls.modifiers]
+
+@FEATURES.feature("interfaces", "index")
+def _interfaces(index):
+    return index.of(javalang.tree.InterfaceDeclaration)
+
+# Onde cada feature fica no dicionário de analyze_code, na ordem em que são calculadas
+ANALYSIS_KEYS = {
+    "classes": ("classes",),
+    "objects": ("objects",),
+    "methods": ("methods",),
+    "attributes": ("attributes",),
+    "private_count": ("encapsulation", "private_count"),
+    "getters_setters": ("encapsulation", "getters_setters"),
+    "subclasses": ("inheritance", "subclasses"),
+    "overridden_methods": ("polymorphism", "overridden_methods"),
+    "abstract_classes": ("abstraction", "abstract_classes"),
+    "interfaces": ("abstraction", "interfaces"),
+}
+
+def _summary(name: str, value):
+    """Valor de uma feature no dicionário de analyze_code: contagens em vez dos nós da árvore
+
+    A análise volta serializada de cada worker; os critérios só leem quantidades e os
+    nomes dos métodos (para contar sobrecargas).
+    """
+    if name == "methods":
+        return [method.name for method in value]
+    return len(value) if isinstance(value, list) else value
+
+# Features lidas por cada critério da rubrica em evaluate_criterion
+CRITERION_FEATURES = {
+    "classes_objects": ("classes", "objects"),
+    "methods": ("methods",),
+    "attributes": ("attributes", "private_count"),
+    "encapsulation": ("private_count", "getters_setters"),
+    "inheritance": ("subclasses",),
+    "polymorphism": ("overridden_methods",),
+    "abstraction": ("abstract_classes", "interfaces"),
+    # Lê a árvore diretamente, comparada com as soluções de referência
+    "reference_similarity": (),
+}
+
+# Critérios opcionais e a chave de analyze_code que os habilita: só entram na nota
+# quando a análise tem os dados deles
+OPTIONAL_ANALYSIS_KEYS = {
+    "reference_similarity": "similarity",
+}
+
+class EnhancedJavaPOOEvaluator:
+    """Avaliador POO com rubrica detalhada"""
+
+    __slots__ = ()
+
+    # Rubrica compartilhada por todas as instâncias; somente leitura
+    rubric = MappingProxyType({
+        "classes_objects": RubricCriterion(
+            name="Classes e Objetos",
+            description="Avalia a definição e uso de classes e objetos",
+            weight=20,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Nenhuma ou poucas classes/objetos"},
+                "Regular": {"threshold": 10, "description": "Classes básicas sem organização clara"},
+                "Bom": {"threshold": 15, "description": "Classes bem estruturadas e objetos adequados"},
+                "Excelente": {"threshold": 20, "description": "Excelente uso de classes e objetos"}
+            }
+        ),
+        "methods": RubricCriterion(
+            name="Métodos",
+            description="Avalia métodos e sua organização",
+            weight=20,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Poucos métodos ou mal estruturados"},
+                "Regular": {"threshold": 10, "description": "Métodos básicos sem sobrecarga"},
+                "Bom": {"threshold": 15, "description": "Boa organização e alguns métodos sobrecarregados"},
+                "Excelente": {"threshold": 20, "description": "Excelente organização e uso de sobrecarga"}
+            }
+        ),
+        "attributes": RubricCriterion(
+            name="Atributos",
+            description="Avalia atributos e sua organização",
+            weight=20,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Poucos atributos ou mal organizados"},
+                "Regular": {"threshold": 10, "description": "Atributos básicos sem encapsulamento"},
+                "Bom": {"threshold": 15, "description": "Boa organização de atributos"},
+                "Excelente": {"threshold": 20, "description": "Excelente organização e encapsulamento"}
+            }
+        ),
+        "encapsulation": RubricCriterion(
+            name="Encapsulamento",
+            description="Avalia uso de modificadores e getters/setters",
+            weight=10,
+            is_essential=False,
+            levels={
+                "Ausente": {"threshold": 0, "description": "Sem encapsulamento"},
+                "Parcial": {"threshold": 5, "description": "Encapsulamento básico"},
+                "Bom": {"threshold": 7.5, "description": "Bom uso de encapsulamento"},
+                "Excelente": {"threshold": 10, "description": "Encapsulamento completo e correto"}
+            }
+        ),
+        "inheritance": RubricCriterion(
+            name="Herança",
+            description="Avalia uso de herança",
+            weight=10,
+            is_essential=False,
+            levels={
+                "Ausente": {"threshold": 0, "description": "Sem uso de herança"},
+                "Parcial": {"threshold": 5, "description": "Uso básico de herança"},
+                "Bom": {"threshold": 7.5, "description": "Bom uso de herança"},
+                "Excelente": {"threshold": 10, "description": "Uso avançado e apropriado de herança"}
+            }
+        ),
+        "polymorphism": RubricCriterion(
+            name="Polimorfismo",
+            description="Avalia uso de polimorfismo",
+            weight=10,
+            is_essential=False,
+            levels={
+                "Ausente": {"threshold": 0, "description": "Sem uso de polimorfismo"},
+                "Parcial": {"threshold": 5, "description": "Uso básico de sobrescrita"},
+                "Bom": {"threshold": 7.5, "description": "Bom uso de polimorfismo"},
+                "Excelente": {"threshold": 10, "description": "Uso avançado de polimorfismo"}
+            }
+        ),
+        "abstraction": RubricCriterion(
+            name="Abstração",
+            description="Avalia uso de abstrações",
+            weight=10,
+            is_essential=False,
+            levels={
+                "Ausente": {"threshold": 0, "description": "Sem uso de abstração"},
+                "Parcial": {"threshold": 5, "description": "Uso básico de interfaces/classes abstratas"},
+                "Bom": {"threshold": 7.5, "description": "Bom uso de abstração"},
+                "Excelente": {"threshold": 10, "description": "Uso completo de abstrações"}
+            }
+        )
+    })
+
+    # Critérios avaliados só quando a avaliação recebe os dados deles (OPTIONAL_ANALYSIS_KEYS)
+    optional_rubric = MappingProxyType({
+        "reference_similarity": RubricCriterion(
+            name="Similaridade com a Referência",
+            description="Compara a estrutura do código com as soluções de referência do professor",
+            weight=10,
+            is_essential=False,
+            levels={
+                "Ausente": {"threshold": 0, "description": "Estrutura distante das referências"},
+                "Parcial": {"threshold": 5, "description": "Estrutura parecida com uma referência"},
+                "Bom": {"threshold": 7.5, "description": "Estrutura próxima de uma referência"},
+                "Excelente": {"threshold": 10, "description": "Estrutura praticamente igual a uma referência"}
+            }
+        )
+    })
+
+    # Todos os critérios que a avaliação pode conter, na ordem de exibição
+    all_criteria = MappingProxyType({**rubric, **optional_rubric})
+
+    def evaluate_criterion(self, criterion: RubricCriterion, analysis_result: Dict) -> Tuple[float, str, str]:
+        """Avalia um critério específico baseado nos resultados da análise"""
+        score = 0
+        level = list(criterion.levels.keys())[0]  # Nível mais baixo por padrão
+        feedback = []
+
+        if criterion.name == "Classes e Objetos":
+            num_classes = analysis_result.get("classes", 0)
+            num_objects = analysis_result.get("objects", 0)
+
+            if num_classes >= 3 and num_objects >= 5:
+                score = criterion.weight
+                level = "Excelente"
+            elif num_classes >= 2 and num_objects >= 3:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif num_classes >= 1 and num_objects >= 1:
+                score = criterion.weight * 0.5
+                level = "Regular"
+
+            feedback.append(f"Encontradas {num_classes} classes e {num_objects} objetos")
+
+        elif criterion.name == "Métodos":
+            method_names = analysis_result.get("methods", [])
+            overloaded = len([name for name in method_names if method_names.count(name) > 1])
+
+            if len(method_names) >= 5 and overloaded >= 2:
+                score = criterion.weight
+                level = "Excelente"
+            elif len(method_names) >= 3 and overloaded >= 1:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif len(method_names) >= 1:
+                score = criterion.weight * 0.5
+                level = "Regular"
+
+            feedback.append(f"Encontrados {len(method_names)} métodos, sendo {overloaded} sobrecarregados")
+
+        elif criterion.name == "Atributos":
+            num_attributes = analysis_result.get("attributes", 0)
+            num_private = analysis_result["encapsulation"]["private_count"]
+
+            if num_attributes >= 5 and num_private >= 3:
+                score = criterion.weight
+                level = "Excelente"
+            elif num_attributes >= 3 and num_private >= 1:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif num_attributes >= 1:
+                score = criterion.weight * 0.5
+                level = "Regular"
+
+            feedback.append(f"Encontrados {num_attributes} atributos, sendo {num_private} privados")
+
+        elif criterion.name == "Encapsulamento":
+            num_private = analysis_result["encapsulation"]["private_count"]
+            num_getters_setters = analysis_result["encapsulation"]["getters_setters"]
+
+            if num_private >= 3 and num_getters_setters >= 4:
+                score = criterion.weight
+                level = "Excelente"
+            elif num_private >= 2 and num_getters_setters >= 3:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif num_private >= 1 and num_getters_setters >= 2:
+                score = criterion.weight * 0.5
+                level = "Parcial"
+
+            feedback.append(f"Encontrados {num_private} atributos privados e {num_getters_setters} getters/setters")
+
+        elif criterion.name == "Herança":
+            subclasses = analysis_result["inheritance"]["subclasses"]
+
+            if subclasses >= 3:
+                score = criterion.weight
+                level = "Excelente"
+            elif subclasses >= 2:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif subclasses >= 1:
+                score = criterion.weight * 0.5
+                level = "Parcial"
+
+            feedback.append(f"Encontradas {subclasses} classes que usam herança")
+
+        elif criterion.name == "Polimorfismo":
+            overridden = analysis_result["polymorphism"]["overridden_methods"]
+
+            if overridden >= 3:
+                score = criterion.weight
+                level = "Excelente"
+            elif overridden >= 2:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif overridden >= 1:
+                score = criterion.weight * 0.5
+                level = "Parcial"
+
+            feedback.append(f"Encontrados {overridden} métodos sobrescritos")
+
+        elif criterion.name == "Abstração":
+            abstract_classes = analysis_result["abstraction"]["abstract_classes"]
+            interfaces = analysis_result["abstraction"]["interfaces"]
+
+            if abstract_classes >= 1 and interfaces >= 1:
+                score = criterion.weight
+                level = "Excelente"
+            elif abstract_classes >= 1 and interfaces >= 0:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif abstract_classes >= 1 or interfaces >= 1:
+                score = criterion.weight * 0.5
+                level = "Parcial"
+
+            feedback.append(f"Encontradas {abstract_classes} classes abstratas e {interfaces} interfaces")
+
+        elif criterion.name == "Similaridade com a Referência":
+            result = analysis_result["similarity"]
+
+            if result.similarity >= 0.9:
+                score = criterion.weight
+                level = "Excelente"
+            elif result.similarity >= 0.75:
+                score = criterion.weight * 0.75
+                level = "Bom"
+            elif result.similarity >= MIN_SIMILARITY:
+                score = criterion.weight * 0.5
+                level = "Parcial"
+
+            if result.reference is None:
+                feedback.append(f"Nenhuma das {result.compared + result.pruned} soluções de referência "
+                                f"tem similaridade de ao menos {MIN_SIMILARITY:.0%}")
+            else:
+                feedback.append(f"Similaridade de {result.similarity:.0%} com a solução de referência "
+                                f"{result.reference + 1} ({result.distance} edições na árvore)")
+
+        return score, level, ". ".join(feedback)
+
+    def analyze_code(self, code: str, criteria: Optional[Iterable[str]] = None,
+                     scaffold: Optional[str] = None, references: Optional[Sequence[str]] = None) -> Dict:
+        """Analisa o código Java e retorna dados brutos (contagens e nomes de métodos)
+
+        Com criteria, só as features lidas por esses critérios são calculadas; as demais
+        ficam com o valor vazio. Com scaffold (código inicial do professor), só conta o
+        que a submissão acrescentou a ele. Com references (soluções de referência), a
+        análise ganha "similarity" e o critério opcional de similaridade passa a valer.
+        """
+        analysis = {
+            "classes": 0,
+            "objects": 0,
+            "methods": [],
+            "attributes": 0,
+            "encapsulation": {"private_count": 0, "getters_setters": 0},
+            "inheritance": {"subclasses": 0},
+            "polymorphism": {"overridden_methods": 0},
+            "abstraction": {"abstract_classes": 0, "interfaces": 0}
+        }
+
+        try:
+            context = FEATURES.context(code, scaffolds.get(scaffold))
+            for name in self.required_features(criteria):
+                *parents, key = ANALYSIS_KEYS[name]
+                target = analysis
+                for parent in parents:
+                    target = target[parent]
+                target[key] = _summary(name, context[name])
+            if references and (criteria is None or "reference_similarity" in criteria):
+                analysis["similarity"] = reference_sets.register(references).compare(context["tree"])
+
+        except Exception as e:
+            print(f"Erro na análise: {str(e)}")
+
+        return analysis
+
+    def required_features(self, criteria: Optional[Iterable[str]] = None) -> List[str]:
+        """Features de analyze_code usadas pelos critérios (todos, se criteria for None)"""
+        selected = self.rubric if criteria is None else criteria
+        needed = {name for key in selected for name in CRITERION_FEATURES[key]}
+        return [name for name in ANALYSIS_KEYS if name in needed]
+
+    def evaluate_code(self, code: str, criteria: Optional[Iterable[str]] = None,
+                      scaffold: Optional[str] = None, references: Optional[Sequence[str]] = None) -> Dict:
+        """Avalia o código Java usando a rubrica detalhada"""
+        return self.score_analysis(self.analyze_code(code, criteria, scaffold, references), criteria)
+
+    def score_analysis(self, analysis: Dict, criteria: Optional[Iterable[str]] = None) -> Dict:
+        """Aplica a rubrica (ou só os critérios em criteria) sobre os dados brutos de analyze_code"""
+        evaluation = {
+            "scores": {},
+            "levels": {},
+            "feedback": {},
+            "timings": {},
+            "summary": {
+                "essential_score": 0,
+                "bonus_score": 0,
+                "total_score": 0
+            }
+        }
+
+        # Avalia cada critério; os opcionais só com os dados deles na análise
+        selected = self.all_criteria if criteria is None else set(criteria)
+        for criterion_key, criterion in self.all_criteria.items():
+            if criterion_key not in selected:
+                continue
+            if criterion_key in OPTIONAL_ANALYSIS_KEYS and OPTIONAL_ANALYSIS_KEYS[criterion_key] not in analysis:
+                continue
+            start = time.perf_counter()
+            score, level, feedback = self.evaluate_criterion(criterion, analysis)
+            evaluation["timings"][criterion_key] = time.perf_counter() - start
+
+            evaluation["scores"][criterion_key] = score
+            evaluation["levels"][criterion_key] = level
+            evaluation["feedback"][criterion_key] = feedback
+
+            if criterion.is_essential:
+                evaluation["summary"]["essential_score"] += score
+            else:
+                evaluation["summary"]["bonus_score"] += score
+
+        evaluation["summary"]["total_score"] = min(100,
+            evaluation["summary"]["essential_score"] +
+            evaluation["summary"]["bonus_score"])
+
+        # Determina nível geral
+        if evaluation["summary"]["total_score"] >= 90:
+            evaluation["summary"]["proficiency"] = "Excelente"
+        elif evaluation["summary"]["total_score"] >= 75:
+            evaluation["summary"]["proficiency"] = "Bom"
+        elif evaluation["summary"]["total_score"] >= 60:
+            evaluation["summary"]["proficiency"] = "Satisfatório"
+        else:
+            evaluation["summary"]["proficiency"] = "Necessita Melhorias"
+
+        return evaluation
+
+# Avaliador sem estado, criado uma vez e compartilhado entre as requisições
+evaluator = EnhancedJavaPOOEvaluator()
+
+def format_file_result(file_result) -> str:
+    """Formata o resultado da avaliação de um arquivo"""
+    evaluation = file_result.evaluation
+
+    result = f"\n{'='*50}\nAvaliação do arquivo: {file_result.name}\n{'='*50}\n\n"
+    if evaluation is None:
+        result += "Avaliação não concluída:\n"
+        for error in file_result.errors:
+            result += f"  - [{STAGES[error.stage]}] {error.message}\n"
+        return result
+
+    result += f"Codificação: {file_result.encoding}\n"
+
+    # Pontuação e nível geral
+    result += f"Pontuação Total: {evaluation['summary']['total_score']:.1f}/100\n"
+    result += f"Nível de Proficiência: {evaluation['summary']['proficiency']}\n"
+    result += f"Pontuação Essencial: {evaluation['summary']['essential_score']:.1f}/60\n"
+    bonus_max = 40 + sum(criterion.weight for key, criterion in evaluator.optional_rubric.items()
+                         if key in evaluation["scores"])
+    result += f"Pontuação Bônus: {evaluation['summary']['bonus_score']:.1f}/{bonus_max}\n\n"
+
+    # Detalhamento por critério
+    result += "Avaliação Detalhada por Critério:\n"
+    result += "-" * 30 + "\n\n"
+
+    for criterion_key, criterion in evaluator.all_criteria.items():
+        if criterion_key not in evaluation["scores"]:
+            continue
+        result += f"• {criterion.name}:\n"
+        result += f"  Nível: {evaluation['levels'][criterion_key]}\n"
+        result += f"  Pontuação: {evaluation['scores'][criterion_key]:.1f}/{criterion.weight}\n"
+        if evaluation['feedback'][criterion_key]:
+            result += f"  Feedback: {evaluation['feedback'][criterion_key]}\n"
+        result += "\n"
+
+    return result
@@ -0,0 +1,309 @@
+"""Avaliação ao vivo do editor de código: retorno léxico imediato e rubrica com debounce
+
+A cada alteração no editor, o retorno léxico (erros de tokenização, chaves e parênteses
+sem par, tipos, métodos e main) sai em poucos milissegundos, seguido da prévia da rubrica
+calculada só pelos tokens, quando o avaliador tem uma. A rubrica completa só roda
+depois de DEBOUNCE segundos sem novas alterações, pelo escalonador justo e pelo cache de
+parsing incremental, que reaproveita as classes e os membros que não mudaram. Uma
+alteração mais recente torna obsoletas as avaliações em andamento da mesma sessão, que
+param no próximo ponto de verificação sem mostrar resultado.
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from javalang.tokenizer import BasicType, Identifier, Keyword, Separator
+
+from batch import FILE_TIMEOUT, FileError, FileResult, analyze_source, describe_error
+from fastjavalang import FastTokenizer
+from scheduler import scheduler
+
+# Segundos sem alterações antes de rodar a rubrica completa
+DEBOUNCE = 0.4
+# Intervalo entre as verificações de obsolescência enquanto a rubrica roda
+POLL_INTERVAL = 0.05
+# Resultados completos guardados por avaliador, pelo código exato
+RESULT_CACHE_SIZE = 64
+# Sessões do editor acompanhadas ao mesmo tempo
+MAX_SESSIONS = 4096
+# Problemas léxicos exibidos no retorno imediato
+MAX_PROBLEMS = 5
+# Nome do "arquivo" do editor nos resultados
+EDITOR_NAME = "Editor"
+
+_CLOSING = {"}": "{", ")": "(", "]": "["}
+_TYPE_KEYWORDS = {"class", "interface", "enum"}
+
+
+@dataclass
+class LexicalSummary:
+    """Retorno barato, calculado só a partir dos tokens"""
+    tokens: int = 0
+    lines: int = 0
+    types: List[str] = field(default_factory=list)
+    methods: int = 0
+    has_main: bool = False
+    problems: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def describe(self) -> str:
+        lines = [f"Análise léxica: {self.tokens} tokens em {self.lines} linhas ({self.elapsed * 1000:.0f} ms)",
+                 f"Tipos: {', '.join(self.types) if self.types else 'nenhum'} | "
+                 f"Métodos: {self.methods} | Método main: {'sim' if self.has_main else 'não'}"]
+        if self.problems:
+            lines.append("Problemas encontrados:")
+            lines.extend(f"  - {problem}" for problem in self.problems[:MAX_PROBLEMS])
+            if len(self.problems) > MAX_PROBLEMS:
+                lines.append(f"  - ... e mais {len(self.problems) - MAX_PROBLEMS}")
+        else:
+            lines.append("Nenhum problema léxico encontrado")
+        return "\n".join(lines)
+
+
+def scan_tokens(code: str) -> Tuple[List, List[str]]:
+    """Tokens do código (ignorando erros) e os problemas léxicos: erros do tokenizador e
+    delimitadores sem par, que fazem o parsing falhar com certeza"""
+    tokenizer = FastTokenizer(code, ignore_errors=True)
+    tokens = list(tokenizer.tokenize())
+    # Mensagens do tokenizador do javalang: "<erro> at "<char>", line <n>: <linha>"
+    problems = [str(error) for error in tokenizer.errors]
+    opened: List[Tuple[str, int]] = []
+
+    for token in tokens:
+        if type(token) is not Separator:
+            continue
+        value = token.value
+        if value in "{([":
+            opened.append((value, token.position[0]))
+        elif value in _CLOSING:
+            if not opened:
+                problems.append(f"'{value}' na linha {token.position[0]} sem abertura")
+            elif opened[-1][0] != _CLOSING[value]:
+                char, line = opened.pop()
+                problems.append(f"'{value}' na linha {token.position[0]} não fecha '{char}' da linha {line}")
+            else:
+                opened.pop()
+
+    problems.extend(f"'{char}' da linha {line} não foi fechado" for char, line in opened)
+    return tokens, problems
+
+
+def lexical_summary(code: str) -> LexicalSummary:
+    """Resume o que dá para saber do código sem a árvore"""
+    start = time.perf_counter()
+    tokens, problems = scan_tokens(code)
+    summary = LexicalSummary(tokens=len(tokens), lines=code.count("\n") + 1 if code else 0, problems=problems)
+    previous = before = None
+
+    for token in tokens:
+        value = token.value
+        if type(token) is Identifier and type(previous) is Keyword and previous.value in _TYPE_KEYWORDS \
+                and not (before is not None and before.value == "."):
+            summary.types.append(value)
+        elif value == "(" and type(previous) is Identifier and before is not None \
+                and (type(before) in (Identifier, BasicType) or before.value in ("void", "]")):
+            # Tipo (ou void) seguido de nome e "(": declaração de método
+            summary.methods += 1
+            summary.has_main |= previous.value == "main" and before.value == "void"
+        before, previous = previous, token
+
+    summary.elapsed = time.perf_counter() - start
+    return summary
+
+
+class LiveSessions:
+    """Geração mais recente de cada sessão do editor
+
+    Cada avaliação recebe uma geração ao começar; quando outra avaliação da mesma sessão
+    começa depois dela, a anterior fica obsoleta.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._latest: "OrderedDict[str, int]" = OrderedDict()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def begin(self, session: str) -> "LiveRun":
+        with self._lock:
+            generation = next(self._counter)
+            self._latest[session] = generation
+            self._latest.move_to_end(session)
+            while len(self._latest) > self.max_sessions:
+                self._latest.popitem(last=False)
+        return LiveRun(self, session, generation)
+
+    def is_latest(self, session: str, generation: int) -> bool:
+        with self._lock:
+            return self._latest.get(session) == generation
+
+
+@dataclass
+class LiveRun:
+    sessions: LiveSessions
+    session: str
+    generation: int
+
+    @property
+    def stale(self) -> bool:
+        return not self.sessions.is_latest(self.session, self.generation)
+
+    def settle(self, seconds: float) -> bool:
+        """Espera o debounce; False se uma alteração mais recente chegou nesse meio tempo"""
+        deadline = time.perf_counter() + seconds
+        while not self.stale:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return True
+            time.sleep(min(POLL_INTERVAL, remaining))
+        return False
+
+
+live_sessions = LiveSessions()
+
+
+class TierAgreement:
+    """Concordância entre a prévia léxica e a avaliação completa do mesmo código"""
+
+    def __init__(self):
+        self.samples = 0
+        self.same_total = 0
+        self.same_proficiency = 0
+        self.same_criteria = 0
+        self.criteria = 0
+        self.total_difference = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, preview: Dict, full: Dict):
+        with self._lock:
+            self.samples += 1
+            difference = abs(preview["summary"]["total_score"] - full["summary"]["total_score"])
+            self.total_difference += difference
+            self.same_total += difference == 0
+            self.same_proficiency += preview["summary"]["proficiency"] == full["summary"]["proficiency"]
+            for criterion, score in full["scores"].items():
+                self.criteria += 1
+                self.same_criteria += preview["scores"].get(criterion) == score
+
+    def describe(self) -> str:
+        with self._lock:
+            if not self.samples:
+                return "Prévia × avaliação completa: sem amostras"
+            return (f"Prévia × avaliação completa ({self.samples} avaliações): "
+                    f"mesma pontuação em {self.same_total / self.samples:.0%}, "
+                    f"mesmo nível em {self.same_proficiency / self.samples:.0%}, "
+                    f"critérios iguais em {self.same_criteria / max(self.criteria, 1):.0%}, "
+                    f"diferença média {self.total_difference / self.samples:.1f} pts")
+
+
+class LiveEvaluator:
+    """Avaliação do editor em etapas: retorno léxico, prévia provisória e rubrica completa
+
+    evaluate é um gerador de pares (retorno léxico, resultado); o resultado é None
+    enquanto nada ficou pronto, e a interface mantém o anterior. Com preview (uma função
+    que avalia o código só pelos tokens), a prévia aparece logo após o retorno léxico e é
+    substituída pela rubrica completa, e a concordância entre as duas fica em agreement
+    (que pode ser compartilhado com a avaliação em lote).
+    """
+
+    def __init__(self, analyze: Callable[[str], Any], render: Callable[[FileResult], str],
+                 score: Optional[Callable] = None, preview: Optional[Callable[[str], Dict]] = None,
+                 debounce: float = DEBOUNCE, sessions: LiveSessions = live_sessions,
+                 agreement: Optional[TierAgreement] = None):
+        self.analyze = analyze
+        self.render = render
+        self.score = score
+        self.preview = preview
+        self.debounce = debounce
+        self.sessions = sessions
+        self.agreement = agreement or TierAgreement()
+        self._results: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, code: str) -> Optional[str]:
+        with self._lock:
+            rendered = self._results.get(code)
+            if rendered is not None:
+                self._results.move_to_end(code)
+            return rendered
+
+    def _remember(self, code: str, rendered: str):
+        with self._lock:
+            self._results[code] = rendered
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+
+    def _with_agreement(self, rendered: str) -> str:
+        return f"{rendered}\n{self.agreement.describe()}\n" if self.preview else rendered
+
+    def evaluate(self, code: str, session: Optional[str] = None) -> Iterator[Tuple[str, Optional[str]]]:
+        run = self.sessions.begin(session or "")
+        feedback = lexical_summary(code).describe()
+        yield feedback, None
+
+        rendered = self._cached(code)
+        if rendered is not None:
+            if not run.stale:
+                yield feedback, self._with_agreement(rendered)
+            return
+
+        provisional = None
+        if self.preview is not None:
+            try:
+                provisional = self.preview(code)
+            except Exception:
+                # A prévia é opcional; a avaliação completa segue normalmente
+                provisional = None
+            else:
+                if run.stale:
+                    return
+                yield feedback, self.render(FileResult(name=EDITOR_NAME, encoding="utf-8", evaluation=provisional))
+
+        if not run.settle(self.debounce):
+            return
+        result = self._grade(code, run)
+        if result is None:
+            return
+        if provisional is not None and result.evaluation is not None:
+            self.agreement.record(provisional, result.evaluation)
+        rendered = self.render(result)
+        self._remember(code, rendered)
+        if not run.stale:
+            yield feedback, self._with_agreement(rendered)
+
+    def _grade(self, code: str, run: LiveRun) -> Optional[FileResult]:
+        """Rubrica completa pelo escalonador; None se a avaliação ficou obsoleta"""
+        result = FileResult(name=EDITOR_NAME, encoding="utf-8")
+        task = scheduler.submit(run.session, analyze_source, self.analyze, code)
+        started = None
+        while not task.future.done() or not task.started.is_set():
+            if run.stale:
+                # Só cancela se ainda estiver na fila; uma análise em execução termina sozinha
+                task.future.cancel()
+                return None
+            if not task.started.is_set():
+                task.started.wait(POLL_INTERVAL)
+                continue
+            # O limite de tempo vale para a execução, não para a espera na fila
+            started = started or time.perf_counter()
+            if time.perf_counter() - started > FILE_TIMEOUT:
+                result.errors.append(FileError(result.name, "timeout", f"avaliação excedeu {FILE_TIMEOUT:g}s"))
+                return result
+            wait([task.future], timeout=POLL_INTERVAL)
+
+        try:
+            analysis, parse_error = task.future.result()
+        except Exception as e:
+            result.errors.append(FileError(result.name, "internal", describe_error(e)))
+            return result
+        if parse_error:
+            result.errors.append(FileError(result.name, "parse", parse_error))
+        try:
+            result.evaluation = self.score(analysis) if self.score else analysis
+        except Exception as e:
+            result.errors.append(FileError(result.name, "internal", describe_error(e)))
+        return result
@@ -0,0 +1,124 @@
+"""Código inicial (scaffold) do professor, descontado das entregas dos alunos.
+
+O código inicial é registrado uma vez: o registro guarda o hash estrutural de cada membro
+(métodos, construtores, campos e tipos inteiros), o cabeçalho de cada tipo declarado e,
+sob demanda, o valor de cada contagem textual do próprio código inicial. Nas entregas, o
+índice de símbolos das features deixa de fora os membros cujo hash está no registro (uma
+consulta a um conjunto por membro) e não conta a declaração dos tipos do código inicial,
+só o que o aluno acrescentou neles; contagens feitas no texto subtraem o valor já
+calculado para o código inicial. Um método do código inicial alterado pelo aluno conta
+inteiro, como código dele.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from javalang import tree
+
+from batch import describe_error
+from parsing import code_key, parse_cache, parse_java
+from subtrees import SubtreeTable
+from uploads import decode_source, read_upload
+
+# Número máximo de códigos iniciais registrados mantidos em memória
+SCAFFOLD_CACHE_SIZE = 32
+
+
+def type_header(node: tree.TypeDeclaration) -> tuple:
+    """Declaração de um tipo sem o corpo: espécie, nome, modificadores, herança e parâmetros"""
+    return (type(node).__name__, node.name, tuple(sorted(node.modifiers or ())),
+            repr(getattr(node, "extends", None)), repr(getattr(node, "implements", None)),
+            repr(getattr(node, "type_parameters", None)))
+
+
+class Scaffold:
+    """Hashes e contagens do código inicial, calculados no registro"""
+
+    # Nós comparados com o código inicial pelo hash estrutural
+    MEMBER_TYPES = (tree.MethodDeclaration, tree.ConstructorDeclaration, tree.FieldDeclaration,
+                    tree.TypeDeclaration)
+
+    def __init__(self, code: str, subtrees: SubtreeTable):
+        self.code = code
+        try:
+            unit = parse_java(code)
+        except Exception as e:
+            raise ValueError(f"Erro de sintaxe no código inicial: {describe_error(e)}") from e
+        members = [node for _, node in unit if isinstance(node, self.MEMBER_TYPES)]
+        self.members = frozenset(subtrees.structural_hash(node) for node in members)
+        self.headers = frozenset(type_header(node) for node in members if isinstance(node, tree.TypeDeclaration))
+        self.counts: Dict[str, int] = {}
+        for node in members:
+            kind = type(node).__name__
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+        self._baseline: Dict[Hashable, Any] = {}
+
+    def contains(self, node, subtrees: SubtreeTable) -> bool:
+        """Indica se o membro é idêntico a um do código inicial"""
+        return subtrees.structural_hash(node) in self.members
+
+    def declares(self, node) -> bool:
+        """Indica se o nó declara um tipo com o mesmo cabeçalho de um do código inicial"""
+        return isinstance(node, tree.TypeDeclaration) and type_header(node) in self.headers
+
+    def baseline(self, key: Hashable, compute: Callable[[str], Any]) -> Any:
+        """Valor de compute sobre o código inicial, calculado uma vez por registro"""
+        if key not in self._baseline:
+            self._baseline[key] = compute(self.code)
+        return self._baseline[key]
+
+    def describe(self) -> str:
+        labels = (("ClassDeclaration", "classes"), ("InterfaceDeclaration", "interfaces"),
+                  ("MethodDeclaration", "métodos"), ("ConstructorDeclaration", "construtores"),
+                  ("FieldDeclaration", "campos"))
+        parts = [f"{self.counts[kind]} {label}" for kind, label in labels if self.counts.get(kind)]
+        return "Código inicial registrado: " + (", ".join(parts) or "nenhuma declaração") + \
+            " descontados das entregas."
+
+
+class ScaffoldRegistry:
+    """Códigos iniciais já registrados, pelo hash do código"""
+
+    def __init__(self, max_entries: int = SCAFFOLD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Scaffold]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, code: str) -> Scaffold:
+        """Registra o código inicial (ou devolve o registro existente); ValueError se não compilar"""
+        key = code_key(code)
+        with self._lock:
+            scaffold = self._entries.get(key)
+            if scaffold is not None:
+                self._entries.move_to_end(key)
+                return scaffold
+        scaffold = Scaffold(code, parse_cache.subtrees)
+        with self._lock:
+            self._entries[key] = scaffold
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return scaffold
+
+    def get(self, code: Optional[str]) -> Optional[Scaffold]:
+        return self.register(code) if code else None
+
+
+scaffolds = ScaffoldRegistry()
+
+
+def register_upload(file) -> Tuple[Optional[str], str]:
+    """Registra o código inicial enviado pela interface; devolve o código e a mensagem de status"""
+    if file is None:
+        return None, ""
+    code = decode_source(read_upload(file))[0]
+    try:
+        scaffold = scaffolds.register(code)
+    except ValueError as e:
+        return None, str(e)
+    return code, scaffold.describe()
+
+
+# Processos filhos criados por fork registram de novo, com a tabela de subárvores deles
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: scaffolds.__init__(scaffolds.max_entries))
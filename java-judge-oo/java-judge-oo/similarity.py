@@ -0,0 +1,372 @@
+"""Similaridade com soluções de referência por distância de edição entre árvores.
+
+A árvore sintática da entrega é comparada com a de cada solução de referência do
+professor pela distância de edição de Zhang–Shasha (inserir, remover ou trocar o rótulo
+de um nó custa 1). Os rótulos são o tipo do nó e, em operações e tipos primitivos, o
+operador ou o nome; identificadores e literais não entram, então renomear variáveis e
+métodos não afasta a entrega da referência.
+
+Para que a turma inteira rode rápido:
+
+- as referências são registradas uma vez, já na ordem pós-fixa usada pelo algoritmo;
+- um limite inferior barato (diferença de tamanho e de histograma de rótulos) descarta
+  as referências que não podem ficar abaixo do teto de custo, e as restantes são
+  comparadas da mais promissora para a menos, com o teto baixando até a melhor distância
+  já encontrada;
+- o teto de custo por par vem da menor similaridade que ainda pontua: distâncias acima
+  dele não mudam a nota;
+- antes de Zhang–Shasha, a distância entre as sequências de rótulos (limite inferior) e
+  a distância de cima para baixo (limite superior) são calculadas; quando coincidem, a
+  distância já é conhecida, e senão Zhang–Shasha roda com o teto logo abaixo do limite
+  superior, calculando só as células a até "teto" posições da diagonal.
+"""
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from javalang.ast import Node
+
+from parsing import code_key, parse_java
+from uploads import decode_source, read_upload
+
+# Número máximo de conjuntos de referências registrados mantidos em memória
+REFERENCE_CACHE_SIZE = 16
+# Abaixo desta similaridade o critério não pontua; define o teto de custo de cada par
+MIN_SIMILARITY = 0.5
+# Atributos que entram no rótulo, além do tipo do nó
+_LABEL_ATTRIBUTES = {"BinaryOperation": "operator", "Assignment": "type", "BasicType": "name"}
+
+
+def _label(node: Node) -> str:
+    kind = type(node).__name__
+    attribute = _LABEL_ATTRIBUTES.get(kind)
+    return f"{kind}:{getattr(node, attribute)}" if attribute else kind
+
+
+def _children(node: Node) -> List[Node]:
+    """Filhos do nó na ordem do javalang, com as listas aninhadas achatadas"""
+    children, pending = [], [getattr(node, attr) for attr in reversed(node.attrs)]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, Node):
+            children.append(value)
+        elif isinstance(value, (list, tuple)):
+            pending.extend(reversed(value))
+    return children
+
+
+@dataclass(frozen=True)
+class OrderedTree:
+    """Árvore em ordem pós-fixa (índices a partir de 1), como usada por Zhang–Shasha"""
+    labels: Tuple[str, ...]  # labels[0] é um marcador sem uso
+    leftmost: Tuple[int, ...]  # folha mais à esquerda da subárvore de cada nó
+    keyroots: Tuple[int, ...]
+    histogram: Counter
+    children: Tuple[Tuple[int, ...], ...]
+    levels: Tuple[Tuple[int, ...], ...]  # nós de cada profundidade; a raiz fica em levels[0]
+
+    @property
+    def size(self) -> int:
+        return len(self.labels) - 1
+
+    @classmethod
+    def from_node(cls, root: Node) -> "OrderedTree":
+        labels, leftmost, children = [""], [0], [()]
+        levels: List[List[int]] = []
+        # Percurso pós-fixo iterativo: (nó, filhos já empilhados)
+        stack: List[Tuple[Node, bool]] = [(root, False)]
+        first_leaf: List[int] = []
+        # Filhos já numerados de cada nó aberto, com um marcador para a raiz
+        numbered: List[List[int]] = [[]]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                first_leaf.append(len(labels))
+                numbered.append([])
+                stack.extend((child, False) for child in reversed(_children(node)))
+                continue
+            index = len(labels)
+            labels.append(_label(node))
+            leftmost.append(first_leaf.pop())
+            children.append(tuple(numbered.pop()))
+            numbered[-1].append(index)
+            depth = len(numbered) - 1
+            while len(levels) <= depth:
+                levels.append([])
+            levels[depth].append(index)
+        # Raízes-chave: o nó de maior índice entre os que têm a mesma folha mais à esquerda
+        last: Dict[int, int] = {}
+        for index in range(1, len(labels)):
+            last[leftmost[index]] = index
+        return cls(tuple(labels), tuple(leftmost), tuple(sorted(last.values())), Counter(labels[1:]),
+                   tuple(children), tuple(tuple(level) for level in levels))
+
+
+def lower_bound(a: OrderedTree, b: OrderedTree) -> int:
+    """Limite inferior da distância: cada operação acerta no máximo dois rótulos do histograma"""
+    mismatched = sum(((a.histogram - b.histogram) + (b.histogram - a.histogram)).values())
+    return max(abs(a.size - b.size), (mismatched + 1) // 2)
+
+
+def sequence_distance(a: OrderedTree, b: OrderedTree, cap: int) -> Optional[int]:
+    """Distância de edição entre as sequências de rótulos em ordem pós-fixa, ou None se passar de cap
+
+    Limite inferior da distância entre as árvores (cada edição na árvore é uma edição na
+    sequência), calculado só na faixa de cap posições em torno da diagonal.
+    """
+    n, m = a.size, b.size
+    if abs(n - m) > cap:
+        return None
+    infinity = cap + 1
+    labels_a, labels_b = a.labels, b.labels
+    previous = [y if y <= cap else infinity for y in range(m + 1)]
+    for x in range(1, n + 1):
+        low, high = max(1, x - cap), min(m + 1, x + cap + 1)
+        current = [infinity] * (m + 1)
+        if x <= cap:
+            current[0] = x
+        label, left = labels_a[x], current[low - 1]
+        for y in range(low, high):
+            best = previous[y] + 1
+            if left < best - 1:
+                best = left + 1
+            replace = previous[y - 1] + (label != labels_b[y])
+            if replace < best:
+                best = replace
+            if best > cap:
+                best = infinity
+            current[y] = left = best
+        # O mínimo de uma linha nunca diminui nas seguintes
+        if min(current[low - 1:high]) > cap:
+            return None
+        previous = current
+    return previous[m] if previous[m] <= cap else None
+
+
+def top_down_distance(a: OrderedTree, b: OrderedTree) -> int:
+    """Distância com edições só de cima para baixo (Selkow): limite superior da distância
+
+    Um nó só é associado se o pai também for, e remover ou inserir um nó leva a subárvore
+    inteira. Profundidade por profundidade, de baixo para cima, cada par de nós compara as
+    listas de filhos como sequências, em O(n·m) no total.
+    """
+    size_a = [index - first + 1 for index, first in enumerate(a.leftmost)]
+    size_b = [index - first + 1 for index, first in enumerate(b.leftmost)]
+    distance: Dict[Tuple[int, int], int] = {}
+    for depth in range(min(len(a.levels), len(b.levels)) - 1, -1, -1):
+        for u in a.levels[depth]:
+            children_a, label = a.children[u], a.labels[u]
+            for v in b.levels[depth]:
+                children_b = b.children[v]
+                previous = [0]
+                for y in children_b:
+                    previous.append(previous[-1] + size_b[y])
+                for x in children_a:
+                    removed = size_a[x]
+                    current = [previous[0] + removed]
+                    for k, y in enumerate(children_b, 1):
+                        best = previous[k] + removed
+                        inserted = current[k - 1] + size_b[y]
+                        if inserted < best:
+                            best = inserted
+                        matched = previous[k - 1] + distance[x, y]
+                        if matched < best:
+                            best = matched
+                        current.append(best)
+                    previous = current
+                distance[u, v] = previous[-1] + (label != b.labels[v])
+    return distance[a.size, b.size]
+
+
+def tree_distance(a: OrderedTree, b: OrderedTree, cap: int) -> Optional[int]:
+    """Distância de edição de Zhang–Shasha entre as árvores, ou None se passar de cap
+
+    Numa edição de custo até cap, nós associados estão a no máximo cap posições um do
+    outro na ordem pós-fixa; as células fora dessa faixa não são calculadas nem guardadas
+    (cada linha de td só tem a faixa, com j1 na posição j1 - i1 + reach), e os pares de
+    raízes-chave com todas as células fora dela são pulados.
+    """
+    n, m = a.size, b.size
+    if abs(n - m) > cap:
+        return None
+    infinity = cap + 1
+    la, lb, labels_a, labels_b = a.leftmost, b.leftmost, a.labels, b.labels
+    reach = min(cap, n)
+    td = [[infinity] * (reach + min(cap, m) + 1) for _ in range(n + 1)]
+
+    for i in a.keyroots:
+        li = la[i]
+        for j in b.keyroots:
+            lj = lb[j]
+            if li - j > cap or lj - i > cap:
+                continue
+            rows, cols = i - li + 2, j - lj + 2
+            # Colunas da subárvore de j (índice y = j1 - lj + 1): onde começa a subárvore
+            # de cada nó (0 se ela é inteira) e os rótulos
+            start_b = [0] + [lb[j1] - lj for j1 in range(lj, j + 1)]
+            sub_labels = labels_b[lj - 1:j + 1]
+            fd = [[infinity] * cols for _ in range(rows)]
+            fd[0] = [y if y <= cap else infinity for y in range(cols)]
+            for x in range(1, min(rows, infinity)):
+                fd[x][0] = x
+            for x in range(1, rows):
+                i1 = li + x - 1
+                row, above, td_row = fd[x], fd[x - 1], td[i1]
+                # Faixa: |i1 - j1| <= cap
+                low, high = max(1, i1 - cap - lj + 1), min(cols, i1 + cap - lj + 2)
+                if low >= high:
+                    continue
+                # Distâncias já calculadas entre a subárvore de i1 e as de cada coluna
+                # (coluna y em shift + y na faixa; as anteriores a ela ficam fora do laço)
+                shift = lj - 1 - i1 + reach
+                sub_td = td_row[shift:] if shift >= 0 else [infinity] * -shift + td_row
+                left = row[low - 1]
+                if la[i1] != li:
+                    # Floresta de a: juntar a subárvore de i1 com a floresta antes dela
+                    before = fd[la[i1] - li]
+                    for y in range(low, high):
+                        best = above[y] + 1
+                        if left < best - 1:
+                            best = left + 1
+                        joined = before[start_b[y]] + sub_td[y]
+                        if joined < best:
+                            best = joined
+                        if best > cap:
+                            best = infinity
+                        row[y] = left = best
+                    continue
+                label, first = labels_a[i1], fd[0]
+                for y in range(low, high):
+                    best = above[y] + 1
+                    if left < best - 1:
+                        best = left + 1
+                    if start_b[y]:
+                        joined = first[start_b[y]] + sub_td[y]
+                        if joined < best:
+                            best = joined
+                        if best > cap:
+                            best = infinity
+                    else:
+                        # Duas árvores inteiras: associar as raízes
+                        rename = above[y - 1] + (label != sub_labels[y])
+                        if rename < best:
+                            best = rename
+                        if best > cap:
+                            best = infinity
+                        td_row[shift + y] = best
+                    row[y] = left = best
+
+    distance = td[n][m - n + reach]
+    return distance if distance <= cap else None
+
+
+def bounded_distance(a: OrderedTree, b: OrderedTree, cap: int) -> Optional[int]:
+    """Distância entre as árvores, ou None se passar de cap
+
+    Zhang–Shasha só roda quando os limites inferior (sequências) e superior (de cima para
+    baixo) não coincidem, e com o teto logo abaixo do limite superior.
+    """
+    lower = sequence_distance(a, b, cap)
+    if lower is None:
+        return None
+    upper = top_down_distance(a, b)
+    if upper <= lower:
+        return upper
+    exact = tree_distance(a, b, min(cap, upper - 1))
+    if exact is not None:
+        return exact
+    return upper if upper <= cap else None
+
+
+@dataclass(frozen=True)
+class SimilarityResult:
+    similarity: float  # 1 - distância / tamanho da maior árvore; 0 se passou do teto
+    distance: Optional[int]
+    reference: Optional[int]  # índice da referência mais próxima
+    compared: int  # referências comparadas com o algoritmo completo
+    pruned: int  # referências descartadas pelo limite inferior ou pelo teto
+
+
+class ReferenceSet:
+    """Soluções de referência já convertidas para comparação"""
+
+    def __init__(self, sources: Sequence[str]):
+        self.trees: List[OrderedTree] = []
+        for index, code in enumerate(sources, 1):
+            try:
+                self.trees.append(OrderedTree.from_node(parse_java(code)))
+            except Exception as e:
+                raise ValueError(f"Erro de sintaxe na solução de referência {index}: {e}") from e
+
+    def describe(self) -> str:
+        sizes = ", ".join(str(tree.size) for tree in self.trees)
+        return f"{len(self.trees)} soluções de referência registradas (árvores com {sizes} nós)."
+
+    def compare(self, root: Node, min_similarity: float = MIN_SIMILARITY) -> SimilarityResult:
+        """Referência mais próxima da árvore, com a poda pelo limite inferior e pelo teto"""
+        tree = OrderedTree.from_node(root)
+        candidates = sorted((lower_bound(tree, reference), index, reference)
+                            for index, reference in enumerate(self.trees))
+        best: Optional[Tuple[float, int, int]] = None
+        compared = pruned = 0
+        for bound, index, reference in candidates:
+            largest = max(tree.size, reference.size)
+            cap = int((1 - min_similarity) * largest)
+            if best is not None:
+                # Só interessa uma referência mais próxima que a melhor até agora
+                cap = min(cap, int((1 - best[0]) * largest - 1e-9))
+            if bound > cap:
+                pruned += 1
+                continue
+            compared += 1
+            distance = bounded_distance(tree, reference, cap)
+            if distance is None:
+                pruned += 1
+                continue
+            similarity = 1 - distance / largest if largest else 1.0
+            if best is None or similarity > best[0]:
+                best = (similarity, distance, index)
+        if best is None:
+            return SimilarityResult(0.0, None, None, compared, pruned)
+        return SimilarityResult(best[0], best[1], best[2], compared, pruned)
+
+
+class ReferenceRegistry:
+    """Conjuntos de referências já registrados, pelo hash do conteúdo"""
+
+    def __init__(self, max_entries: int = REFERENCE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ReferenceSet]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, sources: Sequence[str]) -> ReferenceSet:
+        """Registra as referências (ou devolve o registro existente); ValueError se alguma não compilar"""
+        key = code_key("\0".join(sources))
+        with self._lock:
+            references = self._entries.get(key)
+            if references is not None:
+                self._entries.move_to_end(key)
+                return references
+        references = ReferenceSet(sources)
+        with self._lock:
+            self._entries[key] = references
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return references
+
+
+reference_sets = ReferenceRegistry()
+
+
+def register_uploads(files) -> Tuple[Optional[Tuple[str, ...]], str]:
+    """Registra as soluções de referência enviadas pela interface; devolve os códigos e a mensagem de status"""
+    if not files:
+        return None, ""
+    sources = tuple(decode_source(read_upload(file))[0] for file in files)
+    try:
+        references = reference_sets.register(sources)
+    except ValueError as e:
+        return None, str(e)
+    return sources, references.describe()
@@ -0,0 +1,119 @@
+"""API JSON de avaliação em lote, montada ao lado da interface Gradio.
+
+POST /grade/{ferramenta}   (ferramentas: inspector, oo, structural, competency)
+
+Corpo aceito:
+- application/json: {"files": [{"name": "Main.java", "source": "..."}]}
+- application/zip: arquivo .zip com os .java do lote
+- multipart/form-data: um ou mais campos "files" com arquivos .java ou .zip
+
+Com Content-Encoding: gzip o corpo é descomprimido antes da leitura; respostas são
+comprimidas quando o cliente envia Accept-Encoding: gzip. Com ?stream=1 (ou
+Accept: application/x-ndjson) a resposta é NDJSON: uma linha por arquivo, na ordem em
+que terminam, e uma última linha com o resumo do lote.
+"""
+import io
+import json
+import zipfile
+import zlib
+from typing import Iterator, List
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+# registry vem primeiro: ele coloca os diretórios dos espaços no sys.path
+from registry import ANALYZERS, Analyzer, report_summary
+from batch import evaluate_batch, stream_batch
+from uploads import UploadedFile
+
+# Tamanho máximo do corpo da requisição depois de descomprimido (gzip ou zip)
+MAX_BODY_BYTES = 50 * 1024 * 1024
+NDJSON = "application/x-ndjson"
+
+router = APIRouter()
+
+
+def _gunzip(body: bytes) -> bytes:
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = decompressor.decompress(body, MAX_BODY_BYTES)
+    if decompressor.unconsumed_tail:
+        raise HTTPException(413, f"corpo descomprimido excede {MAX_BODY_BYTES // (1024 * 1024)} MB")
+    return data
+
+
+def _unzip(data: bytes) -> List[UploadedFile]:
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise HTTPException(400, "arquivo zip inválido")
+
+    entries = [info for info in archive.infolist()
+               if not info.is_dir() and info.filename.endswith(".java")]
+    if sum(info.file_size for info in entries) > MAX_BODY_BYTES:
+        raise HTTPException(413, f"conteúdo do zip excede {MAX_BODY_BYTES // (1024 * 1024)} MB")
+    return [UploadedFile(archive.read(info), info.filename) for info in entries]
+
+
+def _uploaded(name: str, data: bytes) -> List[UploadedFile]:
+    return _unzip(data) if name.endswith(".zip") else [UploadedFile(data, name)]
+
+
+async def read_files(request: Request) -> List[UploadedFile]:
+    """Converte o corpo da requisição na lista de arquivos do lote"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type == "multipart/form-data":
+        form = await request.form()
+        files = []
+        for upload in form.getlist("files"):
+            files.extend(_uploaded(upload.filename or "arquivo.java", await upload.read()))
+        return files
+
+    body = await request.body()
+    if request.headers.get("content-encoding", "").lower() == "gzip":
+        body = _gunzip(body)
+
+    if content_type in ("application/zip", "application/x-zip-compressed"):
+        return _unzip(body)
+    try:
+        payload = json.loads(body)
+        return [UploadedFile(item["source"].encode("utf-8"), item.get("name") or f"arquivo{index}.java")
+                for index, item in enumerate(payload["files"])]
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(400, 'corpo JSON esperado: {"files": [{"name": ..., "source": ...}]}')
+
+
+def _ndjson(analyzer: Analyzer, files, session: str) -> Iterator[bytes]:
+    sent = set()
+    for report in stream_batch(files, analyzer.analyze, score=analyzer.score, session=session):
+        for result in report.results:
+            if result.index not in sent:
+                sent.add(result.index)
+                yield (json.dumps(analyzer.serialize(result), ensure_ascii=False) + "\n").encode("utf-8")
+        if report.complete:
+            summary = {"evaluator": analyzer.key, **report_summary(report)}
+            yield (json.dumps({"batch": summary}, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+@router.post("/grade/{key}")
+async def grade(key: str, request: Request, stream: bool = False):
+    """Avalia um lote de arquivos Java e devolve o resultado estruturado de cada um"""
+    analyzer = ANALYZERS.get(key)
+    if analyzer is None:
+        raise HTTPException(404, f"ferramenta desconhecida: {key} (disponíveis: {', '.join(ANALYZERS)})")
+
+    files = await read_files(request)
+    session = request.client.host if request.client else None
+
+    if stream or NDJSON in request.headers.get("accept", ""):
+        return StreamingResponse(_ndjson(analyzer, files, session), media_type=NDJSON)
+
+    # A avaliação bloqueia; roda fora do loop de eventos
+    report = await run_in_threadpool(evaluate_batch, files, analyzer.analyze,
+                                     score=analyzer.score, session=session)
+    return JSONResponse({
+        "evaluator": analyzer.key,
+        **report_summary(report),
+        "files": [analyzer.serialize(result) for result in report.results],
+    })
@@ -0,0 +1,89 @@
+import os
+import gradio as gr
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from registry import ANALYZERS, CORE_MODULES
+from api import router as api_router
+from batch import BatchReport, stream_batch
+from scheduler import scheduler
+from parsing import prefetch_files
+from uploads import TempDirJanitor, java_file_input
+from workers import start_worker_pool
+
+def describe_progress(analyzer, report: BatchReport) -> str:
+    """Resumo do lote quando concluído; progresso e estado da fila enquanto avalia"""
+    if report.complete:
+        return f"{analyzer.title}\n{report.summary()}"
+    return (f"{analyzer.title}: avaliados {len(report.results)} de {report.total} arquivos...\n"
+            f"{scheduler.stats().describe()}")
+
+def run_analyzer(analyzer, files, prefetched=None, session=None):
+    """Avalia o lote com uma ferramenta, gerando (valor da aba, progresso) a cada resultado"""
+    for report in stream_batch(files, analyzer.analyze, prefetched, score=analyzer.score, session=session):
+        yield analyzer.render(report), describe_progress(analyzer, report)
+
+def make_handler(analyzer):
+    def evaluate(files, prefetched, request: gr.Request):
+        yield from run_analyzer(analyzer, files, prefetched, getattr(request, "session_hash", None))
+    evaluate.__name__ = f"evaluate_{analyzer.key}"
+    return evaluate
+
+def evaluate_all(files, prefetched, request: gr.Request):
+    """Avalia o mesmo upload com todas as ferramentas; o parsing é feito uma única vez"""
+    session = getattr(request, "session_hash", None)
+    values = [[] if analyzer.table else "" for analyzer in ANALYZERS.values()]
+    summaries = []
+
+    for position, analyzer in enumerate(ANALYZERS.values()):
+        for values[position], progress in run_analyzer(analyzer, files, prefetched, session):
+            yield (*values, "\n\n".join(summaries + [progress]))
+        summaries.append(progress)
+
+# Interface Gradio
+with gr.Blocks(title="Java-Judge Suite") as demo:
+    gr.Markdown("# Java-Judge Suite: Inspeção e Avaliação de Código Java")
+    gr.HTML("""
+    <p>Java-Inspector, Java-Judge POO e Java-Judge Sintaxe e Competências em um único serviço</p>
+    <p>Ramon Mayor Martins: <a href="https://rmayormartins.github.io/" target="_blank">Website</a> |
+    <a href="https://huggingface.co/rmayormartins" target="_blank">Spaces</a></p>
+    """)
+
+    upload = java_file_input(label="Carregue arquivos Java para avaliação", file_types=[".java"], file_count="multiple")
+    evaluate_all_button = gr.Button("Avaliar com todas as ferramentas")
+    progress_output = gr.Textbox(label="Resumo dos Lotes", lines=8)
+    # Leitura e parsing iniciados no upload e compartilhados por todas as ferramentas
+    prefetched = gr.State({})
+
+    outputs = []
+    for analyzer in ANALYZERS.values():
+        with gr.Tab(analyzer.title):
+            button = gr.Button("Avaliar")
+            if analyzer.table:
+                output = gr.Dataframe(label="Resultados", headers=analyzer.headers)
+            else:
+                output = gr.Textbox(label="Resultado da Avaliação", lines=25)
+            outputs.append(output)
+            # Cada ferramenta também fica exposta como endpoint da API (/api/<chave>)
+            button.click(fn=make_handler(analyzer), inputs=[upload, prefetched],
+                         outputs=[output, progress_output], api_name=analyzer.key)
+
+    upload.change(fn=prefetch_files, inputs=upload, outputs=prefetched)
+    evaluate_all_button.click(fn=evaluate_all, inputs=[upload, prefetched],
+                              outputs=outputs + [progress_output], api_name="all")
+
+def create_app() -> FastAPI:
+    """Aplicação com a API JSON (/grade/...) e a interface Gradio montada na raiz"""
+    app = FastAPI(title="Java-Judge Suite")
+    # Respostas comprimidas para clientes que enviam Accept-Encoding: gzip
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    app.include_router(api_router)
+    return gr.mount_gradio_app(app, demo.queue(), path="/")
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Workers criados antes das threads do servidor, a partir do processo já carregado
+    start_worker_pool(preload=CORE_MODULES)
+    TempDirJanitor().start()
+    uvicorn.run(create_app(), host=os.environ.get("GRADIO_SERVER_NAME", "0.0.0.0"),
+                port=int(os.environ.get("GRADIO_SERVER_PORT", 7860)))
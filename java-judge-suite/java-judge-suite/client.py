@@ -0,0 +1,103 @@
+"""Cliente Python da API JSON de avaliação em lote (somente biblioteca padrão).
+
+Exemplo:
+    from client import GradingClient
+
+    client = GradingClient("http://localhost:7860")
+    report = client.grade("oo", ["Main.java", "Animal.java"])
+    for result in client.grade_stream("oo", ["entregas.zip"]):
+        print(result)
+"""
+import gzip
+import json
+import os
+import urllib.error
+import urllib.request
+from typing import Dict, Iterator, List, Sequence
+
+
+class GradingError(Exception):
+    """Resposta de erro da API, com o status HTTP e a mensagem do servidor"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class GradingClient:
+    def __init__(self, url: str, timeout: float = 300, compress: bool = True):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.compress = compress
+
+    def _body(self, paths: Sequence[str]):
+        """Um .zip é enviado como está; arquivos .java seguem no corpo JSON"""
+        if len(paths) == 1 and paths[0].endswith(".zip"):
+            with open(paths[0], "rb") as f:
+                return f.read(), "application/zip"
+
+        files = []
+        for path in paths:
+            with open(path, "rb") as f:
+                source = f.read().decode("utf-8", errors="replace")
+            files.append({"name": os.path.basename(path), "source": source})
+        return json.dumps({"files": files}).encode("utf-8"), "application/json"
+
+    def _request(self, key: str, paths: Sequence[str], stream: bool):
+        body, content_type = self._body(paths)
+        headers = {"Content-Type": content_type, "Accept-Encoding": "gzip"}
+        if self.compress:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        if stream:
+            headers["Accept"] = "application/x-ndjson"
+
+        request = urllib.request.Request(f"{self.url}/grade/{key}", data=body, headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            detail = e.read().decode("utf-8", errors="replace")
+            try:
+                detail = json.loads(detail).get("detail", detail)
+            except ValueError:
+                pass
+            raise GradingError(e.code, detail) from None
+
+        if response.headers.get("Content-Encoding") == "gzip":
+            return gzip.GzipFile(fileobj=response)
+        return response
+
+    def grade(self, key: str, paths: Sequence[str]) -> Dict:
+        """Avalia os arquivos e devolve o relatório completo do lote"""
+        with self._request(key, paths, stream=False) as response:
+            return json.loads(response.read())
+
+    def grade_stream(self, key: str, paths: Sequence[str]) -> Iterator[Dict]:
+        """Gera o resultado de cada arquivo assim que fica pronto; o último item traz o resumo em "batch" """
+        with self._request(key, paths, stream=True) as response:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def main(argv: List[str] = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Avalia arquivos Java pela API do Java-Judge Suite")
+    parser.add_argument("url")
+    parser.add_argument("evaluator", help="inspector, oo, structural ou competency")
+    parser.add_argument("paths", nargs="+", help="arquivos .java ou um .zip")
+    parser.add_argument("--stream", action="store_true", help="imprime um resultado NDJSON por linha")
+    args = parser.parse_args(argv)
+
+    client = GradingClient(args.url)
+    if args.stream:
+        for result in client.grade_stream(args.evaluator, args.paths):
+            print(json.dumps(result, ensure_ascii=False))
+    else:
+        print(json.dumps(client.grade(args.evaluator, args.paths), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Modo co-processo: avaliação contínua por NDJSON em stdin/stdout.
+
+Para autograders que hoje disparam um processo por entrega. O processo fica de pé,
+com avaliadores, cache de parsing e workers já carregados, e atende várias requisições
+ao mesmo tempo; as respostas saem na ordem em que terminam, identificadas por "id".
+
+Requisição (uma por linha):
+    {"id": 1, "evaluator": "oo", "name": "Main.java", "source": "...", "rubric": ["methods"]}
+
+"evaluator" é uma das ferramentas do registry (padrão "oo"); "rubric", opcional, limita
+os critérios avaliados: só eles são calculados, devolvidos e somados em "total_score".
+"scaffold", opcional ("oo" e "inspector"), é o código inicial da tarefa: registrado na
+primeira requisição que o traz, é descontado da entrega (só conta o que o aluno escreveu).
+"references", opcional ("oo"), é a lista de soluções de referência do professor: registradas
+uma vez, acrescentam o critério "reference_similarity". "discount_clones", opcional
+("inspector" e "structural"), conta uma vez só as estruturas copiadas e coladas na própria
+entrega; os trechos duplicados voltam em "clones". Resposta (uma por linha): o
+resultado do arquivo no mesmo formato da API JSON, com "id" e "evaluator", ou
+{"id": ..., "error": "..."}.
+
+Uso:
+    python coprocess.py [--workers 8]
+"""
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, TextIO
+
+from registry import ANALYZERS
+from batch import evaluate_batch
+from uploads import UploadedFile
+
+# Requisições avaliadas ao mesmo tempo
+COPROCESS_WORKERS = 8
+DEFAULT_EVALUATOR = "oo"
+SESSION = "coprocess"
+
+
+class CoProcess:
+    def __init__(self, output: TextIO, workers: int = COPROCESS_WORKERS):
+        self.output = output
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coprocess")
+        self._write_lock = threading.Lock()
+
+    def write(self, message: Dict[str, Any]):
+        line = json.dumps(message, ensure_ascii=False)
+        with self._write_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def grade(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Avalia uma requisição e devolve a resposta"""
+        key = request.get("evaluator") or DEFAULT_EVALUATOR
+        analyzer = ANALYZERS.get(key)
+        if analyzer is None:
+            raise ValueError(f"ferramenta desconhecida: {key} (disponíveis: {', '.join(ANALYZERS)})")
+        source = request["source"]
+        if not isinstance(source, str):
+            raise ValueError('"source" deve ser uma string')
+
+        upload = UploadedFile(source.encode("utf-8"), request.get("name") or "arquivo.java")
+        references = request.get("references")
+        if references is not None and not (isinstance(references, list)
+                                           and all(isinstance(code, str) for code in references)):
+            raise ValueError('"references" deve ser uma lista de strings')
+        analyze, score = analyzer.restricted(request.get("rubric") or None, request.get("scaffold"), references,
+                                             bool(request.get("discount_clones")))
+        report = evaluate_batch([upload], analyze, score=score, session=SESSION)
+        result = analyzer.serialize(report.results[0])
+        return {"id": request.get("id"), "evaluator": key, **result}
+
+    def _handle(self, request: Dict[str, Any]):
+        try:
+            response = self.grade(request)
+        except Exception as e:
+            response = {"id": request.get("id"), "error": f"{type(e).__name__}: {e}"}
+        self.write(response)
+
+    def serve(self, lines):
+        """Lê requisições até o fim da entrada e espera as que ainda estão em andamento"""
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a requisição deve ser um objeto JSON")
+            except ValueError as e:
+                self.write({"id": None, "error": f"requisição inválida: {e}"})
+                continue
+            self._executor.submit(self._handle, request)
+        self._executor.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Avaliação contínua por NDJSON em stdin/stdout")
+    parser.add_argument("--workers", type=int, default=COPROCESS_WORKERS)
+    args = parser.parse_args(argv)
+
+    # stdout fica reservado ao protocolo; mensagens de diagnóstico dos avaliadores vão para stderr
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+    CoProcess(protocol, args.workers).serve(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import os
+import sys
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Os núcleos de cada ferramenta vêm dos diretórios dos espaços neste repositório; os
+# módulos compartilhados (batch, parsing, ...) são idênticos e carregados uma única vez
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SPACES = (
+    ("java-judge-oo", "java-judge-oo"),
+    ("java-judge-syntax-competencies", "java-judge-syntax-competencies"),
+    ("java-inspector", "java-inspector"),
+)
+for space in SPACES:
+    path = os.path.join(ROOT, *space)
+    if path not in sys.path:
+        sys.path.append(path)
+
+import inspector  # noqa: E402
+import judge_oo  # noqa: E402
+import judge_syntax  # noqa: E402
+from batch import STAGES, BatchReport, FileResult  # noqa: E402
+
+
+@dataclass(frozen=True)
+class Analyzer:
+    """Ferramenta registrada no serviço: função de análise, pontuação opcional e formatação"""
+    key: str
+    title: str
+    analyze: Callable[[str], Any]
+    score: Optional[Callable[[Any], Any]]
+    format_file: Optional[Callable[[FileResult], str]] = None
+    # Analisadores tabulares exibem as linhas de rows com estas colunas
+    rows: Optional[Callable[[List[FileResult]], List[List]]] = None
+    headers: Optional[List[str]] = None
+    # Rubrica com nome e peso de cada critério, usada nas respostas da API
+    rubric: Optional[Mapping] = None
+    # Se analyze aceita scaffold, o código inicial a descontar (ver scaffold.py)
+    scaffolding: bool = False
+    # Se analyze aceita references, as soluções de referência a comparar (ver similarity.py)
+    referencing: bool = False
+    # Se analyze aceita discount_clones, que conta uma vez só o que foi copiado e colado (ver clones.py)
+    deduplicating: bool = False
+
+    @property
+    def table(self) -> bool:
+        return self.rows is not None
+
+    def restricted(self, criteria: Optional[Iterable[str]] = None, scaffold: Optional[str] = None,
+                   references: Optional[Sequence[str]] = None, discount_clones: bool = False
+                   ) -> Tuple[Callable[[str], Any], Optional[Callable[[Any], Any]]]:
+        """analyze e score que avaliam só os critérios da rubrica em criteria, descontando scaffold
+        (e, com discount_clones, os trechos copiados e colados) e comparando com as soluções em
+        references
+
+        Critérios desconhecidos são ignorados; as features que só os outros critérios usam
+        não chegam a ser calculadas.
+        """
+        analyze, score = self.analyze, self.score
+        if criteria is not None and self.rubric is not None:
+            chosen = set(criteria)
+            selected = [key for key in self.rubric if key in chosen]
+            analyze = partial(analyze, criteria=selected)
+            score = partial(score, criteria=selected) if score is not None else None
+        if scaffold:
+            if not self.scaffolding:
+                raise ValueError(f"{self.title} não desconta código inicial")
+            analyze = partial(analyze, scaffold=scaffold)
+        if references:
+            if not self.referencing:
+                raise ValueError(f"{self.title} não compara com soluções de referência")
+            analyze = partial(analyze, references=tuple(references))
+        if discount_clones:
+            if not self.deduplicating:
+                raise ValueError(f"{self.title} não desconta código duplicado")
+            analyze = partial(analyze, discount_clones=True)
+        return analyze, score
+
+    def render(self, report: BatchReport):
+        """Valor exibido na aba: linhas da tabela ou texto com um bloco por arquivo"""
+        if self.table:
+            return self.rows(report.results)
+        return "\n".join(self.format_file(result) for result in report.results)
+
+    def serialize(self, result: FileResult) -> Dict[str, Any]:
+        """Resultado de um arquivo em formato JSON: notas, níveis, feedback e tempos por critério"""
+        data = {
+            "name": result.name,
+            "index": result.index,
+            "encoding": result.encoding,
+            "ok": result.ok,
+            "elapsed": result.elapsed,
+            "waited": result.waited,
+            "errors": [{"stage": error.stage, "stage_label": STAGES[error.stage], "message": error.message}
+                       for error in result.errors],
+        }
+        evaluation = result.evaluation
+        if evaluation is None:
+            return data
+        if self.rubric is None:
+            # Ferramentas sem rubrica devolvem apenas as contagens
+            data["metrics"] = dict(evaluation)
+            return data
+
+        summary = evaluation["summary"]
+        data["total_score"] = summary["total_score"]
+        data["proficiency"] = summary["proficiency"]
+        data["criteria"] = {}
+        for key, criterion in self.rubric.items():
+            if key not in evaluation["scores"]:
+                # Critério fora da seleção da requisição
+                continue
+            feedback = evaluation["feedback"][key]
+            data["criteria"][key] = {
+                "name": criterion.name,
+                "score": evaluation["scores"][key],
+                "max_score": criterion.weight,
+                "level": evaluation["levels"][key],
+                "feedback": [feedback] if isinstance(feedback, str) and feedback else list(feedback or []),
+                "elapsed": evaluation.get("timings", {}).get(key, 0.0),
+            }
+        if "clones" in evaluation:
+            data["clones"] = list(evaluation["clones"])
+        return data
+
+
+def report_summary(report: BatchReport) -> Dict[str, Any]:
+    """Totais do lote em formato JSON"""
+    return {
+        "total": report.total,
+        "processed": len(report.results),
+        "failed": sum(not result.ok for result in report.results),
+        "elapsed": report.elapsed,
+        "summary": report.summary(),
+    }
+
+
+ANALYZERS: Dict[str, Analyzer] = {
+    analyzer.key: analyzer for analyzer in (
+        Analyzer("inspector", "Java-Inspector: Sintaxe e OO",
+                 inspector.analyzer.analyze, None,
+                 rows=inspector.table_rows, headers=inspector.HEADERS, scaffolding=True,
+                 deduplicating=True),
+        Analyzer("oo", "Java-Judge: POO",
+                 judge_oo.evaluator.analyze_code, judge_oo.evaluator.score_analysis,
+                 judge_oo.format_file_result, rubric=judge_oo.evaluator.all_criteria, scaffolding=True,
+                 referencing=True),
+        Analyzer("structural", "Java-Judge: Sintaxe",
+                 judge_syntax.EVALUATORS["structural"].evaluate_code, None,
+                 judge_syntax.format_file_result, rubric=judge_syntax.EVALUATORS["structural"].rubric,
+                 deduplicating=True),
+        Analyzer("competency", "Java-Judge: Competências",
+                 judge_syntax.EVALUATORS["competency"].evaluate_code, None,
+                 judge_syntax.format_file_result, rubric=judge_syntax.EVALUATORS["competency"].rubric),
+    )
+}
+
+# Módulos pré-carregados pelo pool de workers
+CORE_MODULES = ["inspector", "judge_oo", "judge_syntax"]
@@ -0,0 +1,506 @@
+import bisect
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from parsing import load_source, parse_cache
+from scheduler import MAX_FILES_PER_REQUEST, ScheduledTask, prescan, scheduler
+from uploads import read_upload
+from workers import get_process_pool
+
+# Tempo máximo para avaliar um único arquivo
+FILE_TIMEOUT = 30  # segundos
+# Folga da espera no escalonador sobre o limite aplicado no worker
+TIMEOUT_GRACE = 5  # segundos
+# Quantos arquivos mais lentos aparecem no resumo
+SLOWEST_SHOWN = 3
+# A partir de quantos arquivos o lote passa pelo pipeline em estágios
+PIPELINE_MIN_FILES = 8
+# Threads de leitura e capacidade das filas entre os estágios
+READER_THREADS = 2
+QUEUE_SIZE = 16
+# Intervalo mínimo entre atualizações parciais enviadas à interface
+STREAM_INTERVAL = 0.25  # segundos
+# Bytes por token, para estimar o custo de arquivos que ainda não estão em memória
+BYTES_PER_TOKEN = 4
+
+# Aproximação barata dos tokens Java: identificadores/números ou um símbolo
+TOKEN_PATTERN = re.compile(rb"[A-Za-z0-9_$]+|[^\sA-Za-z0-9_$]")
+
+# Etapas em que um arquivo pode falhar
+STAGES = {
+    "decode": "leitura",
+    "parse": "sintaxe",
+    "timeout": "tempo esgotado",
+    "internal": "erro interno",
+    "rejected": "recusado na admissão",
+}
+
+@dataclass
+class FileError:
+    name: str
+    stage: str
+    message: str
+
+
+@dataclass
+class FileResult:
+    name: str
+    index: int = 0
+    encoding: str = ""
+    evaluation: Any = None
+    errors: List[FileError] = field(default_factory=list)
+    elapsed: float = 0.0
+    waited: float = 0.0
+    provisional: bool = False  # prévia só pelos tokens, substituída pela avaliação completa
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class Job:
+    index: int
+    file: Any
+    cost: int = 0
+    deferred: bool = False
+
+
+@dataclass
+class BatchReport:
+    results: List[FileResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    total: int = 0
+    previews: Dict[int, FileResult] = field(default_factory=dict)  # por FileResult.index
+
+    @property
+    def complete(self) -> bool:
+        return len(self.results) >= self.total
+
+    @property
+    def errors(self) -> List[FileError]:
+        return [error for result in self.results for error in result.errors]
+
+    def current(self) -> List[FileResult]:
+        """Resultados na ordem do upload; os arquivos ainda em avaliação aparecem pela prévia"""
+        finished = {result.index for result in self.results}
+        waiting = [preview for index, preview in self.previews.items() if index not in finished]
+        return sorted(self.results + waiting, key=lambda result: result.index)
+
+    def summary(self) -> str:
+        """Resumo do lote: contagens, falhas e arquivos mais lentos"""
+        failed = [result for result in self.results if not result.ok]
+        by_stage = Counter(error.stage for error in self.errors)
+
+        lines = [f"Arquivos processados: {len(self.results)} | "
+                 f"Sem falhas: {len(self.results) - len(failed)} | "
+                 f"Com falhas: {len(failed)} | "
+                 f"Tempo total: {self.elapsed:.2f}s"]
+        if self.results:
+            waits = [result.waited for result in self.results]
+            lines.append(f"Espera na fila: média {sum(waits) / len(waits):.2f}s, máxima {max(waits):.2f}s")
+
+        if by_stage:
+            lines.append("Falhas por etapa: " + ", ".join(
+                f"{STAGES[stage]}: {count}" for stage, count in by_stage.items()))
+            lines.append("Arquivos com falhas:")
+            for error in self.errors:
+                lines.append(f"  - {error.name} [{STAGES[error.stage]}]: {error.message}")
+
+        slowest = sorted(self.results, key=lambda result: result.elapsed, reverse=True)[:SLOWEST_SHOWN]
+        if slowest:
+            lines.append("Arquivos mais lentos:")
+            for result in slowest:
+                lines.append(f"  - {result.name}: {result.elapsed:.2f}s")
+
+        return "\n".join(lines)
+
+
+def describe_error(error: Exception) -> str:
+    """Mensagem legível para exceções do javalang e demais erros"""
+    message = getattr(error, "description", None) or str(error) or type(error).__name__
+    position = getattr(getattr(error, "at", None), "position", None)
+    if position:
+        message += f" (linha {position[0]}, coluna {position[1]})"
+    return message
+
+
+def analyze_source(analyze: Callable[[str], Any], code: str) -> Tuple[Any, Optional[str]]:
+    """Etapa de parsing e análise; retorna a análise e o erro de sintaxe, se houver
+
+    O parsing é o que a própria análise fizer: métricas que não dependem da árvore não
+    pagam por ele, e o erro só é reportado se ela chegou a fazê-lo (ou se o código já
+    estava no cache, como no pré-processamento do upload).
+    """
+    analysis = analyze(code)
+    error = parse_cache.error(code)
+    return analysis, describe_error(error) if error else None
+
+
+def _load_file(result: FileResult, file, prefetched: Optional[Dict]) -> Optional[str]:
+    try:
+        source = load_source(file, prefetched)
+    except Exception as e:
+        result.errors.append(FileError(result.name, "decode", describe_error(e)))
+        return None
+    result.name = source.name
+    result.encoding = source.encoding
+    return source.code
+
+
+def _preview_file(job: Job, preview: Callable[[str], Any], prefetched: Optional[Dict]) -> Optional[FileResult]:
+    """Resultado provisório de um arquivo; None se ele não pôde ser lido ou a prévia falhou"""
+    result = FileResult(name=getattr(job.file, "name", str(job.file)), index=job.index, provisional=True)
+    code = _load_file(result, job.file, prefetched)
+    if code is None:
+        return None
+    try:
+        result.evaluation = preview(code)
+    except Exception:
+        # A prévia é opcional; o arquivo fica só com a avaliação completa
+        return None
+    return result
+
+
+def _run_analysis(analyze: Callable[[str], Any], code: str, in_process: bool, timeout: float):
+    if in_process:
+        return analyze_source(analyze, code)
+    # O limite é aplicado aqui, onde a análise roda: um worker travado só é liberado
+    # matando o processo, e a thread do escalonador volta a atender a fila
+    pool = get_process_pool()
+    for attempt in range(2):
+        future = pool.submit(analyze_source, analyze, code)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            pool.discard(future)
+            raise
+        except BrokenProcessPool:
+            # Executor encerrado pelo tempo esgotado de outra tarefa: tenta uma vez em outro
+            if attempt:
+                raise
+
+
+def _wait_analysis(result: FileResult, task: ScheduledTask, timeout: float):
+    # O limite de tempo vale para a execução, não para a espera na fila
+    task.started.wait()
+    result.waited = task.wait
+    try:
+        # Análises no processo (árvore já no cache) não podem ser interrompidas: a espera
+        # com folga só libera quem aguarda o resultado
+        analysis, parse_error = task.future.result(timeout=timeout + TIMEOUT_GRACE)
+    except FutureTimeout:
+        result.errors.append(FileError(result.name, "timeout", f"avaliação excedeu {timeout:g}s"))
+        return None
+    except Exception as e:
+        result.errors.append(FileError(result.name, "internal", describe_error(e)))
+        return None
+    if parse_error:
+        result.errors.append(FileError(result.name, "parse", parse_error))
+    return analysis
+
+
+def _score(result: FileResult, analysis, score: Optional[Callable]):
+    try:
+        result.evaluation = score(analysis) if score else analysis
+    except Exception as e:
+        result.errors.append(FileError(result.name, "internal", describe_error(e)))
+
+
+def evaluate_file(file, analyze: Callable[[str], Any], prefetched: Optional[Dict] = None,
+                  timeout: float = FILE_TIMEOUT, score: Optional[Callable] = None,
+                  session: Optional[str] = None, deferred: bool = False) -> FileResult:
+    """Avalia um arquivo isolando as falhas de cada etapa"""
+    start = time.perf_counter()
+    result = FileResult(name=getattr(file, "name", str(file)))
+
+    code = _load_file(result, file, prefetched)
+    if code is not None:
+        task = scheduler.submit(session, _run_analysis, analyze, code, parse_cache.contains(code), timeout,
+                                deferred=deferred)
+        analysis = _wait_analysis(result, task, timeout)
+        if analysis is not None:
+            _score(result, analysis, score)
+
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def estimate_cost(file) -> int:
+    """Custo estimado de avaliar um arquivo, em tokens aproximados"""
+    if isinstance(file, (bytes, bytearray)):
+        return len(TOKEN_PATTERN.findall(file))
+    try:
+        return os.path.getsize(getattr(file, "name", file)) // BYTES_PER_TOKEN
+    except (OSError, TypeError):
+        return 0
+
+
+def shortest_first(jobs: List[Job]) -> List[Job]:
+    """Ordena os arquivos pelo custo estimado, menores primeiro"""
+    return sorted(jobs, key=lambda job: (job.cost, job.index))
+
+
+def admit(files: List) -> Tuple[List[Job], List[FileResult]]:
+    """Pré-triagem barata (quantidade, bytes e linhas) feita antes de qualquer parsing"""
+    jobs, rejected = [], []
+
+    for index, file in enumerate(files):
+        result = FileResult(name=getattr(file, "name", str(file)), index=index)
+        try:
+            upload = read_upload(file)
+        except Exception as e:
+            result.errors.append(FileError(result.name, "decode", describe_error(e)))
+            rejected.append(result)
+            continue
+
+        result.name = upload.name
+        if index >= MAX_FILES_PER_REQUEST:
+            admission_reason = f"lote excede o limite de {MAX_FILES_PER_REQUEST} arquivos por envio"
+        else:
+            admission = prescan(upload)
+            admission_reason = admission.reason
+            if admission.accepted:
+                jobs.append(Job(index, upload, estimate_cost(upload), admission.deferred))
+                continue
+
+        result.errors.append(FileError(result.name, "rejected", admission_reason))
+        rejected.append(result)
+
+    return jobs, rejected
+
+
+# Marca de fim de fila entre os estágios
+_DONE = object()
+
+
+class _PipelineRun:
+    """Estado de uma execução do pipeline: filas limitadas entre estágios e sinal de cancelamento"""
+
+    def __init__(self, pipeline: "GradingPipeline", jobs: List[Job], prefetched: Optional[Dict],
+                 session: Optional[str]):
+        self.pipeline = pipeline
+        self.prefetched = prefetched
+        self.session = session
+        self.cancelled = threading.Event()
+        self.pending = queue.Queue()
+        for job in jobs:
+            self.pending.put(job)
+        size = pipeline.queue_size
+        self.analyze_queue = queue.Queue(size)
+        self.score_queue = queue.Queue(size)
+        self.output_queue = queue.Queue(size)
+
+    def put(self, target: queue.Queue, item) -> bool:
+        # Bloqueia enquanto o próximo estágio estiver cheio (backpressure)
+        while not self.cancelled.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, source: queue.Queue):
+        while not self.cancelled.is_set():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def read(self):
+        while not self.cancelled.is_set():
+            try:
+                job = self.pending.get_nowait()
+            except queue.Empty:
+                return
+            result = FileResult(name=getattr(job.file, "name", str(job.file)), index=job.index)
+            started = time.perf_counter()
+            code = _load_file(result, job.file, self.prefetched)
+            if not self.put(self.analyze_queue, (result, started, code, job.deferred)):
+                return
+
+    def analyze(self):
+        pipeline = self.pipeline
+        while True:
+            item = self.get(self.analyze_queue)
+            if item is _DONE:
+                return
+            result, started, code, deferred = item
+            analysis = None
+            if code is not None:
+                # Árvores já prontas no cache (pré-processamento do upload) são analisadas aqui mesmo
+                in_process = parse_cache.contains(code)
+                task = scheduler.submit(self.session, _run_analysis, pipeline.analyze, code, in_process,
+                                        pipeline.timeout, deferred=deferred)
+                analysis = _wait_analysis(result, task, pipeline.timeout)
+            if not self.put(self.score_queue, (result, started, analysis)):
+                return
+
+    def score(self):
+        while True:
+            item = self.get(self.score_queue)
+            if item is _DONE:
+                break
+            result, started, analysis = item
+            if analysis is not None:
+                _score(result, analysis, self.pipeline.score)
+            result.elapsed = time.perf_counter() - started
+            if not self.put(self.output_queue, result):
+                return
+        self.put(self.output_queue, _DONE)
+
+    def start(self):
+        readers = [threading.Thread(target=self.read, daemon=True)
+                   for _ in range(self.pipeline.readers)]
+        analyzers = [threading.Thread(target=self.analyze, daemon=True)
+                     for _ in range(self.pipeline.workers)]
+        scorer = threading.Thread(target=self.score, daemon=True)
+
+        def close_stage(threads, target, count):
+            for thread in threads:
+                thread.join()
+            for _ in range(count):
+                self.put(target, _DONE)
+
+        for thread in readers + analyzers + [scorer]:
+            thread.start()
+        threading.Thread(target=close_stage, args=(readers, self.analyze_queue, len(analyzers)),
+                         daemon=True).start()
+        threading.Thread(target=close_stage, args=(analyzers, self.score_queue, 1),
+                         daemon=True).start()
+
+
+class GradingPipeline:
+    """Pipeline em estágios: leitura (threads) → parsing/análise (processos) → pontuação → escrita
+
+    Os estágios são ligados por filas limitadas, então leitura, parsing e pontuação
+    se sobrepõem e a memória ocupada não cresce com o tamanho do lote.
+    """
+
+    def __init__(self, analyze: Callable[[str], Any], score: Optional[Callable] = None,
+                 readers: int = READER_THREADS, workers: Optional[int] = None,
+                 queue_size: int = QUEUE_SIZE, timeout: float = FILE_TIMEOUT):
+        self.analyze = analyze
+        self.score = score
+        self.readers = readers
+        self.workers = workers or os.cpu_count() or 2
+        self.queue_size = queue_size
+        self.timeout = timeout
+
+    def run(self, jobs: List[Job], prefetched: Optional[Dict] = None,
+            session: Optional[str] = None) -> Iterator[FileResult]:
+        """Gera os resultados à medida que cada arquivo sai do estágio de pontuação
+
+        Os arquivos entram no pipeline do menor para o maior custo estimado; a posição
+        original de cada um fica em FileResult.index.
+        """
+        run = _PipelineRun(self, shortest_first(jobs), prefetched, session)
+        run.start()
+        try:
+            while True:
+                result = run.output_queue.get()
+                if result is _DONE:
+                    return
+                yield result
+        finally:
+            run.cancelled.set()
+
+
+def _sequential_results(jobs: List[Job], analyze, prefetched, timeout, score, session) -> Iterator[FileResult]:
+    for job in shortest_first(jobs):
+        result = evaluate_file(job.file, analyze, prefetched, timeout, score, session, job.deferred)
+        result.index = job.index
+        yield result
+
+
+def stream_batch(files, analyze: Callable[[str], Any], prefetched: Optional[Dict] = None,
+                 timeout: float = FILE_TIMEOUT, score: Optional[Callable] = None,
+                 session: Optional[str] = None, interval: float = STREAM_INTERVAL,
+                 preview: Optional[Callable[[str], Any]] = None) -> Iterator[BatchReport]:
+    """Avalia o lote gerando relatórios parciais à medida que os arquivos terminam
+
+    Arquivos menores são avaliados primeiro, então os primeiros resultados não esperam
+    pelos maiores; em cada relatório os resultados ficam na ordem do upload. As tarefas
+    da sessão disputam os workers de forma justa com as das demais sessões.
+
+    Com preview (avaliação só pelos tokens, sem parsing), o primeiro relatório já traz
+    um resultado provisório de cada arquivo em report.previews, calculado enquanto a
+    avaliação completa roda; report.current() troca cada um pelo completo quando ele chega.
+    """
+    start = time.perf_counter()
+    files = list(files or [])
+    report = BatchReport(total=len(files))
+
+    jobs, rejected = admit(files)
+    for result in rejected:
+        bisect.insort(report.results, result, key=lambda item: item.index)
+
+    if len(jobs) >= PIPELINE_MIN_FILES:
+        results = GradingPipeline(analyze, score, timeout=timeout).run(jobs, prefetched, session)
+    else:
+        results = _sequential_results(jobs, analyze, prefetched, timeout, score, session)
+
+    # Os resultados chegam por uma fila para que as atualizações saiam no intervalo certo
+    # mesmo enquanto um arquivo grande ainda está em avaliação
+    arrivals = queue.Queue()
+
+    def feed():
+        try:
+            for result in results:
+                arrivals.put(result)
+        finally:
+            arrivals.put(_DONE)
+
+    threading.Thread(target=feed, daemon=True).start()
+
+    last_update = -interval
+    if preview is not None:
+        for job in shortest_first(jobs):
+            result = _preview_file(job, preview, prefetched)
+            if result is not None:
+                report.previews[job.index] = result
+        if report.previews:
+            report.elapsed = last_update = time.perf_counter() - start
+            yield report
+    pending_update = False
+    while True:
+        timeout = None
+        if pending_update:
+            timeout = max(0.0, last_update + interval - (time.perf_counter() - start))
+        try:
+            result = arrivals.get(timeout=timeout)
+        except queue.Empty:
+            result = None
+        if result is _DONE:
+            break
+        if result is not None:
+            bisect.insort(report.results, result, key=lambda item: item.index)
+            pending_update = True
+
+        report.elapsed = time.perf_counter() - start
+        if pending_update and not report.complete and report.elapsed - last_update >= interval:
+            last_update = report.elapsed
+            pending_update = False
+            yield report
+
+    report.elapsed = time.perf_counter() - start
+    yield report
+
+
+def evaluate_batch(files, analyze: Callable[[str], Any], prefetched: Optional[Dict] = None,
+                   timeout: float = FILE_TIMEOUT, score: Optional[Callable] = None,
+                   session: Optional[str] = None) -> BatchReport:
+    """Avalia todos os arquivos; uma falha em um arquivo não interrompe os demais"""
+    for report in stream_batch(files, analyze, prefetched, timeout, score, session):
+        pass
+    return report
@@ -0,0 +1,153 @@
+"""Parsing em paralelo de arquivos Java grandes, dividido nas declarações de tipo de nível superior.
+
+Um varredor barato (atento a chaves, parênteses, strings, text blocks, caracteres e
+comentários) encontra o fim de cada tipo de nível superior. Os trechos são analisados
+em paralelo e as árvores juntadas em uma única CompilationUnit, idêntica à do parsing do
+arquivo inteiro: cada trecho começa no início de uma linha e é precedido pelo mesmo
+número de quebras de linha, então as posições dos nós não mudam.
+
+Em qualquer caso duvidoso (código desbalanceado, escapes \\uXXXX, erro de sintaxe em um
+trecho) o arquivo inteiro é analisado de uma vez, e o resultado e a mensagem de erro
+são os mesmos de sempre.
+"""
+import re
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple
+
+# Tamanho mínimo do código para dividir o parsing
+CHUNK_MIN_CHARS = 64 * 1024
+
+# Literais e comentários inteiros (ignorados), símbolos de estrutura e, por último, aberturas
+# de literal ou comentário que não terminam
+_SCAN = re.compile(r'''
+    """(?:\\.|[^\\])*?"""
+  | "(?:\\.|[^"\\\n])*"
+  | '(?:\\.|[^'\\\n])*'
+  | //[^\n]*
+  | /\*.*?\*/
+  | (?P<symbol>[{}();])
+  | (?P<open>["']|/\*)
+''', re.DOTALL | re.VERBOSE)
+# Resto da linha depois do fechamento de um tipo: só espaços ou um comentário de linha
+_LINE_END = re.compile(r"[ \t\f\r]*(?://[^\n]*)?\n")
+
+
+@dataclass
+class Chunk:
+    text: str
+    line: int  # linha (contada a partir de 0) em que o trecho começa
+
+
+class UnbalancedCode(ValueError):
+    pass
+
+
+def scan_structure(code: str) -> Iterator[Tuple[str, int, int, int]]:
+    """Gera (símbolo, posição após o símbolo, chaves abertas, parênteses abertos)
+
+    Considera só { } ( ) e ; fora de strings, text blocks, caracteres e comentários.
+    Levanta UnbalancedCode se um literal ou comentário não termina ou se um fechamento
+    não tem abertura correspondente.
+    """
+    braces = parens = 0
+    for match in _SCAN.finditer(code):
+        token = match.group("symbol")
+        if token is None:
+            if match.group("open"):
+                raise UnbalancedCode("literal ou comentário não terminado")
+            continue
+        if token == "{":
+            braces += 1
+        elif token == "}":
+            braces -= 1
+        elif token == "(":
+            parens += 1
+        elif token == ")":
+            parens -= 1
+        if braces < 0 or parens < 0:
+            raise UnbalancedCode(f"'{token}' sem abertura correspondente")
+        yield token, match.end(), braces, parens
+    if braces or parens:
+        raise UnbalancedCode("chaves ou parênteses não fechados")
+
+
+def top_level_boundaries(code: str) -> Optional[List[int]]:
+    """Posições de início de linha logo após o fechamento de cada tipo de nível superior
+
+    Retorna None se o código não puder ser dividido com segurança.
+    """
+    boundaries = []
+    try:
+        for token, position, braces, parens in scan_structure(code):
+            if token == "}" and braces == 0 and parens == 0:
+                line_end = _LINE_END.match(code, position)
+                if line_end:
+                    boundaries.append(line_end.end())
+    except UnbalancedCode:
+        return None
+    return boundaries
+
+
+def top_level_chunks(code: str) -> List[Chunk]:
+    """Um trecho por tipo de nível superior (o primeiro inclui package e imports)"""
+    if "\\u" in code:
+        # O javalang converte escapes unicode antes de tokenizar, o que desloca as colunas
+        return [Chunk(code, 0)]
+    cuts = [0] + (top_level_boundaries(code) or []) + [len(code)]
+    chunks = []
+    line = 0
+    for start, end in zip(cuts, cuts[1:]):
+        if start < end:
+            chunks.append(Chunk(code[start:end], line))
+            line += code.count("\n", start, end)
+    return chunks
+
+
+def split_top_level(code: str, parts: int) -> List[Chunk]:
+    """Junta os tipos de nível superior em até parts trechos de tamanho parecido"""
+    chunks = top_level_chunks(code)
+    target = len(code) / parts
+    groups = [chunks[0]]
+    remaining = len(code) - len(chunks[0].text)
+    for chunk in chunks[1:]:
+        if len(groups[-1].text) >= target and remaining >= target / 2:
+            groups.append(chunk)
+        else:
+            groups[-1] = Chunk(groups[-1].text + chunk.text, groups[-1].line)
+        remaining -= len(chunk.text)
+    return groups
+
+
+def parse_chunk(parse: Callable[[str], object], chunk: Chunk):
+    """Faz o parsing de um trecho mantendo as linhas do arquivo original"""
+    return parse("\n" * chunk.line + chunk.text)
+
+
+def merge_units(units: List) -> Optional[object]:
+    """Junta as CompilationUnits dos trechos; None se algum trecho não for só declarações de tipo"""
+    first = units[0]
+    if any(unit.package is not None or unit.imports for unit in units[1:]):
+        return None
+    return type(first)(package=first.package, imports=first.imports,
+                       types=[declaration for unit in units for declaration in unit.types])
+
+
+def parse_chunked(code: str, parse: Callable[[str], object],
+                  submit: Callable[[Chunk], Future], parts: int):
+    """Parsing do código em trechos paralelos, com o arquivo inteiro como alternativa
+
+    submit(chunk) agenda o parsing de um trecho (por exemplo, no pool de processos) e
+    retorna um Future com a CompilationUnit do trecho.
+    """
+    chunks = split_top_level(code, parts)
+    if len(chunks) > 1:
+        futures = [submit(chunk) for chunk in chunks]
+        try:
+            merged = merge_units([future.result() for future in futures])
+        except Exception:
+            # Erros de sintaxe são reportados pelo parsing do arquivo inteiro
+            merged = None
+        if merged is not None:
+            return merged
+    return parse(code)
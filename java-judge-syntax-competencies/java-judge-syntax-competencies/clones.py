@@ -0,0 +1,259 @@
+"""Trechos copiados e colados dentro de uma submissão, por arranjo de sufixos e LCP.
+
+Os tokens são normalizados (identificadores e literais viram um símbolo só, então um
+bloco copiado com os nomes trocados continua igual) e o arranjo de sufixos com o LCP
+(Kasai) acha todas as repetições em O(n log² n), sem comparar trechos dois a dois. Cada
+intervalo do LCP é um grupo de ocorrências de uma repetição máxima; quando elas se
+sobrepõem (o mesmo bloco colado várias vezes em seguida), o trecho repetido é reduzido ao
+período. Grupos com ao menos MIN_UNIT_TOKENS tokens por ocorrência e MIN_CLONE_TOKENS
+tokens copiados no total viram classes de clones.
+
+A primeira ocorrência de cada classe conta como o original e as demais como cópias:
+estruturas (comandos e declarações de variáveis) inteiras dentro de uma cópia podem ser
+descontadas das contagens (ver features.discounting_clones).
+"""
+import bisect
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from javalang import tree
+from javalang.tokenizer import Identifier, Literal
+
+# Tamanho mínimo de cada ocorrência, em tokens: menos que isso é uma linha comum repetida
+MIN_UNIT_TOKENS = 12
+# Mínimo de tokens copiados na classe (tamanho x cópias além da primeira)
+MIN_CLONE_TOKENS = 30
+# Estruturas que deixam de contar quando estão inteiras em uma cópia
+STRUCTURES = (tree.IfStatement, tree.SwitchStatement, tree.ForStatement, tree.WhileStatement,
+              tree.DoStatement, tree.LocalVariableDeclaration)
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+
+
+def normalize(tokens: Sequence) -> List[int]:
+    """Símbolos inteiros dos tokens, com identificadores e literais em símbolos únicos"""
+    symbols: Dict[str, int] = {"<identificador>": 0, "<literal>": 1}
+    sequence = []
+    for token in tokens:
+        if isinstance(token, Identifier):
+            sequence.append(0)
+        elif isinstance(token, Literal):
+            sequence.append(1)
+        else:
+            sequence.append(symbols.setdefault(token.value, len(symbols)))
+    return sequence
+
+
+def suffix_array(sequence: Sequence[int]) -> List[int]:
+    """Posições dos sufixos em ordem lexicográfica (duplicação de prefixos)
+
+    Cada rodada dobra o prefixo comparado e reordena com o sort, em O(n log n): O(n log² n)
+    no total. A ordem da rodada anterior já vem quase pronta, e o sort aproveita isso
+    melhor que uma ordenação por contagem escrita em Python.
+    """
+    n = len(sequence)
+    order = sorted(range(n), key=sequence.__getitem__)
+    rank = list(sequence)
+    step = 1
+    while n > 1:
+        def key(position: int) -> Tuple[int, int]:
+            return rank[position], rank[position + step] if position + step < n else -1
+
+        order.sort(key=key)
+        ranks = [0] * n
+        for previous, position in zip(order, order[1:]):
+            ranks[position] = ranks[previous] + (key(previous) != key(position))
+        rank = ranks
+        if rank[order[-1]] == n - 1:
+            break
+        step *= 2
+    return order
+
+
+def lcp_array(sequence: Sequence[int], order: Sequence[int]) -> List[int]:
+    """lcp[i]: prefixo comum entre os sufixos order[i - 1] e order[i] (Kasai)"""
+    n = len(sequence)
+    rank = [0] * n
+    for index, position in enumerate(order):
+        rank[position] = index
+    lcp = [0] * n
+    common = 0
+    for position in range(n):
+        if rank[position] == 0:
+            common = 0
+            continue
+        other = order[rank[position] - 1]
+        while position + common < n and other + common < n \
+                and sequence[position + common] == sequence[other + common]:
+            common += 1
+        lcp[rank[position]] = common
+        if common:
+            common -= 1
+    return lcp
+
+
+def _intervals(lcp: Sequence[int]) -> Iterable[Tuple[int, int, int]]:
+    """Intervalos do LCP: (prefixo comum, primeira, última posição no arranjo de sufixos)"""
+    stack = [(0, 0)]
+    for index in range(1, len(lcp) + 1):
+        common = lcp[index] if index < len(lcp) else 0
+        left = index - 1
+        while common < stack[-1][0]:
+            value, left = stack.pop()
+            yield value, left, index - 1
+        if common > stack[-1][0]:
+            stack.append((common, left))
+
+
+def matching_delimiters(tokens: Sequence) -> Dict[int, int]:
+    """Índice do delimitador que fecha cada "(", "[" e "{" """
+    matches, opened = {}, []
+    for index, token in enumerate(tokens):
+        value = token.value
+        if value in _OPENERS:
+            opened.append(index)
+        elif opened and value == _OPENERS[tokens[opened[-1]].value]:
+            matches[opened.pop()] = index
+    return matches
+
+
+def statement_end(tokens: Sequence, index: int, matches: Dict[int, int]) -> Optional[int]:
+    """Índice do último token do comando ou declaração que começa em tokens[index], ou None"""
+    if index >= len(tokens):
+        return None
+    value = tokens[index].value
+    if value == "{":
+        return matches.get(index)
+    if value in ("if", "for", "while", "switch"):
+        if index + 1 >= len(tokens) or tokens[index + 1].value != "(" or index + 1 not in matches:
+            return None
+        close = matches[index + 1]
+        if value == "switch":
+            return matches.get(close + 1)
+        end = statement_end(tokens, close + 1, matches)
+        if value == "if" and end is not None and end + 1 < len(tokens) and tokens[end + 1].value == "else":
+            return statement_end(tokens, end + 2, matches)
+        return end
+    if value == "do":
+        end = statement_end(tokens, index + 1, matches)
+        if end is None or end + 2 >= len(tokens) or tokens[end + 1].value != "while":
+            return None
+        close = matches.get(end + 2)
+        return None if close is None else close + 1
+    # Demais comandos e declarações terminam no ";" fora de parênteses, colchetes e chaves
+    while index < len(tokens):
+        value = tokens[index].value
+        if value == ";":
+            return index
+        if value in _OPENERS:
+            if index not in matches:
+                return None
+            index = matches[index]
+        elif value in (")", "]", "}"):
+            return None
+        index += 1
+    return None
+
+
+@dataclass(frozen=True)
+class CloneClass:
+    tokens: int  # tamanho de cada ocorrência
+    lines: Tuple[Tuple[int, int], ...]  # (primeira, última linha) de cada ocorrência, em ordem
+
+    @property
+    def copies(self) -> int:
+        return len(self.lines) - 1
+
+    def regions(self) -> List[str]:
+        return [f"{first}-{last}" if first != last else str(first) for first, last in self.lines]
+
+
+@dataclass
+class CloneReport:
+    """Classes de clones de uma submissão e os trechos de tokens que são cópias"""
+    tokens: Sequence
+    classes: List[CloneClass] = field(default_factory=list)
+    # Trechos (primeiro, último token) das cópias, ordenados e sem sobreposição
+    copies: List[Tuple[int, int]] = field(default_factory=list)
+    _positions: Optional[Dict] = field(default=None, repr=False)
+    _matches: Optional[Dict[int, int]] = field(default=None, repr=False)
+
+    @property
+    def copied_tokens(self) -> int:
+        return sum(last - first + 1 for first, last in self.copies)
+
+    def copied(self, node) -> bool:
+        """Indica se a estrutura (STRUCTURES) está inteira dentro de uma cópia"""
+        if not self.copies or not isinstance(node, STRUCTURES) or node.position is None:
+            return False
+        if self._positions is None:
+            self._positions = {token.position: index for index, token in enumerate(self.tokens)}
+            self._matches = matching_delimiters(self.tokens)
+        start = self._positions.get(tuple(node.position))
+        if start is None:
+            return False
+        slot = bisect.bisect_right(self.copies, (start, len(self.tokens))) - 1
+        if slot < 0 or self.copies[slot][1] < start:
+            return False
+        try:
+            end = statement_end(self.tokens, start, self._matches)
+        except RecursionError:
+            return False
+        return end is not None and end <= self.copies[slot][1]
+
+    def describe(self) -> List[str]:
+        """Uma linha por classe de clones, com as linhas de cada ocorrência"""
+        described = []
+        for clone in self.classes:
+            described.append(f"Trecho de {clone.tokens} tokens repetido {len(clone.lines)} vezes "
+                             f"(linhas {', '.join(clone.regions())})")
+        return described
+
+
+def find_clones(tokens: Sequence, min_unit: int = MIN_UNIT_TOKENS,
+                min_tokens: int = MIN_CLONE_TOKENS) -> CloneReport:
+    """Classes de clones nos tokens de uma submissão"""
+    tokens = list(tokens)
+    report = CloneReport(tokens)
+    sequence = normalize(tokens)
+    if len(sequence) < 2 * min_unit:
+        return report
+    order = suffix_array(sequence)
+    lcp = lcp_array(sequence, order)
+
+    # Ocorrências de cada trecho repetido, reunidas pelo conteúdo normalizado
+    units: Dict[Tuple[int, ...], set] = {}
+    for common, left, right in _intervals(lcp):
+        if common < min_unit:
+            continue
+        positions = sorted(order[left:right + 1])
+        # Repetição que se estende para a esquerda: já está em um grupo maior
+        if positions[0] > 0 and len({sequence[position - 1] for position in positions}) == 1:
+            continue
+        # Ocorrências sobrepostas: o trecho repetido é o período
+        length = min([common] + [second - first for first, second in zip(positions, positions[1:])])
+        if length < min_unit:
+            continue
+        units.setdefault(tuple(sequence[positions[0]:positions[0] + length]), set()).update(positions)
+
+    copies = []
+    for unit, found in units.items():
+        length = len(unit)
+        kept = []
+        for position in sorted(found):
+            if not kept or position >= kept[-1] + length:
+                kept.append(position)
+        if len(kept) < 2 or length * (len(kept) - 1) < min_tokens:
+            continue
+        lines = tuple((tokens[position].position[0], tokens[position + length - 1].position[0])
+                      for position in kept)
+        report.classes.append(CloneClass(length, lines))
+        copies.extend((position, position + length - 1) for position in kept[1:])
+
+    report.classes.sort(key=lambda clone: clone.lines)
+    # União dos trechos copiados, para consulta por busca binária
+    for first, last in sorted(copies):
+        if report.copies and first <= report.copies[-1][1] + 1:
+            report.copies[-1] = (report.copies[-1][0], max(report.copies[-1][1], last))
+        else:
+            report.copies.append((first, last))
+    return report
@@ -0,0 +1,699 @@
+import javalang
+from concurrent.futures import Future
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import re
+import time
+from batch import STAGES
+from clones import CloneReport, find_clones
+from complexity import MAX_CYCLOMATIC, MAX_NESTING, Complexity, measure
+from parsing import parse_java, parse_positioned, tokenize_java
+from preview import LexicalFeatures, lexical_features
+from rubric import RubricCriterion
+
+def run_criteria(criteria: Dict[str, Callable], argument, selected: Optional[Iterable[str]] = None) -> Dict:
+    """Roda os critérios sobre o código (ou sobre as contagens da prévia) e soma a pontuação
+
+    Com selected, só esses critérios são avaliados e somados.
+    """
+    if selected is not None:
+        selected = set(selected)
+        criteria = {key: evaluate for key, evaluate in criteria.items() if key in selected}
+    evaluation = {
+        "scores": {},
+        "levels": {},
+        "feedback": {},
+        "timings": {},
+        "summary": {
+            "total_score": 0,
+            "proficiency": ""
+        }
+    }
+
+    # Compilar resultados
+    for criterion, evaluate in criteria.items():
+        start = time.perf_counter()
+        score, level, feedback = evaluate(argument)
+        evaluation["timings"][criterion] = time.perf_counter() - start
+        evaluation["scores"][criterion] = score
+        evaluation["levels"][criterion] = level
+        evaluation["feedback"][criterion] = feedback
+        evaluation["summary"]["total_score"] += score
+
+    # Determinar proficiência geral
+    total_score = evaluation["summary"]["total_score"]
+    if total_score >= 90:
+        evaluation["summary"]["proficiency"] = "Excelente"
+    elif total_score >= 75:
+        evaluation["summary"]["proficiency"] = "Bom"
+    elif total_score >= 60:
+        evaluation["summary"]["proficiency"] = "Satisfatório"
+    else:
+        evaluation["summary"]["proficiency"] = "Necessita Melhorias"
+
+    return evaluation
+
+def detect_clones(code: str) -> Optional[CloneReport]:
+    """Trechos copiados e colados no próprio arquivo (clones.py), ou None se não tokenizar"""
+    try:
+        return find_clones(tokenize_java(code))
+    except Exception:
+        return None
+
+def structural_tree(code: str, clones: Optional[CloneReport]) -> Future:
+    """Parsing compartilhado pelos critérios estruturais, com a árvore ou o erro no Future
+
+    Com clones, a árvore tem as posições deste código (ver parsing.parse_positioned).
+    """
+    future = Future()
+    try:
+        future.set_result(parse_java(code) if clones is None else parse_positioned(code))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+def discount_copies(nodes: List, clones: Optional[CloneReport]) -> Tuple[List, int]:
+    """Remove os nós inteiros dentro de trechos copiados; devolve os que sobram e quantos saíram"""
+    if clones is None:
+        return nodes, 0
+    kept = [node for node in nodes if not clones.copied(node)]
+    return kept, len(nodes) - len(kept)
+
+def preview_evaluation(criteria: Dict[str, Callable], code: str) -> Dict:
+    """Avaliação provisória calculada só pelos tokens, marcada em summary["provisional"]
+
+    summary["unsupported"] lista a sintaxe que o parser pode recusar: com ela, a avaliação
+    completa pode terminar em erro de sintaxe e zerar o que a prévia pontuou.
+    """
+    features = lexical_features(code)
+    evaluation = run_criteria(criteria, features)
+    evaluation["summary"]["provisional"] = True
+    evaluation["summary"]["unsupported"] = features.unsupported
+    return evaluation
+
+class EnhancedJavaStructuralEvaluator:
+    """Avaliador baseado em estruturas usadas"""
+    __slots__ = ()
+
+    # Rubrica compartilhada por todas as instâncias; somente leitura
+    rubric = MappingProxyType({
+        "declarations": RubricCriterion(
+            name="Declarações",
+            description="Uso de tipos e declarações",
+            weight=25,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Uso mínimo/incorreto"},
+                "Regular": {"threshold": 10, "description": "1-2 tipos primitivos, 1-2 variáveis"},
+                "Bom": {"threshold": 15, "description": "3 tipos primitivos, 3-4 variáveis"},
+                "Excelente": {"threshold": 20, "description": "≥4 tipos primitivos, ≥5 variáveis"}
+            }
+        ),
+        "control_structures": RubricCriterion(
+            name="Estruturas de Controle",
+            description="Controle de fluxo do programa",
+            weight=25,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Uso mínimo/incorreto"},
+                "Regular": {"threshold": 10, "description": "1 tipo, uso básico"},
+                "Bom": {"threshold": 15, "description": "2 tipos diferentes, uso correto"},
+                "Excelente": {"threshold": 20, "description": "≥3 tipos diferentes, uso apropriado"}
+            }
+        ),
+        "operators": RubricCriterion(
+            name="Operadores",
+            description="Operações e expressões",
+            weight=25,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Uso mínimo/incorreto"},
+                "Regular": {"threshold": 10, "description": "1-2 operadores"},
+                "Bom": {"threshold": 15, "description": "3-4 operadores"},
+                "Excelente": {"threshold": 20, "description": "≥5 operadores diferentes"}
+            }
+        ),
+        "io_strings": RubricCriterion(
+            name="I/O e Strings",
+            description="Entrada/saída e manipulação de texto",
+            weight=25,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Uso mínimo/incorreto"},
+                "Regular": {"threshold": 10, "description": "E/S simples"},
+                "Bom": {"threshold": 15, "description": "E/S moderada, manipulação básica"},
+                "Excelente": {"threshold": 20, "description": "E/S complexa, manipulação avançada"}
+            }
+        )
+    })
+
+    def evaluate_declarations(self, code: str, clones: Optional[CloneReport] = None,
+                              tree: Optional[Future] = None) -> Tuple[float, str, List[str]]:
+        """Avalia declarações e tipos (sem as que estão em trechos copiados, com clones)"""
+        try:
+            tree = (tree or structural_tree(code, clones)).result()
+
+            declarations = [node for _, node in tree.filter(javalang.tree.LocalVariableDeclaration)]
+            declarations, discounted = discount_copies(declarations, clones)
+            used_types = {decl.type.name for decl in declarations}
+            has_constants = any('final' in node.modifiers for _, node in tree.filter(javalang.tree.FieldDeclaration))
+
+        except Exception as e:
+            return 0, "Fraco", ["⚠ Erro na análise de declarações"]
+
+        score, level, feedback = self.grade_declarations(len(used_types), len(declarations), has_constants)
+        if discounted:
+            feedback.append(f"⚠ {discounted} declaração(ões) em trechos duplicados não contada(s)")
+        return score, level, feedback
+
+    def preview_declarations(self, features: LexicalFeatures) -> Tuple[float, str, List[str]]:
+        """Prévia de declarações e tipos pelos tokens"""
+        if features.problems:
+            return 0, "Fraco", ["⚠ Erro na análise de declarações"]
+        used_types = {type_name for type_name, _ in features.declarations}
+        return self.grade_declarations(len(used_types), len(features.declarations), features.has_final_field)
+
+    @staticmethod
+    def grade_declarations(num_types: int, num_vars: int, has_constants: bool) -> Tuple[float, str, List[str]]:
+        """Nível de declarações a partir das contagens"""
+        score = 0
+        level = "Fraco"
+        feedback = []
+
+        # Determinar nível
+        if num_types >= 4 and num_vars >= 5 and has_constants:
+            score = 25
+            level = "Excelente"
+        elif num_types >= 3 and num_vars >= 3:
+            score = 15
+            level = "Bom"
+        elif num_types >= 1 or num_vars >= 1:
+            score = 10
+            level = "Regular"
+
+        feedback.append(f"✓ {num_types} tipos primitivos diferentes utilizados")
+        feedback.append(f"✓ {num_vars} variáveis declaradas")
+        if has_constants:
+            feedback.append("✓ Uso adequado de constantes (final)")
+
+        return score, level, feedback
+
+    def evaluate_control_structures(self, code: str, clones: Optional[CloneReport] = None,
+                                    tree: Optional[Future] = None) -> Tuple[float, str, List[str]]:
+        """Avalia estruturas de controle (sem as que estão em trechos copiados, com clones)"""
+        try:
+            tree = (tree or structural_tree(code, clones)).result()
+            
+            structures = {}
+            discounted = 0
+            for name, node_type in (('if', javalang.tree.IfStatement), ('switch', javalang.tree.SwitchStatement),
+                                    ('for', javalang.tree.ForStatement), ('while', javalang.tree.WhileStatement),
+                                    ('do_while', javalang.tree.DoStatement)):
+                nodes, removed = discount_copies([node for _, node in tree.filter(node_type)], clones)
+                structures[name] = len(nodes)
+                discounted += removed
+
+        except Exception as e:
+            return 0, "Fraco", ["⚠ Erro na análise de estruturas de controle"]
+
+        score, level, feedback = self.grade_control_structures(structures)
+        if discounted:
+            feedback.append(f"⚠ {discounted} estrutura(s) em trechos duplicados não contada(s)")
+        return score, level, feedback
+
+    def preview_control_structures(self, features: LexicalFeatures) -> Tuple[float, str, List[str]]:
+        """Prévia de estruturas de controle pelas palavras-chave"""
+        if features.problems:
+            return 0, "Fraco", ["⚠ Erro na análise de estruturas de controle"]
+        statements = features.statements
+        return self.grade_control_structures({
+            'if': statements['if'],
+            'switch': statements['switch'],
+            'for': statements['for'],
+            'while': statements['while'],
+            'do_while': statements['do']
+        })
+
+    @staticmethod
+    def grade_control_structures(structures: Dict[str, int]) -> Tuple[float, str, List[str]]:
+        """Nível de estruturas de controle a partir das contagens por tipo"""
+        score = 0
+        level = "Fraco"
+        feedback = []
+
+        num_different_structures = sum(1 for count in structures.values() if count > 0)
+        total_structures = sum(structures.values())
+
+        # Determinar nível
+        if num_different_structures >= 3 and total_structures >= 4:
+            score = 25
+            level = "Excelente"
+        elif num_different_structures >= 2 and total_structures >= 2:
+            score = 15
+            level = "Bom"
+        elif num_different_structures >= 1:
+            score = 10
+            level = "Regular"
+
+        for struct, count in structures.items():
+            if count > 0:
+                feedback.append(f"✓ {count} estrutura(s) {struct}")
+
+        return score, level, feedback
+
+    def evaluate_operators(self, code: str) -> Tuple[float, str, List[str]]:
+        """Avalia operadores"""
+        score = 0
+        level = "Fraco"
+        feedback = []
+
+        try:
+            operators = {
+                'arithmetic': ['+', '-', '*', '/', '%'],
+                'comparison': ['==', '!=', '>', '<', '>=', '<='],
+                'logical': ['&&', '||', '!'],
+                'assignment': ['+=', '-=', '*=', '/=']
+            }
+
+            used_operators = set()
+            for category, ops in operators.items():
+                for op in ops:
+                    if op in code:
+                        used_operators.add(op)
+                        feedback.append(f"✓ Uso do operador {op}")
+
+            num_operators = len(used_operators)
+
+            # Determinar nível
+            if num_operators >= 5:
+                score = 25
+                level = "Excelente"
+            elif num_operators >= 3:
+                score = 15
+                level = "Bom"
+            elif num_operators >= 1:
+                score = 10
+                level = "Regular"
+
+        except Exception as e:
+            feedback.append("⚠ Erro na análise de operadores")
+
+        return score, level, feedback
+
+    def evaluate_io_strings(self, code: str) -> Tuple[float, str, List[str]]:
+        """Avalia entrada/saída e strings"""
+        score = 0
+        level = "Fraco"
+        feedback = []
+
+        try:
+            features = {
+                'output': 'System.out.print' in code,
+                'input': 'Scanner' in code,
+                'concatenation': '+' in code and '"' in code,
+                'string_methods': False
+            }
+
+            # Verificar métodos de String
+            string_methods = ['concat', 'substring', 'length', 'equals', 'compareTo']
+            methods_used = [method for method in string_methods if f'.{method}(' in code]
+            features['string_methods'] = len(methods_used) > 0
+
+            # Contar recursos utilizados
+            num_features = sum(1 for used in features.values() if used)
+
+            # Determinar nível
+            if num_features >= 3 and features['string_methods']:
+                score = 25
+                level = "Excelente"
+            elif num_features >= 2:
+                score = 15
+                level = "Bom"
+            elif num_features >= 1:
+                score = 10
+                level = "Regular"
+
+            if features['output']:
+                feedback.append("✓ Uso de saída (System.out)")
+            if features['input']:
+                feedback.append("✓ Uso de entrada (Scanner)")
+            if features['concatenation']:
+                feedback.append("✓ Concatenação de strings")
+            if methods_used:
+                feedback.append(f"✓ Uso de {len(methods_used)} métodos de String")
+
+        except Exception as e:
+            feedback.append("⚠ Erro na análise de I/O e strings")
+
+        return score, level, feedback
+
+    def evaluate_code(self, code: str, criteria: Optional[Iterable[str]] = None,
+                      discount_clones: bool = False) -> Dict:
+        """Avalia o código Java usando todos os critérios (ou só os de criteria)
+
+        Com discount_clones, declarações e estruturas de controle copiadas e coladas no
+        próprio arquivo contam uma vez só, e os trechos duplicados vão em evaluation["clones"].
+        """
+        selected = None if criteria is None else set(criteria)
+        clones = detect_clones(code) if discount_clones else None
+        tree = None
+        if clones is not None and (selected is None or selected & {"declarations", "control_structures"}):
+            # Parsing à parte (fora do cache), feito uma vez para os dois critérios
+            tree = structural_tree(code, clones)
+        evaluation = run_criteria({
+            "declarations": lambda code: self.evaluate_declarations(code, clones, tree),
+            "control_structures": lambda code: self.evaluate_control_structures(code, clones, tree),
+            "operators": self.evaluate_operators,
+            "io_strings": self.evaluate_io_strings
+        }, code, selected)
+        if clones is not None:
+            evaluation["clones"] = clones.describe()
+        return evaluation
+
+    def preview_code(self, code: str) -> Dict:
+        """Prévia léxica: operadores e E/S já são verificados no texto e saem iguais"""
+        return preview_evaluation({
+            "declarations": self.preview_declarations,
+            "control_structures": self.preview_control_structures,
+            "operators": lambda features: self.evaluate_operators(features.code),
+            "io_strings": lambda features: self.evaluate_io_strings(features.code)
+        }, code)
+
+class EnhancedCompetencyEvaluator:
+    """Avaliador baseado em competências"""
+    __slots__ = ()
+
+    rubric = MappingProxyType({
+        "syntax": RubricCriterion(
+            name="Corretude Sintática",
+            description="Correção técnica do código",
+            weight=50,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Muitos erros"},
+                "Regular": {"threshold": 20, "description": "Código funcional, alguns erros"},
+                "Bom": {"threshold": 30, "description": "Código correto, erros menores"},
+                "Excelente": {"threshold": 40, "description": "Código exemplar, sem erros"}
+            }
+        ),
+        "competencies": RubricCriterion(
+            name="Competências Práticas",
+            description="Qualidade da implementação",
+            weight=50,
+            is_essential=True,
+            levels={
+                "Fraco": {"threshold": 0, "description": "Implementação pobre"},
+                "Regular": {"threshold": 20, "description": "Implementação básica"},
+                "Bom": {"threshold": 30, "description": "Boa implementação"},
+                "Excelente": {"threshold": 40, "description": "Implementação sofisticada"}
+            }
+        )
+    })
+
+    def evaluate_syntax(self, code: str) -> Tuple[float, str, List[str]]:
+        """Avalia corretude sintática"""
+        try:
+            tree = parse_java(code)
+            declarations = list(tree.filter(javalang.tree.LocalVariableDeclaration))
+            expressions = list(tree.filter(javalang.tree.BinaryOperation))
+
+        except Exception as e:
+            return 0, "Fraco", [f"⚠ Erro de sintaxe: {str(e)}"]
+
+        return self.grade_syntax(code, len(declarations), bool(expressions))
+
+    def preview_syntax(self, features: LexicalFeatures) -> Tuple[float, str, List[str]]:
+        """Prévia de corretude sintática pelos tokens"""
+        if features.problems:
+            return 0, "Fraco", [f"⚠ Erro de sintaxe: {features.problems[0]}"]
+        return self.grade_syntax(features.code, len(features.declarations), bool(features.binary_operators))
+
+    @staticmethod
+    def grade_syntax(code: str, num_declarations: int, has_expressions: bool) -> Tuple[float, str, List[str]]:
+        """Nível de corretude sintática de um código que passou pelo parsing"""
+        score = 0
+        level = "Fraco"
+        feedback = []
+
+        # 1. Estrutura básica (10 pts)
+        has_class = 'class' in code
+        has_main = 'public static void main' in code
+        if has_class and has_main:
+            score += 10
+            feedback.append("✓ Estrutura básica correta (classe e main)")
+
+        # 2. Declarações (10 pts)
+        if num_declarations:
+            score += 10
+            feedback.append(f"✓ {num_declarations} declarações sintáticamente corretas")
+
+        # 3. Blocos e estruturas (10 pts)
+        if code.count('{') == code.count('}') and code.count('{') > 0:
+            score += 10
+            feedback.append("✓ Blocos corretamente delimitados")
+
+        # 4. Expressões (10 pts)
+        if has_expressions:
+            score += 10
+            feedback.append("✓ Expressões bem formadas")
+
+        # 5. Pontuação e formatação (10 pts)
+        lines = code.split('\n')
+        well_formatted = all(line.strip().endswith(';') or 
+                           line.strip().endswith('{') or 
+                           line.strip().endswith('}') or 
+                           line.strip() == "" or 
+                           line.strip().startswith('//') 
+                           for line in lines if line.strip())
+        if well_formatted:
+            score += 10
+            feedback.append("✓ Código bem formatado e pontuado")
+
+        # Determinar nível
+        if score >= 40:
+            level = "Excelente"
+        elif score >= 30:
+            level = "Bom"
+        elif score >= 20:
+            level = "Regular"
+
+        return score, level, feedback
+
+    def evaluate_competencies(self, code: str) -> Tuple[float, str, List[str]]:
+        """Avalia competências práticas"""
+        score = 0
+        feedback = []
+        complexity = None
+
+        try:
+            tree = parse_java(code)
+            complexity = measure(tokenize_java(code))
+
+            # 1. Seleção de estruturas (15 pts)
+            structures = {
+                'if': list(tree.filter(javalang.tree.IfStatement)),
+                'for': list(tree.filter(javalang.tree.ForStatement)),
+                'while': list(tree.filter(javalang.tree.WhileStatement))
+            }
+            
+            struct_score = 0
+            for struct_type, instances in structures.items():
+                if instances:
+                    struct_score += 5
+                    if struct_type == 'for' and any('length' in str(inst) for inst in instances):
+                        struct_score += 2
+                    elif struct_type == 'while' and any('hasNext' in str(inst) for inst in instances):
+                        struct_score += 2
+            
+            score += min(15, struct_score)
+            if struct_score > 0:
+                feedback.append(f"✓ Uso apropriado de estruturas de controle")
+
+            # 2. Manipulação de dados (15 pts)
+            data_score = 0
+            operations = [node for _, node in tree.filter(javalang.tree.BinaryOperation)]
+            if operations:
+                if any(op.operator in ['*', '/', '+', '-'] for op in operations):
+                    data_score += 5
+                if any(op.operator in ['>', '<', '>=', '<=', '=='] for op in operations):
+                    data_score += 5
+                # Atribuição: x = ..., x += ... ou declaração com valor inicial
+                if any(True for _ in tree.filter(javalang.tree.Assignment)) or \
+                        any(declarator.initializer is not None
+                            for _, declarator in tree.filter(javalang.tree.VariableDeclarator)):
+                    data_score += 5
+
+            score += min(15, data_score)
+            if data_score > 0:
+                feedback.append("✓ Manipulação de dados adequada")
+
+            # 3. Clareza e organização (10 pts)
+            org_score = 0
+            if all(len(decl.declarators[0].name) > 1 for _, decl in tree.filter(javalang.tree.LocalVariableDeclaration)):
+                org_score += 5
+            
+            lines = code.split('\n')
+            if any('//' in line or '/*' in line for line in lines):
+                org_score += 5
+
+            score += min(10, org_score)
+            if org_score > 0:
+                feedback.append("✓ Código bem organizado e documentado")
+
+            # 4. Resolução do problema (10 pts)
+            if 'Scanner' in code and 'System.out' in code and operations:
+                score += 10
+                feedback.append("✓ Solução completa com entrada, processamento e saída")
+
+        except Exception as e:
+            feedback.append(f"⚠ Erro na análise de competências: {str(e)}")
+
+        return self.grade_quality(score, feedback, complexity)
+
+    @staticmethod
+    def grade_quality(score: float, feedback: List[str], complexity: Optional[Complexity]) -> Tuple[float, str, List[str]]:
+        """Relata as métricas de complexidade e determina o nível de competências
+
+        As métricas só entram no feedback: a pontuação não muda. Os métodos acima de
+        MAX_CYCLOMATIC ou de MAX_NESTING aparecem como aviso.
+        """
+        if complexity is not None:
+            # 5. Complexidade (informativa, sem desconto)
+            warned = complexity.max_cyclomatic > MAX_CYCLOMATIC or complexity.nesting > MAX_NESTING
+            busiest = max(complexity.methods, key=lambda method: method.cyclomatic, default=None)
+            if busiest is not None:
+                feedback.append(f"{'⚠' if warned else '✓'} Complexidade ciclomática máxima {busiest.cyclomatic} "
+                                f"({busiest.name}), aninhamento máximo {complexity.nesting}, "
+                                f"volume de Halstead {complexity.halstead.volume:.0f}")
+            for method in complexity.complex_methods():
+                feedback.append(f"⚠ {'Construtor' if method.constructor else 'Método'} {method.name} "
+                                f"(linha {method.line}) muito complexo: "
+                                f"complexidade {method.cyclomatic}, aninhamento {method.nesting}")
+
+        # Determinar nível
+        level = "Fraco"
+        if score >= 40:
+            level = "Excelente"
+        elif score >= 30:
+            level = "Bom"
+        elif score >= 20:
+            level = "Regular"
+
+        return score, level, feedback
+
+    def preview_competencies(self, features: LexicalFeatures) -> Tuple[float, str, List[str]]:
+        """Prévia de competências práticas pelos tokens
+
+        Reproduz evaluate_competencies: tree.filter devolve pares (caminho, nó), então o
+        str() de cada estrutura inclui a unidade inteira.
+        """
+        if features.problems:
+            return 0, "Fraco", [f"⚠ Erro na análise de competências: {features.problems[0]}"]
+        score = 0
+        feedback = []
+
+        struct_score = 0
+        for struct_type in ('if', 'for', 'while'):
+            if features.statements[struct_type]:
+                struct_score += 5
+                if struct_type == 'for' and any('length' in word for word in features.words):
+                    struct_score += 2
+                elif struct_type == 'while' and any('hasNext' in word for word in features.words):
+                    struct_score += 2
+        score += min(15, struct_score)
+        if struct_score > 0:
+            feedback.append(f"✓ Uso apropriado de estruturas de controle")
+
+        data_score = 0
+        operations = features.binary_operators
+        if operations:
+            if any(op in ['*', '/', '+', '-'] for op in operations):
+                data_score += 5
+            if any(op in ['>', '<', '>=', '<=', '=='] for op in operations):
+                data_score += 5
+            if features.assignments:
+                data_score += 5
+        score += min(15, data_score)
+        if data_score > 0:
+            feedback.append("✓ Manipulação de dados adequada")
+
+        org_score = 0
+        if all(len(name) > 1 for _, name in features.declarations):
+            org_score += 5
+        if any('//' in line or '/*' in line for line in features.code.split('\n')):
+            org_score += 5
+        score += min(10, org_score)
+        if org_score > 0:
+            feedback.append("✓ Código bem organizado e documentado")
+
+        if 'Scanner' in features.code and 'System.out' in features.code and operations:
+            score += 10
+            feedback.append("✓ Solução completa com entrada, processamento e saída")
+
+        return self.grade_quality(score, feedback, features.complexity)
+
+    def evaluate_code(self, code: str, criteria: Optional[Iterable[str]] = None) -> Dict:
+        """Avalia o código Java usando todos os critérios (ou só os de criteria)"""
+        return run_criteria({
+            "syntax": self.evaluate_syntax,
+            "competencies": self.evaluate_competencies
+        }, code, criteria)
+
+    def preview_code(self, code: str) -> Dict:
+        """Prévia léxica: chaves, main e formatação já são verificados no texto"""
+        return preview_evaluation({
+            "syntax": self.preview_syntax,
+            "competencies": self.preview_competencies
+        }, code)
+
+# Avaliadores sem estado, criados uma vez e compartilhados entre as requisições
+EVALUATORS = {
+    "structural": EnhancedJavaStructuralEvaluator(),
+    "competency": EnhancedCompetencyEvaluator(),
+}
+
+def format_file_result(file_result) -> str:
+    """Formata o resultado da avaliação de um arquivo"""
+    evaluation = file_result.evaluation
+
+    result = f"\n{'='*50}\n"
+    result += f"Avaliação do arquivo: {file_result.name}\n"
+    result += f"{'='*50}\n\n"
+    if evaluation is None:
+        result += "Avaliação não concluída:\n"
+        for error in file_result.errors:
+            result += f"  - [{STAGES[error.stage]}] {error.message}\n"
+        return result
+
+    result += f"Codificação: {file_result.encoding}\n"
+    if evaluation["summary"].get("provisional"):
+        result += "Prévia léxica (provisória): a avaliação completa substitui este resultado\n"
+        if evaluation["summary"].get("unsupported"):
+            result += (f"⚠ Provisória: o código usa sintaxe que o parser pode recusar "
+                       f"({', '.join(evaluation['summary']['unsupported'])}); se o parsing falhar, "
+                       f"a avaliação completa pode zerar esta pontuação\n")
+
+    # Pontuação e nível
+    result += f"Pontuação Total: {evaluation['summary']['total_score']:.1f}/100\n"
+    result += f"Nível de Proficiência: {evaluation['summary']['proficiency']}\n\n"
+
+    # Detalhamento por critério
+    result += "Avaliação Detalhada por Critério:\n"
+    result += "-" * 30 + "\n\n"
+
+    for criterion in evaluation["scores"].keys():
+        result += f"• {criterion.title()}:\n"
+        result += f"  Nível: {evaluation['levels'][criterion]}\n"
+        result += f"  Pontuação: {evaluation['scores'][criterion]:.1f}\n"
+        result += "  Feedback:\n"
+        for fb in evaluation['feedback'][criterion]:
+            result += f"    - {fb}\n"
+        result += "\n"
+
+    if evaluation.get("clones"):
+        result += "Trechos duplicados no arquivo:\n"
+        for described in evaluation["clones"]:
+            result += f"  - {described}\n"
+        result += "\n"
+
+    return result
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from backends import FastJavalangBackend, create_backend
+from chunking import CHUNK_MIN_CHARS, Chunk, parse_chunk, parse_chunked
+from fastjavalang import tokenize
+from incremental import IncrementalParser
+from subtrees import SubtreeTable
+from uploads import SourceFile, UploadedFile, decode_source, read_upload
+from workers import running_pool
+
+# Número máximo de árvores mantidas em memória
+CACHE_SIZE = 256
+# Listas de tokens mantidas ao lado das árvores: só são reaproveitadas enquanto a submissão
+# é avaliada (clones, complexidade), então bastam poucas
+TOKEN_CACHE_SIZE = 32
+
+
+def code_key(code: str) -> str:
+    """Hash do código usado como chave dos caches"""
+    return hashlib.sha1(code.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class ParseCache:
+    """Cache LRU de árvores sintáticas (formato javalang) indexado pelo hash do código"""
+
+    def __init__(self, max_entries: int = CACHE_SIZE, backend=None):
+        self.max_entries = max_entries
+        # Backend de parsing: javalang ou tree-sitter, escolhido por JAVA_PARSER
+        self.backend = backend or create_backend()
+        # Subárvores por tipo e por membro, reaproveitadas quando o código é reenviado com alterações
+        self.units = IncrementalParser()
+        # Métodos e classes idênticos entre arquivos, guardados uma vez só
+        self.subtrees = SubtreeTable()
+        self._entries: "OrderedDict[str, Future]" = OrderedDict()
+        # O parsing incremental tokeniza cada tipo e membro à parte (e não tokeniza os que
+        # já estão em cache): a lista do arquivo inteiro é feita uma vez e guardada aqui
+        self._tokens: "OrderedDict[str, List]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, code: str):
+        """Retorna a árvore do código, reaproveitando parses já feitos ou em andamento"""
+        key = code_key(code)
+        owner = False
+
+        with self._lock:
+            future = self._entries.get(key)
+            if future is None:
+                future = Future()
+                self._entries[key] = future
+                owner = True
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+
+        # Quem criou a entrada faz o parsing; os demais aguardam o mesmo resultado
+        if owner:
+            try:
+                future.set_result(self._parse(code))
+            except Exception as e:
+                future.set_exception(e)
+
+        return future.result()
+
+    def _parse(self, code: str):
+        # Arquivos grandes são divididos nos tipos de nível superior e analisados em paralelo
+        pool = running_pool()
+        if len(code) < CHUNK_MIN_CHARS or pool is None or pool.workers < 2:
+            unit = self.units.parse(code, self.backend)
+        else:
+            name = self.backend.name
+            unit = parse_chunked(code, self.backend.parse,
+                                 lambda chunk: pool.submit(_parse_chunk, name, chunk), pool.workers)
+        return self.subtrees.intern(unit)
+
+    def error(self, code: str) -> Optional[Exception]:
+        """Erro do parsing já concluído do código; None se deu certo ou se ainda não foi feito"""
+        with self._lock:
+            future = self._entries.get(code_key(code))
+        if future is None or not future.done():
+            return None
+        return future.exception()
+
+    def fail(self, code: str, error: Exception):
+        """Guarda o erro de um parsing feito fora do cache, como os de parse_java"""
+        future = Future()
+        future.set_exception(error)
+        with self._lock:
+            self._entries.setdefault(code_key(code), future)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tokens(self, code: str) -> List:
+        """Tokens do código, feitos uma vez e compartilhados pelas métricas léxicas"""
+        key = code_key(code)
+        with self._lock:
+            tokens = self._tokens.get(key)
+            if tokens is not None:
+                self._tokens.move_to_end(key)
+                return tokens
+        tokens = list(tokenize(code))
+        with self._lock:
+            self._tokens[key] = tokens
+            while len(self._tokens) > TOKEN_CACHE_SIZE:
+                self._tokens.popitem(last=False)
+        return tokens
+
+    def contains(self, code: str) -> bool:
+        """Indica se a árvore do código já está pronta no cache"""
+        with self._lock:
+            future = self._entries.get(code_key(code))
+        return future is not None and future.done()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens.clear()
+        self.units.clear()
+        self.subtrees.clear()
+
+
+parse_cache = ParseCache()
+
+# Processos filhos criados por fork não podem reaproveitar travas nem parses em andamento do pai
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: parse_cache.__init__(parse_cache.max_entries, parse_cache.backend))
+
+
+def use_backend(name: str):
+    """Troca o backend de parsing do processo e descarta as árvores do backend anterior"""
+    parse_cache.backend = create_backend(name)
+    parse_cache.clear()
+
+
+def _parse_chunk(backend: str, chunk: Chunk):
+    """Parsing de um trecho em um worker, com o mesmo backend do processo que o enviou"""
+    parser = parse_cache.backend if parse_cache.backend.name == backend else create_backend(backend)
+    return parse_chunk(parser.parse, chunk)
+
+
+def parse_java(code: str):
+    """Faz o parsing do código Java usando o cache compartilhado"""
+    return parse_cache.parse(code)
+
+
+def tokenize_java(code: str) -> List:
+    """Tokens do código Java usando o cache compartilhado (não altere a lista)"""
+    return parse_cache.tokens(code)
+
+
+def parse_positioned(code: str):
+    """Parsing sem os caches, para quem precisa das posições deste código
+
+    Subárvores compartilhadas entre arquivos e reaproveitadas pelo parsing incremental
+    guardam as posições da versão em que foram analisadas primeiro. Um erro de sintaxe
+    fica no cache compartilhado, como os de parse_java.
+    """
+    backend = parse_cache.backend
+    try:
+        if isinstance(backend, FastJavalangBackend):
+            # Parsing do arquivo inteiro: usa a mesma lista de tokens de clones e complexidade
+            return backend.parse(code, parse_cache.tokens(code))
+        return backend.parse(code)
+    except Exception as e:
+        parse_cache.fail(code, e)
+        raise
+
+
+# Pré-processamento dos uploads
+_prefetch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+def read_source(upload: UploadedFile) -> SourceFile:
+    """Decodifica o conteúdo de um arquivo Java enviado"""
+    code, encoding = decode_source(upload)
+    return SourceFile(upload.name, code, encoding)
+
+
+def _decode_and_parse(upload: UploadedFile) -> SourceFile:
+    source = read_source(upload)
+    try:
+        parse_java(source.code)
+    except Exception:
+        # O erro fica guardado no cache e é reportado pelo avaliador
+        pass
+    return source
+
+
+def prefetch_files(files) -> Dict[str, Future]:
+    """Inicia em segundo plano a decodificação e o parsing dos arquivos recém-enviados"""
+    if not files:
+        return {}
+    uploads = [read_upload(file) for file in files]
+    return {upload.key: _prefetch_executor.submit(_decode_and_parse, upload) for upload in uploads}
+
+
+def load_source(file, prefetched: Dict[str, Future] = None) -> SourceFile:
+    """Decodifica um arquivo enviado, aproveitando o pré-processamento do upload"""
+    upload = read_upload(file)
+    future = (prefetched or {}).get(upload.key)
+    return future.result() if future is not None else read_source(upload)
@@ -0,0 +1,259 @@
+"""Prévia léxica da rubrica: as contagens da avaliação completa estimadas só pelos tokens
+
+Operadores, E/S, chaves e o método main já são verificados no texto do código; o que a
+avaliação completa tira da árvore (declarações locais, estruturas de controle, operações
+binárias, atribuições, campos final) é aproximado aqui com uma passada pelos tokens, sem
+parsing. A prévia sai em poucos milissegundos e é substituída pela avaliação completa
+quando ela fica pronta.
+"""
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from javalang.tokenizer import Annotation, BasicType, Identifier, Keyword, Literal, Modifier
+
+from complexity import Complexity, measure
+from live import scan_tokens
+
+# Palavras-chave contadas como estruturas de controle (como IfStatement, ForStatement...)
+STATEMENTS = ("if", "switch", "for", "while", "do")
+# Operadores que o javalang representa como BinaryOperation
+BINARY_OPERATORS = {"||", "&&", "|", "^", "&", "==", "!=", "<", ">", "<=", ">=",
+                    "<<", ">>", ">>>", "+", "-", "*", "/", "%", "instanceof"}
+# Operadores de atribuição (Assignment, ou declarador com valor inicial, na árvore)
+ASSIGNMENT_OPERATORS = {"=", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "<<=", ">>=", ">>>="}
+# Tokens que podem aparecer dentro de argumentos de tipo (List<Map<String, int[]>>)
+_TYPE_ARGUMENT_TOKENS = {",", ".", "?", "extends", "super", "[", "]", "&"}
+# O que pode vir depois de argumentos de tipo: nome, construtor, cast, "::", varargs
+_AFTER_TYPE_ARGUMENTS = {"(", ")", ".", "::", "[", "...", ">", ","}
+# Tokens que terminam um operando: o operador seguinte é binário, não unário
+_OPERAND_END = {")", "]", "this", "super", "class", "++", "--"}
+_OPENERS = {")": "(", "}": "{", "]": "["}
+_TYPE_KEYWORDS = {"class", "interface", "enum"}
+# Trecho máximo examinado à procura do ">" que fecha argumentos de tipo
+_MAX_TYPE_ARGUMENTS = 64
+
+
+@dataclass
+class LexicalFeatures:
+    """Contagens estimadas pelos tokens, no formato usado pelas rubricas"""
+    code: str
+    # (tipo, nome do primeiro declarador) de cada declaração de variável local
+    declarations: List[Tuple[str, str]] = field(default_factory=list)
+    has_final_field: bool = False
+    statements: Counter = field(default_factory=Counter)
+    binary_operators: List[str] = field(default_factory=list)
+    assignments: int = 0
+    # Identificadores e literais do arquivo (o que aparece no str() da árvore)
+    words: List[str] = field(default_factory=list)
+    # Problemas léxicos; com algum deles o parsing do arquivo falharia
+    problems: List[str] = field(default_factory=list)
+    # Sintaxe posterior ao Java 8 (record, switch com ->...) que o parser pode recusar
+    unsupported: List[str] = field(default_factory=list)
+    # Complexidade pelos mesmos tokens (None se houver problemas léxicos)
+    complexity: Optional[Complexity] = None
+
+
+def _matches(tokens: List) -> Dict[int, int]:
+    """Índice do delimitador que fecha cada "(", "{" e "[" (e vice-versa)"""
+    matches, opened = {}, []
+    for index, token in enumerate(tokens):
+        value = token.value
+        if value in ("(", "{", "["):
+            opened.append(index)
+        elif value in _OPENERS and opened and tokens[opened[-1]].value == _OPENERS[value]:
+            start = opened.pop()
+            matches[start], matches[index] = index, start
+    return matches
+
+
+def _type_arguments_end(tokens: List, index: int) -> Optional[int]:
+    """Índice do ">" que fecha os argumentos de tipo abertos em tokens[index], ou None"""
+    depth = 0
+    for position in range(index, min(len(tokens), index + _MAX_TYPE_ARGUMENTS)):
+        token = tokens[position]
+        value = token.value
+        if value == "<":
+            depth += 1
+        elif value in (">", ">>", ">>>"):
+            depth -= len(value)
+            if depth < 0:
+                return None
+            if depth == 0:
+                following = tokens[position + 1] if position + 1 < len(tokens) else None
+                if following is None or type(following) is Identifier or following.value in _AFTER_TYPE_ARGUMENTS:
+                    return position
+                return None
+        elif not (type(token) in (Identifier, BasicType) or value in _TYPE_ARGUMENT_TOKENS):
+            return None
+    return None
+
+
+def _skip_type(tokens: List, index: int) -> Optional[int]:
+    """Posição depois de um tipo (nome qualificado, argumentos de tipo e colchetes), ou None"""
+    if index >= len(tokens) or type(tokens[index]) not in (Identifier, BasicType):
+        return None
+    index += 1
+    while index < len(tokens):
+        value = tokens[index].value
+        if value == "." and index + 1 < len(tokens) and type(tokens[index + 1]) is Identifier:
+            index += 2
+        elif value == "<":
+            end = _type_arguments_end(tokens, index)
+            if end is None:
+                return None
+            index = end + 1
+        elif value == "[" and index + 1 < len(tokens) and tokens[index + 1].value == "]":
+            index += 2
+        else:
+            return index
+    return index
+
+
+def _declaration(tokens: List, index: int, matches: Dict[int, int]) -> Optional[Tuple[List[str], str, str]]:
+    """(modificadores, tipo, nome) de uma declaração de variável ou campo começando em tokens[index]"""
+    modifiers = []
+    while index < len(tokens):
+        token = tokens[index]
+        if type(token) is Modifier:
+            modifiers.append(token.value)
+            index += 1
+        elif type(token) is Annotation:
+            # @Nome, @a.b.Nome ou @Nome(...)
+            index += 1
+            while index + 1 < len(tokens) and tokens[index].value != "(" \
+                    and (type(tokens[index]) is Identifier or tokens[index].value == "."):
+                index += 1
+            if index < len(tokens) and tokens[index].value == "(" and index in matches:
+                index = matches[index] + 1
+        else:
+            break
+    name_index = _skip_type(tokens, index)
+    if name_index is None or name_index + 1 >= len(tokens) or type(tokens[name_index]) is not Identifier:
+        return None
+    if tokens[name_index + 1].value not in ("=", ";", ",", "["):
+        return None
+    return modifiers, tokens[index].value, tokens[name_index].value
+
+
+def lexical_features(code: str) -> LexicalFeatures:
+    """Uma passada pelos tokens estimando o que a avaliação completa conta na árvore"""
+    tokens, problems = scan_tokens(code)
+    features = LexicalFeatures(code=code, problems=problems)
+    if not problems:
+        features.complexity = measure(tokens)
+    matches = _matches(tokens)
+    # Para cada "{" aberto: se é corpo de tipo e a profundidade de parênteses de fora
+    scopes: List[Tuple[bool, int]] = []
+    parens = 0
+    type_pending = False
+    anonymous: List[bool] = []  # para cada "(" aberto: se vem de "new Tipo("
+    anonymous_body = False
+    do_scopes: List[Tuple[int, int]] = []
+    skip_until = -1
+    annotation_end = -1  # fim dos argumentos da anotação corrente (@A(x = 1) não é atribuição)
+    case_label = False  # entre "case"/"default" e o ":" ou "->" do rótulo
+
+    for index, token in enumerate(tokens):
+        kind, value = type(token), token.value
+        previous = tokens[index - 1] if index else None
+        following = tokens[index + 1] if index + 1 < len(tokens) else None
+
+        # Sintaxe recente: o javalang recusa, mas outro backend de parsing pode aceitar
+        if case_label and parens == 0 and value in ("->", ","):
+            features.unsupported.append("switch com ->" if value == "->" else "case com vários rótulos")
+            case_label = value == ","
+        elif value in (":", ";", "{", "}"):
+            case_label = False
+        elif kind is Keyword and value == "case" \
+                or kind is Modifier and value == "default" and following is not None and following.value in (":", "->"):
+            case_label = True
+        if kind is Identifier and following is not None and (previous is None or previous.value != "."):
+            if value == "record" and type(following) is Identifier and index + 2 < len(tokens) \
+                    and tokens[index + 2].value in ("(", "<"):
+                features.unsupported.append("record")
+            elif value == "yield" and (previous is None or previous.value in ("{", "}", ";", ":", "->")) \
+                    and following.value not in ("(", ".", "[") and following.value not in ASSIGNMENT_OPERATORS:
+                features.unsupported.append("yield")
+            elif value == "sealed" and (type(following) is Modifier or following.value in _TYPE_KEYWORDS) \
+                    or value == "permits" and type_pending:
+                features.unsupported.append("sealed/permits")
+        if value == '""' and isinstance(following, Literal) and following.value.startswith('"'):
+            # Dois literais de string seguidos só aparecem em um bloco de texto ("""...""")
+            features.unsupported.append("bloco de texto")
+        if value == "instanceof":
+            end = _skip_type(tokens, index + 1)
+            if end is not None and end < len(tokens) and type(tokens[end]) is Identifier:
+                features.unsupported.append("padrão em instanceof")
+
+        if value == "{":
+            scopes.append((type_pending or anonymous_body, parens))
+            type_pending = anonymous_body = False
+            parens = 0
+            continue
+        anonymous_body = False
+        if value == "}":
+            if scopes:
+                parens = scopes.pop()[1]
+            continue
+        if value == "(":
+            anonymous.append(previous is not None and index >= 2 and type(previous) is Identifier
+                             and tokens[index - 2].value == "new")
+            parens += 1
+            continue
+        if value == ")":
+            parens = max(parens - 1, 0)
+            anonymous_body = anonymous.pop() if anonymous else False
+            continue
+
+        if kind is Keyword and value in _TYPE_KEYWORDS and not (previous is not None and previous.value == "."):
+            type_pending = True
+
+        # Declarações começam um comando ou um membro: depois de "{", "}", ";" ou de um rótulo
+        # de case, fora de parênteses
+        if parens == 0 and (previous is None or previous.value in ("{", "}", ";", ":")) \
+                and kind in (Identifier, BasicType, Modifier, Annotation):
+            declaration = _declaration(tokens, index, matches)
+            if declaration is not None:
+                modifiers, type_name, name = declaration
+                in_type_body = scopes[-1][0] if scopes else True
+                if in_type_body:
+                    features.has_final_field |= "final" in modifiers
+                else:
+                    features.declarations.append((type_name, name))
+
+        if kind is Keyword and value in STATEMENTS:
+            depth = (len(scopes), parens)
+            if value == "while" and do_scopes and do_scopes[-1] == depth:
+                # "while" que fecha um do-while
+                do_scopes.pop()
+                continue
+            features.statements[value] += 1
+            if value == "do":
+                do_scopes.append(depth)
+            continue
+
+        if kind is Identifier or isinstance(token, Literal):
+            features.words.append(value)
+
+        if kind is Annotation:
+            position = index + 1
+            while position < len(tokens) and (type(tokens[position]) is Identifier or tokens[position].value == "."):
+                position += 1
+            if position < len(tokens) and tokens[position].value == "(" and position in matches:
+                annotation_end = max(annotation_end, matches[position])
+        if value in ASSIGNMENT_OPERATORS and index > annotation_end:
+            features.assignments += 1
+
+        if value in BINARY_OPERATORS and previous is not None and index > skip_until:
+            if value == "<" and type(previous) is Identifier:
+                end = _type_arguments_end(tokens, index)
+                if end is not None:
+                    # Argumentos de tipo (List<String>, new ArrayList<>()), não comparação
+                    skip_until = end
+                    continue
+            if type(previous) is Identifier or isinstance(previous, Literal) or previous.value in _OPERAND_END:
+                features.binary_operators.append(value)
+
+    features.unsupported = list(dict.fromkeys(features.unsupported))
+    return features
@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
+
+
+@dataclass(frozen=True)
+class RubricCriterion:
+    name: str
+    description: str
+    weight: int
+    is_essential: bool
+    levels: Mapping[str, Mapping[str, float]]
+
+    def __post_init__(self):
+        # Níveis somente leitura: a rubrica é compartilhada entre threads
+        object.__setattr__(self, "levels", MappingProxyType(
+            {name: MappingProxyType(dict(level)) for name, level in self.levels.items()}))
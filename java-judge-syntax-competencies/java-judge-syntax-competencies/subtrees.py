@@ -0,0 +1,215 @@
+"""Subárvores idênticas compartilhadas entre as submissões da turma (hash-consing).
+
+Métodos, construtores e declarações de tipo recebem um hash estrutural: o tipo do nó e
+os atributos, com as subárvores compartilháveis de dentro representadas pelos próprios
+hashes; posições (linha e coluna) não entram. A primeira ocorrência de cada subárvore
+vira a canônica e as seguintes, em qualquer arquivo, são trocadas por ela logo depois do
+parsing: código inicial, main padrão e métodos auxiliares copiados ficam uma vez só na
+memória. Para cada subárvore canônica, os nós agrupados por tipo (o que o índice de
+símbolos das features usa) são calculados uma vez e reaproveitados em todos os arquivos
+que a contêm.
+
+Subárvores compartilhadas mantêm as posições da primeira submissão em que apareceram,
+como as do parsing incremental.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from javalang import tree
+from javalang.ast import Node
+
+from fastjavalang import walk_tree
+
+# Número máximo de subárvores canônicas mantidas na tabela
+SUBTREE_TABLE_SIZE = 16384
+
+# Nós compartilhados: cada um é uma unidade que costuma se repetir inteira entre arquivos
+SHARED_TYPES = (tree.MethodDeclaration, tree.ConstructorDeclaration, tree.TypeDeclaration)
+
+# Valores de atributo escritos diretamente (nomes, literais, operadores)
+_LEAVES = (str, bool, int, type(None))
+
+# Nós de uma subárvore agrupados por tipo: {tipo: [(posição no percurso, nó)]}
+Groups = Dict[type, List[Tuple[int, Node]]]
+
+
+def _digest(out: List[str]) -> str:
+    return hashlib.sha1("".join(out).encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("digest", "node", "size", "groups")
+
+    def __init__(self, digest: str, node: Node):
+        self.digest = digest
+        self.node = node
+        # Calculados na primeira vez que um índice de símbolos passa pela subárvore
+        self.size = 0
+        self.groups: Optional[Groups] = None
+
+
+class SubtreeTable:
+    """Tabela LRU de subárvores canônicas indexada pelo hash estrutural"""
+
+    def __init__(self, max_entries: int = SUBTREE_TABLE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        # Subárvores canônicas pela identidade do nó, para reconhecê-las sem recalcular o hash
+        self._by_node: Dict[int, _Entry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_node.clear()
+
+    def intern(self, unit):
+        """Troca, na própria árvore, as subárvores já vistas pelas canônicas e registra as novas"""
+        try:
+            self._write(unit, [])
+        except RecursionError:
+            # Expressões muito aninhadas: a árvore segue como está, só sem compartilhamento
+            pass
+        return unit
+
+    def _write(self, value, out: List[str], share: bool = True) -> Any:
+        """Acrescenta a forma estrutural de value em out; devolve o valor a manter no pai
+
+        Sem share, as subárvores não são registradas nem trocadas pelas canônicas.
+        """
+        if isinstance(value, SHARED_TYPES):
+            if not share:
+                out.append(self.structural_hash(value))
+                return value
+            entry = self._share(value)
+            out.append(entry.digest)
+            return entry.node
+        if isinstance(value, Node):
+            self._write_node(value, out, share)
+        elif isinstance(value, list):
+            out.append("[")
+            for index, item in enumerate(value):
+                if type(item) in _LEAVES:
+                    out.append(repr(item))
+                else:
+                    kept = self._write(item, out, share)
+                    if kept is not item:
+                        value[index] = kept
+                out.append(",")
+            out.append("]")
+        elif isinstance(value, tuple):
+            out.append("(")
+            for item in value:
+                self._write(item, out, share)
+                out.append(",")
+            out.append(")")
+        elif isinstance(value, (set, frozenset)):
+            out.append(repr(sorted(value, key=repr)))
+        else:
+            out.append(repr(value))
+        return value
+
+    def _write_node(self, node: Node, out: List[str], share: bool = True):
+        out.append(type(node).__name__)
+        out.append("(")
+        for attr in node.attrs:
+            child = getattr(node, attr)
+            if type(child) in _LEAVES:
+                out.append(repr(child))
+            else:
+                kept = self._write(child, out, share)
+                if kept is not child:
+                    setattr(node, attr, kept)
+            out.append(",")
+        out.append(")")
+
+    def _share(self, node: Node) -> _Entry:
+        entry = self._by_node.get(id(node))
+        if entry is not None and entry.node is node:
+            # Subárvore já canônica (membro reaproveitado pelo parsing incremental, por exemplo)
+            return entry
+        out: List[str] = []
+        self._write_node(node, out)
+        digest = _digest(out)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            entry = self._entries[digest] = _Entry(digest, node)
+            self._by_node[id(node)] = entry
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._by_node.pop(id(evicted.node), None)
+        return entry
+
+    def structural_hash(self, node: Node) -> str:
+        """Hash estrutural de qualquer nó, sem alterar a árvore nem a tabela
+
+        Árvores de fora do cache (como as de parse_positioned) não viram canônicas.
+        """
+        entry = self._by_node.get(id(node))
+        if entry is not None and entry.node is node:
+            return entry.digest
+        out: List[str] = []
+        self._write_node(node, out, share=False)
+        return _digest(out)
+
+    def _canonical(self, node: Node) -> Optional[_Entry]:
+        entry = self._by_node.get(id(node))
+        if entry is None or entry.node is not node:
+            return None
+        if entry.groups is None:
+            groups: Groups = defaultdict(list)
+            walk = walk_tree(node)
+            for position, (_, child) in enumerate(walk):
+                groups[type(child)].append((position, child))
+            entry.size, entry.groups = len(walk), dict(groups)
+        return entry
+
+    def group_by_type(self, root, scaffold=None) -> Groups:
+        """Nós da árvore agrupados por tipo, com as posições do percurso do javalang
+
+        As subárvores canônicas não são percorridas: seus grupos vêm da tabela, deslocados
+        para a posição em que aparecem nesta árvore. Com scaffold (scaffold.Scaffold), os
+        membros do código inicial ficam de fora e os tipos declarados nele contam só pelo
+        que a submissão acrescentou.
+        """
+        groups: Groups = defaultdict(list)
+        position = 0
+        stack = [root]
+        pop, push = stack.pop, stack.append
+        # Com código inicial, classes compartilhadas podem conter membros dele e são percorridas
+        reusable = SHARED_TYPES if scaffold is None else (tree.MethodDeclaration, tree.ConstructorDeclaration)
+        while stack:
+            item = pop()
+            if isinstance(item, Node):
+                if scaffold is not None and isinstance(item, scaffold.MEMBER_TYPES):
+                    if scaffold.contains(item, self):
+                        continue
+                    if scaffold.declares(item):
+                        # Tipo do código inicial: só os membros acrescentados contam
+                        push([getattr(item, attr) for attr in item.attrs])
+                        position += 1
+                        continue
+                entry = self._canonical(item) if isinstance(item, reusable) else None
+                if entry is not None:
+                    for kind, nodes in entry.groups.items():
+                        groups[kind].extend([(position + offset, node) for offset, node in nodes])
+                    position += entry.size
+                    continue
+                groups[type(item)].append((position, item))
+                position += 1
+                children = [getattr(item, attr) for attr in item.attrs]
+            else:
+                children = item
+            for child in reversed(children):
+                if isinstance(child, (Node, list, tuple)):
+                    push(child)
+        return groups
@@ -0,0 +1,196 @@
+import codecs
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Tuple
+
+# Limites padrão para o diretório temporário do Gradio
+TEMP_MAX_AGE = 60 * 60  # segundos
+TEMP_MAX_BYTES = 500 * 1024 * 1024
+TEMP_PURGE_INTERVAL = 10 * 60  # segundos
+TEMP_DIR_GRACE = 60  # segundos
+# Uploads do Gradio já lidos, mantidos para os próximos eventos (num erro de cache, o arquivo é lido de novo)
+UPLOAD_CACHE_SIZE = 256
+
+# Marcas de ordem de bytes reconhecidas (UTF-32 antes de UTF-16, que tem o mesmo prefixo)
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Tentadas em ordem quando não há BOM; latin-1 aceita qualquer sequência de bytes
+ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+
+class UploadedFile(bytes):
+    """Conteúdo de um arquivo enviado, mantido em memória com o nome original"""
+
+    def __new__(cls, data: bytes, name: str):
+        upload = super().__new__(cls, data)
+        upload.name = name
+        return upload
+
+    @property
+    def key(self) -> str:
+        """Identificador do conteúdo, estável entre o upload e a avaliação"""
+        return hashlib.sha1(self).hexdigest()
+
+
+@dataclass
+class SourceFile:
+    name: str
+    code: str
+    encoding: str
+
+
+def decode_source(data: bytes) -> Tuple[str, str]:
+    """Decodifica o código enviado, retornando o texto e a codificação usada"""
+    for bom, encoding in BOMS:
+        if data.startswith(bom):
+            try:
+                return data.decode(encoding), encoding
+            except UnicodeDecodeError:
+                break
+
+    for encoding in ENCODINGS:
+        try:
+            return data.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+
+
+class _GradioUploads:
+    """Uploads do diretório temporário do Gradio, guardados depois da primeira leitura
+
+    O mesmo caminho chega a vários eventos (pré-processamento no upload, avaliação no
+    clique); os seguintes recebem o conteúdo já lido. O arquivo continua no disco até o
+    TempDirJanitor removê-lo, então um caminho que saiu do cache é simplesmente lido de novo.
+    """
+
+    def __init__(self, max_entries: int = UPLOAD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, UploadedFile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, path: str) -> UploadedFile:
+        with self._lock:
+            upload = self._entries.get(path)
+            if upload is not None:
+                self._entries.move_to_end(path)
+                return upload
+        with open(path, 'rb') as f:
+            # O Gradio guarda o upload com o nome original, em um subdiretório próprio
+            upload = UploadedFile(f.read(), Path(path).name)
+        with self._lock:
+            self._entries[path] = upload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return upload
+
+
+_gradio_uploads = _GradioUploads()
+
+
+def read_upload(file) -> UploadedFile:
+    """Normaliza um upload para UploadedFile, lendo o disco no máximo uma vez"""
+    if isinstance(file, UploadedFile):
+        return file
+    if isinstance(file, (bytes, bytearray)):
+        return UploadedFile(file, "arquivo.java")
+
+    path = str(getattr(file, "name", file))
+    if Path(path).resolve().is_relative_to(gradio_temp_dir().resolve()):
+        return _gradio_uploads.read(path)
+    with open(path, 'rb') as f:
+        return UploadedFile(f.read(), path)
+
+
+def java_file_input(**kwargs):
+    """Cria um gr.File que entrega o caminho de cada upload (lido uma vez por read_upload)"""
+    import gradio as gr
+
+    return gr.File(type="filepath", **kwargs)
+
+
+def gradio_temp_dir() -> Path:
+    """Diretório onde o Gradio grava os uploads"""
+    return Path(os.environ.get("GRADIO_TEMP_DIR") or Path(tempfile.gettempdir()) / "gradio")
+
+
+class TempDirJanitor:
+    """Remove periodicamente arquivos temporários antigos ou em excesso"""
+
+    def __init__(self, directory=None, max_age: float = TEMP_MAX_AGE,
+                 max_bytes: int = TEMP_MAX_BYTES, interval: float = TEMP_PURGE_INTERVAL):
+        self.directory = Path(directory) if directory else gradio_temp_dir()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def purge(self) -> int:
+        """Apaga arquivos mais velhos que max_age e, se preciso, os mais antigos até caber em max_bytes"""
+        if not self.directory.is_dir():
+            return 0
+
+        now = time.time()
+        removed = 0
+        kept = []
+
+        for path in self.directory.rglob('*'):
+            try:
+                if not path.is_file():
+                    continue
+                stat = path.stat()
+                if now - stat.st_mtime > self.max_age:
+                    path.unlink()
+                    removed += 1
+                else:
+                    kept.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                # Arquivo removido ou em uso por outra requisição
+                continue
+
+        total = sum(size for _, size, _ in kept)
+        for _, size, path in sorted(kept, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+                total -= size
+            except OSError:
+                continue
+
+        # Remove diretórios vazios há algum tempo (um diretório recém-criado pode estar recebendo um upload)
+        for path in sorted(self.directory.rglob('*'), key=lambda p: len(p.parts), reverse=True):
+            try:
+                if path.is_dir() and now - path.stat().st_mtime > TEMP_DIR_GRACE:
+                    path.rmdir()
+            except OSError:
+                pass
+
+        return removed
+
+    def _run(self):
+        while True:
+            self.purge()
+            if self._stop.wait(self.interval):
+                break
+
+    def start(self) -> "TempDirJanitor":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="temp-janitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()